@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import yield_calculator
+from yield_calculator import app
+
+client = TestClient(app)
+
+
+def field(name, crop_type="corn", west=-93.6, soil_type="loam", irrigation=True, ring=None):
+    # About 1 km square in Iowa, with its west edge at longitude `west`
+    ring = ring or [[west, 41.6], [west + 0.012, 41.6], [west + 0.012, 41.609], [west, 41.609], [west, 41.6]]
+    return {
+        "name": name, "crop_type": crop_type, "soil_type": soil_type, "irrigation": irrigation,
+        "geometry": {"type": "Polygon", "coordinates": [ring]},
+    }
+
+
+FIELDS = [
+    field("North", "corn"),
+    field("South", "wheat", west=-93.5, soil_type="clay", irrigation=False),
+    field("East", "soybean", west=-93.4, soil_type="sandy"),
+    field("West", "rice", west=-93.3, soil_type="silt"),
+    field("Orchard", "apples", west=-93.2),
+]
+
+
+def batch(fields):
+    response = client.post("/api/calculate-yield/batch", json={"fields": fields})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # Several chunks per request, so ordering across chunk boundaries is covered
+    monkeypatch.setattr(yield_calculator, "BATCH_CHUNK_SIZE", 2)
+
+
+def test_batch_streams_results_in_input_order():
+    results = batch(FIELDS)
+    assert [r["index"] for r in results] == list(range(len(FIELDS)))
+    assert [r["field_name"] for r in results] == [f["name"] for f in FIELDS]
+
+
+def test_batch_matches_single_field_endpoint():
+    for result, payload in zip(batch(FIELDS), FIELDS):
+        single = client.post("/api/calculate-yield", json=payload)
+        assert single.status_code == 200
+        expected = single.json()
+        assert result.keys() - {"index"} == expected.keys()
+        for key, value in expected.items():
+            assert result[key] == (pytest.approx(value) if isinstance(value, float) else value)
+
+
+def test_batch_reports_invalid_geometry_and_continues():
+    fields = list(FIELDS)
+    fields.insert(2, field("Broken", ring=[[-93.6, 41.6], [-93.59, 41.6], [-93.6, 41.6]]))
+    results = batch(fields)
+
+    assert len(results) == len(fields)
+    assert results[2] == {"index": 2, "field_name": "Broken", "error": "Invalid geometry"}
+    assert [r["field_name"] for r in results[3:]] == ["East", "West", "Orchard"]
+    assert all("error" not in r for r in results[3:])
+    assert client.post("/api/calculate-yield", json=fields[2]).status_code == 400
+
+
+def test_batch_over_limit_is_rejected(monkeypatch):
+    monkeypatch.setattr(yield_calculator, "MAX_BATCH_FIELDS", 3)
+    response = client.post("/api/calculate-yield/batch", json={"fields": FIELDS})
+    assert response.status_code == 413
+    assert batch(FIELDS[:3])[-1]["index"] == 2
@@ -1,15 +1,17 @@
 # FastAPI backend for crop yield calculation
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
-import geopandas as gpd
-from shapely.geometry import shape, Polygon
 import numpy as np
 import json
 import os
 from datetime import datetime
 
+# Same equal-area engine as the main backend (vendored copy), so both services agree
+from geo_area import area_hectares, polygon_areas_hectares
+
 app = FastAPI(title="FarmPower Crop Yield Calculator",
              description="Calculate expected crop yields based on field geometry and crop type")
 
@@ -34,6 +36,9 @@ class Field(BaseModel):
     soil_type: Optional[str] = "loam"
     irrigation: Optional[bool] = True
 
+class BatchYieldRequest(BaseModel):
+    fields: List[Field]
+
 class YieldPrediction(BaseModel):
     field_name: str
     crop_type: str
@@ -63,15 +68,19 @@ SOIL_FACTORS = {
 # Irrigation factor
 IRRIGATION_FACTOR = 1.3  # 30% yield increase with irrigation
 
+# Base confidence score for predictions
+BASE_CONFIDENCE = 0.85
+
+# Batch endpoint limits
+MAX_BATCH_FIELDS = 50000
+BATCH_CHUNK_SIZE = 2000  # Fields computed (and streamed) per NumPy pass
+
 def calculate_field_area(geometry: dict) -> float:
     """Calculate field area in hectares from GeoJSON geometry"""
-    try:
-        geom = shape(geometry)
-        # Convert area from square meters to hectares
-        area_hectares = geom.area / 10000
-        return area_hectares
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Invalid geometry: {str(e)}")
+    area = area_hectares(geometry)
+    if area is None:
+        raise HTTPException(status_code=400, detail="Invalid geometry: expected a Polygon with closed rings of [lon, lat] coordinates")
+    return area
 
 def predict_yield(field: Field) -> YieldPrediction:
     """Predict crop yield based on field characteristics"""
@@ -90,7 +99,7 @@ def predict_yield(field: Field) -> YieldPrediction:
     total_yield = adjusted_yield_per_hectare * area
     
     # Calculate confidence score (simplified)
-    confidence_score = 0.85  # Base confidence
+    confidence_score = BASE_CONFIDENCE
     
     return YieldPrediction(
         field_name=field.name,
@@ -101,6 +110,40 @@ def predict_yield(field: Field) -> YieldPrediction:
         confidence_score=confidence_score
     )
 
+def _lookup(keys: List[str], table: dict, default: float) -> np.ndarray:
+    """Vectorized dict lookup: each distinct key is looked up once."""
+    unique_keys, inverse = np.unique(np.asarray(keys, dtype=object).astype(str), return_inverse=True)
+    return np.array([table.get(k, default) for k in unique_keys], dtype=float)[inverse]
+
+def polygon_areas(fields: List[Field]) -> np.ndarray:
+    """Areas in hectares of all fields' polygons at once; fields with an invalid geometry get NaN."""
+    return polygon_areas_hectares([field.geometry.dict() for field in fields])
+
+def predict_yields(fields: List[Field]) -> List[dict]:
+    """Vectorized predict_yield for many fields; invalid geometries yield an error entry."""
+    area = polygon_areas(fields)
+    base_yield_per_hectare = _lookup([f.crop_type.lower() for f in fields], CROP_YIELDS, 0.0)
+    soil_factor = _lookup([(f.soil_type or "loam").lower() for f in fields], SOIL_FACTORS, 1.0)
+    irrigation_multiplier = np.where([bool(f.irrigation) for f in fields], IRRIGATION_FACTOR, 1.0)
+
+    adjusted_yield_per_hectare = base_yield_per_hectare * soil_factor * irrigation_multiplier
+    total_yield = adjusted_yield_per_hectare * area
+
+    results = []
+    for i, field in enumerate(fields):
+        if np.isnan(area[i]):
+            results.append({"field_name": field.name, "error": "Invalid geometry"})
+            continue
+        results.append({
+            "field_name": field.name,
+            "crop_type": field.crop_type,
+            "area_hectares": float(area[i]),
+            "expected_yield_tons": float(total_yield[i]),
+            "yield_per_hectare": float(adjusted_yield_per_hectare[i]),
+            "confidence_score": BASE_CONFIDENCE
+        })
+    return results
+
 @app.post("/api/calculate-yield", response_model=YieldPrediction)
 async def calculate_yield(field: Field):
     """Calculate expected yield for a field"""
@@ -109,6 +152,26 @@ async def calculate_yield(field: Field):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.post("/api/calculate-yield/batch")
+async def calculate_yield_batch(request: BatchYieldRequest):
+    """
+    Calculate expected yields for many fields in one call.
+    Streams NDJSON, one result per line in request order, each tagged with its
+    `index`. Fields with invalid geometry get an `error` entry instead of failing the batch.
+    """
+    fields = request.fields
+    if len(fields) > MAX_BATCH_FIELDS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_FIELDS} fields per batch")
+
+    def generate():
+        for offset in range(0, len(fields), BATCH_CHUNK_SIZE):
+            chunk = predict_yields(fields[offset:offset + BATCH_CHUNK_SIZE])
+            yield "".join(
+                json.dumps({"index": offset + i, **result}) + "\n" for i, result in enumerate(chunk)
+            )
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 @app.get("/api/crops")
 async def get_crops():
     """Get list of supported crops and their base yields"""
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the Python services.
+
+Imports each app's entry module in a fresh interpreter, the way a cold container
+start does, and reports the wall time of the import and the process RSS once it
+has finished. Each app is measured several times and the median is reported.
+
+    python benchmark_startup.py                  # all apps, 5 runs each
+    python benchmark_startup.py -n 10 yield_calculator
+    python benchmark_startup.py --importtime 15  # also list the slowest imports
+    python benchmark_startup.py --json
+    python benchmark_startup.py --env DATABASE_URL=postgresql://... backend_v2
+
+Only the import is measured; startup hooks (e.g. database connections opened in
+`@app.on_event("startup")`) are not run.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (working directory, module to import)
+APPS = {
+    "flask_app": (os.path.join(ROOT, "FARMPOWER"), "app"),
+    "yield_calculator": (os.path.join(ROOT, "FARMPOWER", "backend"), "yield_calculator"),
+    "backend_v2": (os.path.join(ROOT, "farmpower_backend_v2"), "main"),
+}
+
+# Runs in the child: import the module, then print timings and memory as one JSON line
+# starting with PROBE_MARKER (apps may log to stdout around it, e.g. from a background writer)
+PROBE_MARKER = '{"import_s"'
+_PROBE = """
+import json, resource, sys, time
+sys.path.insert(0, '.')
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+rss_kb = 0
+with open('/proc/self/status') as status:
+    for line in status:
+        if line.startswith('VmRSS:'):
+            rss_kb = int(line.split()[1])
+print(json.dumps({{
+    'import_s': elapsed,
+    'rss_mb': rss_kb / 1024,
+    'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'modules': len(sys.modules),
+}}))
+"""
+
+
+def run_once(cwd: str, module: str, env: Optional[Dict[str, str]] = None, importtime: bool = False, timeout: float = 120) -> Dict:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", _PROBE.format(module=module)]
+    proc = subprocess.run(command, cwd=cwd, capture_output=True, text=True, timeout=timeout, env={**os.environ, **(env or {})})
+    lines = [line for line in proc.stdout.splitlines() if line.startswith(PROBE_MARKER)]
+    if proc.returncode != 0 or not lines:
+        error = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+        return {"error": error}
+    result = json.loads(lines[-1])
+    if importtime:
+        result["slowest_imports"] = _parse_importtime(proc.stderr)
+    return result
+
+
+def _parse_importtime(stderr: str) -> List[Dict]:
+    # "import time: self [us] | cumulative | imported package"
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Nested imports are indented by two spaces per level
+        rows.append({"module": name[1:].rstrip(), "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    return rows
+
+
+def benchmark(name: str, runs: int, importtime_top: Optional[int], env: Optional[Dict[str, str]] = None) -> Dict:
+    cwd, module = APPS[name]
+    samples = []
+    for _ in range(runs):
+        sample = run_once(cwd, module, env)
+        if "error" in sample:
+            return {"app": name, "error": sample["error"]}
+        samples.append(sample)
+    result = {
+        "app": name,
+        "runs": runs,
+        "import_s_median": statistics.median(s["import_s"] for s in samples),
+        "import_s_min": min(s["import_s"] for s in samples),
+        "rss_mb_median": statistics.median(s["rss_mb"] for s in samples),
+        "peak_rss_mb_median": statistics.median(s["peak_rss_mb"] for s in samples),
+        "modules": samples[-1]["modules"],
+    }
+    if importtime_top:
+        imports = run_once(cwd, module, env, importtime=True).get("slowest_imports", [])
+        # The app module's direct imports: what a lazy import would save
+        direct = [row for row in imports if row["module"].startswith("  ") and not row["module"].startswith("    ")]
+        result["slowest_imports"] = sorted(direct, key=lambda row: -row["cumulative_ms"])[:importtime_top]
+    return result
+
+
+def baseline_rss_mb() -> float:
+    # RSS of a bare interpreter running the probe, to subtract mentally from the app numbers
+    sample = run_once(ROOT, "json")
+    return sample.get("rss_mb", 0.0)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("apps", nargs="*", metavar="app", help=f"Apps to measure: {', '.join(APPS)} (default: all)")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="Fresh interpreters per app")
+    parser.add_argument("--importtime", type=int, metavar="N", help="Also list the N slowest top-level imports")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="Extra environment for the apps (repeatable)")
+    args = parser.parse_args(argv)
+    unknown = set(args.apps) - set(APPS)
+    if unknown:
+        parser.error(f"unknown app(s): {', '.join(sorted(unknown))}")
+    if any("=" not in item for item in args.env):
+        parser.error("--env expects KEY=VALUE")
+    env = dict(item.split("=", 1) for item in args.env)
+
+    results = [benchmark(name, args.runs, args.importtime, env) for name in (args.apps or list(APPS))]
+    baseline = baseline_rss_mb()
+
+    if args.json:
+        print(json.dumps({"baseline_rss_mb": baseline, "apps": results}, indent=2))
+        return 0
+
+    print(f"Bare interpreter RSS: {baseline:.1f} MB")
+    print(f"{'app':<18} {'import (median)':>16} {'import (min)':>13} {'RSS':>10} {'peak RSS':>10} {'modules':>8}")
+    for result in results:
+        if "error" in result:
+            print(f"{result['app']:<18} failed to import: {result['error']}")
+            continue
+        print(
+            f"{result['app']:<18} {result['import_s_median'] * 1000:>13.0f} ms {result['import_s_min'] * 1000:>10.0f} ms"
+            f" {result['rss_mb_median']:>7.1f} MB {result['peak_rss_mb_median']:>7.1f} MB {result['modules']:>8}"
+        )
+        for row in result.get("slowest_imports", []):
+            print(f"    {row['cumulative_ms']:>9.1f} ms  {row['module'].strip()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
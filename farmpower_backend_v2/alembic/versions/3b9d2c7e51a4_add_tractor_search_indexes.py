@@ -0,0 +1,47 @@
+"""Add tractor full-text and trigram search indexes
+
+Revision ID: 3b9d2c7e51a4
+Revises: f184f6721e88
+Create Date: 2026-10-18 09:12:31.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b9d2c7e51a4'
+down_revision = 'f184f6721e88'
+branch_labels = None
+depends_on = None
+
+SEARCH_DOCUMENT = (
+    "coalesce(name, '') || ' ' || coalesce(brand, '') || ' ' || coalesce(model, '') || ' ' || "
+    "coalesce(location, '') || ' ' || coalesce(description, '')"
+)
+
+
+def upgrade():
+    # Postgres only; SQLite deployments use the in-process search index
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tractors_search_tsv ON tractors "
+        f"USING gin (to_tsvector('simple'::regconfig, {SEARCH_DOCUMENT}))"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tractors_search_trgm ON tractors "
+        f"USING gin (({SEARCH_DOCUMENT}) gin_trgm_ops)"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_tractors_brand_trgm ON tractors USING gin (brand gin_trgm_ops)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_tractors_location_trgm ON tractors USING gin (location gin_trgm_ops)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_tractors_location_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_tractors_brand_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_tractors_search_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_tractors_search_tsv")
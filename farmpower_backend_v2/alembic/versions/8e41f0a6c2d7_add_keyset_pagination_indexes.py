@@ -0,0 +1,37 @@
+"""Add composite indexes for keyset pagination
+
+Revision ID: 8e41f0a6c2d7
+Revises: 3b9d2c7e51a4
+Create Date: 2026-10-18 11:02:47.381920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e41f0a6c2d7'
+down_revision = '3b9d2c7e51a4'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns); column order matches each listing's sort key
+PAGINATION_INDEXES = [
+    ('ix_tractors_created_at_id', 'tractors', ['created_at', 'id']),
+    ('ix_parts_created_at_id', 'parts', ['created_at', 'id']),
+    ('ix_notifications_user_id_created_at_id', 'notifications', ['user_id', 'created_at', 'id']),
+    ('ix_messages_conversation_id_created_at_id', 'messages', ['conversation_id', 'created_at', 'id']),
+    ('ix_service_bookings_user_id_scheduled_date_id', 'service_bookings', ['user_id', 'scheduled_date', 'id']),
+    ('ix_service_bookings_provider_id_scheduled_date_id', 'service_bookings', ['service_provider_id', 'scheduled_date', 'id']),
+    ('ix_fields_owner_id_name_id', 'fields', ['owner_id', 'name', 'id']),
+]
+
+
+def upgrade():
+    for name, table, columns in PAGINATION_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(PAGINATION_INDEXES):
+        op.drop_index(name, table_name=table)
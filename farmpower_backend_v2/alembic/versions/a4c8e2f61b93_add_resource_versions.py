@@ -0,0 +1,32 @@
+"""Add resource version counters for HTTP ETags
+
+Revision ID: a4c8e2f61b93
+Revises: e7a3c19b5d64
+Create Date: 2026-10-18 19:24:51.602318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4c8e2f61b93'
+down_revision = 'e7a3c19b5d64'
+branch_labels = None
+depends_on = None
+
+# Seeded so concurrent first writes only ever UPDATE their row
+RESOURCES = ('tractors', 'parts', 'users')
+
+
+def upgrade():
+    resource_versions = op.create_table('resource_versions',
+    sa.Column('resource', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('resource')
+    )
+    op.bulk_insert(resource_versions, [{'resource': resource, 'version': 0} for resource in RESOURCES])
+
+
+def downgrade():
+    op.drop_table('resource_versions')
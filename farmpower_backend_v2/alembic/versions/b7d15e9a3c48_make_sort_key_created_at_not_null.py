@@ -0,0 +1,39 @@
+"""Backfill created_at and make it NOT NULL where listings page on it
+
+Revision ID: b7d15e9a3c48
+Revises: a4c8e2f61b93
+Create Date: 2026-10-18 21:12:03.558214
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d15e9a3c48'
+down_revision = 'a4c8e2f61b93'
+branch_labels = None
+depends_on = None
+
+# Keyset cursors compare (created_at, id) with < / >, which never matches a NULL,
+# so rows inserted without the ORM default would drop out of every cursor page.
+# (table, backfill value for rows without one)
+TABLES = [
+    ('tractors', 'COALESCE(updated_at, CURRENT_TIMESTAMP)'),
+    ('parts', 'COALESCE(updated_at, CURRENT_TIMESTAMP)'),
+    ('messages', 'CURRENT_TIMESTAMP'),
+    ('notifications', 'CURRENT_TIMESTAMP'),
+]
+
+
+def upgrade():
+    for table, backfill in TABLES:
+        op.execute(f'UPDATE {table} SET created_at = {backfill} WHERE created_at IS NULL')
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    for table, _ in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,71 @@
+"""Add materialized conversation summaries
+
+Revision ID: c5a7e3d91f02
+Revises: 8e41f0a6c2d7
+Create Date: 2026-10-18 13:40:12.517334
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a7e3d91f02'
+down_revision = '8e41f0a6c2d7'
+branch_labels = None
+depends_on = None
+
+# One row per participant per conversation, pointing at the latest message
+BACKFILL_SQL = """
+INSERT INTO conversation_summaries
+    (conversation_id, user_id, other_user_id, last_message_id, last_message_content,
+     last_message_at, unread_count, updated_at)
+WITH participants AS (
+    SELECT conversation_id, sender_id AS user_id, recipient_id AS other_user_id FROM messages
+    UNION
+    SELECT conversation_id, recipient_id AS user_id, sender_id AS other_user_id FROM messages
+),
+latest AS (
+    SELECT id, conversation_id, content, created_at,
+           ROW_NUMBER() OVER (PARTITION BY conversation_id ORDER BY created_at DESC, id DESC) AS rn
+    FROM messages
+)
+SELECT p.conversation_id, p.user_id, p.other_user_id, l.id, l.content, l.created_at,
+       (SELECT COUNT(*) FROM messages m
+        WHERE m.conversation_id = p.conversation_id
+          AND m.recipient_id = p.user_id
+          AND m.is_read_by_recipient = false),
+       CURRENT_TIMESTAMP
+FROM participants p
+JOIN latest l ON l.conversation_id = p.conversation_id AND l.rn = 1
+"""
+
+
+def upgrade():
+    op.create_table('conversation_summaries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('conversation_id', sa.String(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('other_user_id', sa.Integer(), nullable=False),
+    sa.Column('last_message_id', sa.Integer(), nullable=True),
+    sa.Column('last_message_content', sa.Text(), nullable=True),
+    sa.Column('last_message_at', sa.DateTime(), nullable=True),
+    sa.Column('unread_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['last_message_id'], ['messages.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['other_user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('conversation_id', 'user_id', name='uq_conversation_summaries_conversation_user')
+    )
+    op.create_index(op.f('ix_conversation_summaries_id'), 'conversation_summaries', ['id'], unique=False)
+    op.create_index(op.f('ix_conversation_summaries_conversation_id'), 'conversation_summaries', ['conversation_id'], unique=False)
+    op.create_index('ix_conversation_summaries_user_id_last_message_at', 'conversation_summaries', ['user_id', 'last_message_at'], unique=False)
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade():
+    op.drop_index('ix_conversation_summaries_user_id_last_message_at', table_name='conversation_summaries')
+    op.drop_index(op.f('ix_conversation_summaries_conversation_id'), table_name='conversation_summaries')
+    op.drop_index(op.f('ix_conversation_summaries_id'), table_name='conversation_summaries')
+    op.drop_table('conversation_summaries')
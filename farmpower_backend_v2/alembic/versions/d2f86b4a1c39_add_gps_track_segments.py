@@ -0,0 +1,41 @@
+"""Add compressed GPS track segments
+
+Revision ID: d2f86b4a1c39
+Revises: c5a7e3d91f02
+Create Date: 2026-10-18 15:21:08.946203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f86b4a1c39'
+down_revision = 'c5a7e3d91f02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('gps_track_segments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('field_id', sa.Integer(), nullable=False),
+    sa.Column('device_id', sa.String(length=64), nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=False),
+    sa.Column('point_count', sa.Integer(), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['field_id'], ['fields.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_gps_track_segments_id'), 'gps_track_segments', ['id'], unique=False)
+    op.create_index('ix_gps_track_segments_field_id_start_time', 'gps_track_segments', ['field_id', 'start_time'], unique=False)
+    op.create_index('ix_gps_track_segments_field_id_device_id_start_time', 'gps_track_segments', ['field_id', 'device_id', 'start_time'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_gps_track_segments_field_id_device_id_start_time', table_name='gps_track_segments')
+    op.drop_index('ix_gps_track_segments_field_id_start_time', table_name='gps_track_segments')
+    op.drop_index(op.f('ix_gps_track_segments_id'), table_name='gps_track_segments')
+    op.drop_table('gps_track_segments')
@@ -0,0 +1,78 @@
+"""Add field bounding boxes for the spatial index
+
+Revision ID: e7a3c19b5d64
+Revises: d2f86b4a1c39
+Create Date: 2026-10-18 17:02:44.310527
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a3c19b5d64'
+down_revision = 'd2f86b4a1c39'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _bounds(geometry):
+    # Same result as app.core.spatial_index.geometry_bounds, kept local so the
+    # migration doesn't depend on application code
+    if isinstance(geometry, str):
+        geometry = json.loads(geometry)
+    if not isinstance(geometry, dict):
+        return None
+    if geometry.get('type') == 'Polygon':
+        polygons = [geometry.get('coordinates')]
+    elif geometry.get('type') == 'MultiPolygon':
+        polygons = geometry.get('coordinates') or []
+    else:
+        return None
+    try:
+        points = [(float(p[0]), float(p[1])) for polygon in polygons for ring in polygon for p in ring]
+    except (TypeError, ValueError, IndexError):
+        return None
+    if not points:
+        return None
+    lons, lats = zip(*points)
+    return min(lons), min(lats), max(lons), max(lats)
+
+
+def upgrade():
+    op.add_column('fields', sa.Column('min_lon', sa.Float(), nullable=True))
+    op.add_column('fields', sa.Column('min_lat', sa.Float(), nullable=True))
+    op.add_column('fields', sa.Column('max_lon', sa.Float(), nullable=True))
+    op.add_column('fields', sa.Column('max_lat', sa.Float(), nullable=True))
+
+    bind = op.get_bind()
+    update = sa.text(
+        'UPDATE fields SET min_lon = :min_lon, min_lat = :min_lat, max_lon = :max_lon, max_lat = :max_lat WHERE id = :id'
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text('SELECT id, coordinates FROM fields WHERE id > :last_id ORDER BY id LIMIT :limit'),
+            {'last_id': last_id, 'limit': BACKFILL_BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        params = []
+        for field_id, coordinates in rows:
+            bounds = _bounds(coordinates)
+            if bounds:
+                params.append(dict(zip(('min_lon', 'min_lat', 'max_lon', 'max_lat'), bounds), id=field_id))
+        if params:
+            bind.execute(update, params)
+        last_id = rows[-1][0]
+
+
+def downgrade():
+    op.drop_column('fields', 'max_lat')
+    op.drop_column('fields', 'max_lon')
+    op.drop_column('fields', 'min_lat')
+    op.drop_column('fields', 'min_lon')
@@ -1,6 +1,7 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.core.pagination import set_next_cursor_header
 from app.crud import equipment as equipment_crud
 from app.schemas.equipment import (
     Equipment, EquipmentCreate, EquipmentFilter,
@@ -23,13 +24,17 @@ def create_equipment(
 
 @router.get("/", response_model=List[Equipment])
 def list_equipment(
+    response: Response,
     filter_params: EquipmentFilter = Depends(),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db)
 ):
-    """List all equipment with optional filtering"""
-    return equipment_crud.get_equipment_list(db, filter_params, skip, limit)
+    """List all equipment with optional filtering, newest first"""
+    equipment = equipment_crud.get_equipment_list(db, filter_params, skip, limit, cursor)
+    set_next_cursor_header(response, equipment)
+    return equipment
 
 @router.get("/{equipment_id}", response_model=Equipment)
 def get_equipment(
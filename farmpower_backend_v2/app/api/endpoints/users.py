@@ -19,7 +19,7 @@ router = APIRouter(
 )
 
 @router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+def register_user(user: UserCreate, db: Session = Depends(get_db)):
     """
     Create a new user.
     """
@@ -34,7 +34,7 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
     return created_user
 
 @router.post("/login/token", response_model=Token)
-async def login_for_access_token(
+def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
@@ -72,7 +72,7 @@ async def read_users_me(current_user: UserModel = Depends(get_current_active_use
     return current_user
 
 @router.put("/me", response_model=UserSchema)
-async def update_user_me(
+def update_user_me(
     user_in: UserUpdate,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -84,7 +84,7 @@ async def update_user_me(
     return updated_user
 
 @router.get("/{user_id}", response_model=UserSchema)
-async def read_user_by_id(
+def read_user_by_id(
     user_id: int,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -104,7 +104,7 @@ async def read_user_by_id(
     )
 
 @router.put("/{user_id}", response_model=UserSchema)
-async def update_user(
+def update_user(
     user_id: int,
     user_update: UserUpdate,
     db: Session = Depends(get_db),
@@ -128,7 +128,7 @@ async def update_user(
     return updated_user
 
 @router.get("/", response_model=List[UserSchema], dependencies=[Depends(RoleChecker([UserRole.ADMIN]))])
-async def list_all_users(
+def list_all_users(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100
@@ -140,7 +140,7 @@ async def list_all_users(
     return users
 
 @router.post("/request-otp", response_model=dict)
-async def request_otp(
+def request_otp(
     otp_request: OTPRequest,
     db: Session = Depends(get_db)
 ):
@@ -164,7 +164,7 @@ async def request_otp(
     return {"message": "OTP sent successfully"}
 
 @router.post("/verify-otp", response_model=UserSchema)
-async def verify_otp(
+def verify_otp(
     otp_verify: OTPVerify,
     db: Session = Depends(get_db)
 ):
@@ -112,6 +112,10 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
     JWT_ALGORITHM: str = "HS256"
     OTP_EXPIRE_MINUTES: int = 15  # 15 minutes
+    USER_CACHE_TTL_S: int = 60  # Authenticated user rows are re-read at least this often
+    USER_CACHE_MAX_ENTRIES: int = 10000  # Least recently used users are evicted beyond this
+    PASSWORD_HASH_WORKERS: int = 0  # Concurrent bcrypt hashes/verifies; 0 for one per CPU core
+    PASSWORD_HASH_MAX_QUEUE: int = 32  # Waiting beyond the running ones; further logins get a 503
 
     # File Upload
     UPLOAD_DIR: Path = Path("uploads")
@@ -141,9 +145,48 @@ class Settings(BaseSettings):
     AWS_STORAGE_BUCKET_NAME: str = "your-bucket-name"
     AWS_S3_REGION: str = "us-east-1"
 
+    # Logging: records are queued and written by a background thread
+    LOG_QUEUE_SIZE: int = 10000  # Records beyond this are dropped rather than block requests
+    LOG_SUCCESS_SAMPLE_RATE: float = 1.0  # Fraction of fast 2xx/3xx "Request completed" lines kept
+    LOG_SLOW_REQUEST_S: float = 1.0  # Requests at least this slow are always logged
+
+    # SQL statements per request (QueryStatsMiddleware)
+    DB_QUERY_STATS_HEADERS: bool = os.getenv("ENVIRONMENT", "development") != "production"  # X-DB-Query-Count/-Time on responses
+    DB_REPEATED_QUERY_THRESHOLD: int = 5  # A statement run this many times in one request is logged as a likely N+1
+
+    # HTTP caching of public listings (core/http_cache.py): Cache-Control max-age; 0 revalidates on every use
+    HTTP_CACHE_LISTING_MAX_AGE_S: int = 0  # Tractor and part listing pages
+    HTTP_CACHE_FEATURED_MAX_AGE_S: int = 60  # /marketplace/featured
+    HTTP_CACHE_DETAIL_MAX_AGE_S: int = 0  # A single tractor or part
+
     # Rate Limiting
     RATE_LIMIT: str = "100/minute"
 
+    # Request concurrency: sync (def) route handlers run on a threadpool of this size,
+    # each holding one pooled DB connection while it works
+    THREADPOOL_SIZE: int = 40
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10  # Connections opened beyond DB_POOL_SIZE under load, closed when idle
+
+    # Startup: the database is connected lazily and checked in the background (see /health)
+    DB_HEALTH_CHECK_INTERVAL_S: float = 30.0  # Re-check interval once the database is reachable
+    DB_CONNECT_MAX_BACKOFF_S: float = 30.0  # Longest wait between checks while it is not
+
+    # Read replicas for listing reads (@replica_read service methods); empty to use only the primary
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")  # Comma-separated database URLs
+    DB_REPLICA_MAX_LAG_S: float = 5.0  # Replicas further behind than this are skipped until they catch up
+    DB_REPLICA_CHECK_INTERVAL_S: float = 10.0  # How often replica reachability and lag are re-measured
+    DB_REPLICA_TIMEOUT_S: int = 3  # Connect and lag-probe timeout; a slower replica is treated as unreachable
+
+    # GPS ingestion (update_location socket event)
+    GPS_FLUSH_INTERVAL_MS: int = 200  # How often batched location_broadcast frames are sent per field room
+    GPS_MAX_DEVICES_PER_ROOM: int = 256  # Pending-point buffer bound per room; oldest device evicted beyond this
+    GPS_TRACK_FLUSH_INTERVAL_S: int = 10  # How often buffered track points are written to gps_track_segments
+    GPS_TRACK_SEGMENT_MAX_POINTS: int = 1000  # Points per stored segment before it is sealed
+
+    # Field spatial index (/fields/search, /fields/locate)
+    FIELD_INDEX_MAX_AGE_S: int = 60  # Rebuild at least this often, to pick up field edits made by other workers
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -3,7 +3,8 @@ import socket
 import time
 import logging
 import sys
-from typing import Any, Dict, Generator, Optional, Union
+import threading
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Dict, Generator, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 # Configure logging
@@ -12,9 +13,16 @@ logger = logging.getLogger(__name__)
 
 # SQLAlchemy imports
 from sqlalchemy import create_engine, text, exc
-from sqlalchemy.engine import Engine, URL
+from sqlalchemy.engine import Engine, URL, make_url
 from sqlalchemy.orm import sessionmaker, Session as DBSession, declarative_base, Session
 
+from app.core.db_routing import ReplicaSet, RoutingSession
+from app.core.metrics import TimedQueuePool, metrics, pool_families
+from app.core.query_stats import install_query_stats, query_metrics
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
 # SQLAlchemy Base class for models
 Base = declarative_base()
 
@@ -92,14 +100,24 @@ def test_connection(engine: Engine, max_attempts: int = 3) -> bool:
         logger.error(f"Original error: {last_error.orig}")
     return False
 
-def create_db_engine(max_retries: int = 5, initial_retry_delay: float = 1.0) -> Engine:
-    """Create a SQLAlchemy engine with robust connection handling and retries."""
-    if not SQLALCHEMY_DATABASE_URL:
-        raise ValueError("DATABASE_URL is not set in environment variables")
-    
-    # Use a local variable to avoid modifying the global
-    db_url = SQLALCHEMY_DATABASE_URL
-    
+def _force_ipv4_host(db_url: str) -> str:
+    """Replace the URL's hostname with its IPv4 address; unchanged if resolution fails."""
+    # Try to resolve to IPv4, but don't fail if DNS resolution doesn't work
+    hostname = db_url.split('@')[1].split(':')[0].split('/')[0]
+    try:
+        ipv4_address = socket.gethostbyname(hostname)
+        logger.info(f"Resolved {hostname} to IPv4: {ipv4_address}")
+        # Replace hostname with IPv4 address in the URL
+        logger.info(f"Using IPv4 address for connection: {ipv4_address}")
+        return db_url.replace(hostname, ipv4_address)
+    except Exception as e:
+        logger.warning(f"Could not resolve IPv4 address for {hostname}: {e}")
+        # If DNS resolution fails, continue with the original hostname
+        logger.info("Using original hostname with enhanced connection settings")
+        return db_url
+
+def _postgres_connect_args(db_url: str) -> Tuple[str, Dict[str, Any]]:
+    """psycopg2 connect arguments, and the URL to connect to (IPv4 host for Supabase)."""
     # Connection arguments with aggressive timeouts and keepalives
     connect_args = {
         "connect_timeout": 30,  # Increased timeout for network issues
@@ -114,69 +132,66 @@ def create_db_engine(max_retries: int = 5, initial_retry_delay: float = 1.0) ->
     if "supabase.co" in db_url:
         # Add TCP keepalive settings for better connection stability
         connect_args["options"] += " -c tcp_keepalives_idle=30 -c tcp_keepalives_interval=10 -c tcp_keepalives_count=5"
-        
-        # Try to resolve to IPv4, but don't fail if DNS resolution doesn't work
-        import socket
-        try:
-            hostname = db_url.split('@')[1].split(':')[0]
-            ipv4_address = socket.gethostbyname(hostname)
-            logger.info(f"Resolved {hostname} to IPv4: {ipv4_address}")
-            # Replace hostname with IPv4 address in the URL
-            db_url = db_url.replace(hostname, ipv4_address)
-            logger.info(f"Using IPv4 address for connection: {ipv4_address}")
-        except Exception as e:
-            logger.warning(f"Could not resolve IPv4 address for {hostname}: {e}")
-            # If DNS resolution fails, continue with the original hostname
-            logger.info("Using original hostname with enhanced connection settings")
+        db_url = _force_ipv4_host(db_url)
     
     # Force SSL if not explicitly set
     if "sslmode" not in db_url.lower():
         connect_args["sslmode"] = "require"
-    
-    # Add Supabase-specific settings
+    return db_url, connect_args
+
+def build_db_engine(db_url: Optional[str] = None) -> Engine:
+    """
+    Create the primary engine without connecting. SQLAlchemy opens connections on
+    first checkout; `check_database_connection` tests reachability explicitly.
+    """
+    db_url = db_url or SQLALCHEMY_DATABASE_URL
+    if not db_url:
+        raise ValueError("DATABASE_URL is not set in environment variables")
+    if make_url(db_url).get_backend_name() == "sqlite":
+        return create_engine(db_url, connect_args={"check_same_thread": False})
+
+    # Use a local variable to avoid modifying the global
+    db_url, connect_args = _postgres_connect_args(db_url)
+    return create_engine(
+        db_url,  # Use the local db_url variable
+        poolclass=TimedQueuePool,  # QueuePool recording checkout waits for /metrics
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=30,
+        pool_recycle=3600,
+        pool_pre_ping=True,  # Enable connection health checks
+        connect_args=connect_args
+    )
+
+def create_db_engine(max_retries: int = 5, initial_retry_delay: float = 1.0) -> Engine:
+    """
+    Create the primary engine and wait for the database, retrying with backoff.
+    For scripts that need the database up front (migrate.py); the app itself
+    connects lazily and reports reachability through /health.
+    """
+    engine = build_db_engine()
     for attempt in range(max_retries):
         try:
-            # Create engine with connection pooling and timeouts
-            engine = create_engine(
-                db_url,  # Use the local db_url variable
-                pool_size=5,
-                max_overflow=10,
-                pool_timeout=30,
-                pool_recycle=3600,
-                pool_pre_ping=True,  # Enable connection health checks
-                connect_args=connect_args
-            )
-            
-            # Test the connection
-            with engine.connect() as conn:
-                result = conn.execute(text("SELECT 1"))
-                if result.scalar() != 1:
-                    raise Exception("Test query did not return expected result")
-            
+            check_database_connection(engine)
             logger.info("Database connection successful")
             return engine
-            
         except Exception as e:
             wait_time = min(initial_retry_delay * (2 ** attempt), 30)  # Cap at 30s
             error_msg = f"Connection attempt {attempt + 1}/{max_retries} failed: {str(e)}. Retrying in {wait_time:.1f}s..."
             logger.warning(error_msg)
-            last_error = e
             if attempt < max_retries - 1:  # Don't sleep on the last attempt
                 time.sleep(wait_time)
     
-    # If we get here, all retries failed - create engine anyway for startup
-    logger.warning("Failed to connect to database during startup, but creating engine for later use")
-    engine = create_engine(
-        db_url,  # Use the local db_url variable
-        pool_size=5,
-        max_overflow=10,
-        pool_timeout=30,
-        pool_recycle=3600,
-        pool_pre_ping=True,
-        connect_args=connect_args
-    )
+    # If we get here, all retries failed - return the engine anyway for later use
+    logger.warning("Failed to connect to database, but returning engine for later use")
     return engine
 
+def check_database_connection(engine: Optional[Engine] = None) -> None:
+    """Run `SELECT 1` on the primary; raises if the database can't be reached."""
+    with (engine or get_engine()).connect() as conn:
+        if conn.execute(text("SELECT 1")).scalar() != 1:
+            raise Exception("Test query did not return expected result")
+
 def get_db() -> Generator[DBSession, None, None]:
     """
     Dependency to get DB session.
@@ -202,8 +217,8 @@ def create_engine_with_fallback():
     """Create database engine with fallback for startup issues."""
     try:
         if SQLALCHEMY_DATABASE_URL and "placeholder" not in SQLALCHEMY_DATABASE_URL:
-            engine = create_db_engine()
-            logger.info("✅ Database engine and session created successfully")
+            engine = build_db_engine()
+            logger.info("✅ Database engine created")
             return engine
         else:
             logger.warning("⚠️ Using fallback database engine due to invalid DATABASE_URL")
@@ -213,9 +228,178 @@ def create_engine_with_fallback():
         logger.warning("⚠️ Using fallback SQLite database for startup")
         return create_engine("sqlite:///./fallback.db")
 
-# Create engine and session
-engine = create_engine_with_fallback()
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def create_replica_engine(db_url: str) -> Engine:
+    """
+    Engine for a read replica. Not tested at startup: ReplicaSet checks replicas
+    before routing to them and falls back to the primary while one is down.
+    """
+    if make_url(db_url).get_backend_name() == "sqlite":
+        return create_engine(db_url, connect_args={"check_same_thread": False})
+    db_url, connect_args = _postgres_connect_args(db_url)
+    # An unreachable replica fails fast; reads fall back to the primary
+    connect_args["connect_timeout"] = settings.DB_REPLICA_TIMEOUT_S
+    return create_engine(
+        db_url,
+        poolclass=TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=30,
+        pool_recycle=3600,
+        pool_pre_ping=True,
+        connect_args=connect_args
+    )
+
+def create_replica_set() -> Optional[ReplicaSet]:
+    """Replicas from DATABASE_REPLICA_URLS (comma-separated), or None to use only the primary."""
+    urls: List[str] = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    if not urls:
+        return None
+    logger.info(f"Routing replica reads to {len(urls)} read replica(s)")
+    return ReplicaSet(
+        [create_replica_engine(url) for url in urls],
+        max_lag_s=settings.DB_REPLICA_MAX_LAG_S,
+        check_interval_s=settings.DB_REPLICA_CHECK_INTERVAL_S,
+        probe_timeout_s=settings.DB_REPLICA_TIMEOUT_S
+    )
+
+# Engines are created on first use rather than at import, so the app can bind its
+# port before the database is reachable (Supabase IPv4 lookup included)
+_engine: Optional[Engine] = None
+_replicas: Optional[ReplicaSet] = None
+_engine_lock = threading.Lock()
+
+def get_engine() -> Engine:
+    global _engine, _replicas
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _replicas = create_replica_set()
+                _engine = create_engine_with_fallback()
+    return _engine
+
+def created_engines() -> Dict[str, Engine]:
+    """Engines built so far by role, without creating any (for /metrics)."""
+    engines = {"primary": _engine} if _engine is not None else {}
+    if _replicas is not None:
+        engines.update({f"replica_{i}": engine for i, engine in enumerate(_replicas.engines)})
+    return engines
+
+metrics.register_collector(lambda: pool_families({name: engine.pool for name, engine in created_engines().items()}))
+
+# Per-request statement counts (QueryStatsMiddleware, the query_budget test fixture)
+install_query_stats()
+metrics.register_collector(query_metrics.collect)
+
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker that binds each new session to the lazily created engine and replicas."""
+
+    def __call__(self, **local_kw) -> Session:
+        local_kw.setdefault("bind", get_engine())
+        local_kw.setdefault("replicas", _replicas)
+        return super().__call__(**local_kw)
+
+# Sessions write to the primary; @replica_read service methods may read from replicas
+SessionLocal = _LazySessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
+
+def __getattr__(name: str) -> Any:
+    # `from app.core.db import engine` keeps working; the engine is created on access
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# --- Async engine (asyncpg) ---
+# Built on first use, so importing this module doesn't need the async drivers
+# (sqlalchemy.ext.asyncio requires greenlet). Hot read paths can move to
+# `get_async_db` one route at a time; everything else keeps the sync engine.
+
+SUPABASE_POOLER_PORT = 6543 # Transaction-mode pgbouncer: no server-side prepared statements
+
+_async_engine: Optional["AsyncEngine"] = None
+_async_session_factory: Optional["async_sessionmaker"] = None
+
+def to_async_url(db_url: str) -> URL:
+    """The async-driver form of a database URL: asyncpg for Postgres, aiosqlite for SQLite."""
+    url = make_url(db_url)
+    backend = url.get_backend_name()
+    if backend in ("postgresql", "postgres"):
+        return url.set(drivername="postgresql+asyncpg")
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    return url
+
+def create_async_db_engine(db_url: Optional[str] = None) -> "AsyncEngine":
+    """
+    Async counterpart of `create_db_engine`, with the same Supabase IPv4, keepalive,
+    SSL and timeout settings expressed as asyncpg connect arguments. Connections are
+    opened on first use rather than tested here, so there is no startup retry loop.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    db_url = db_url or SQLALCHEMY_DATABASE_URL
+    if not db_url:
+        raise ValueError("DATABASE_URL is not set in environment variables")
+
+    is_supabase = "supabase.co" in db_url
+    if is_supabase:
+        db_url = _force_ipv4_host(db_url)
+    url = to_async_url(db_url)
+    if url.get_backend_name() != "postgresql":
+        return create_async_engine(url)
+
+    server_settings = {"statement_timeout": "30000", "idle_in_transaction_session_timeout": "30000"}
+    if is_supabase:
+        server_settings.update(tcp_keepalives_idle="30", tcp_keepalives_interval="10", tcp_keepalives_count="5")
+    connect_args = {
+        "timeout": 30,
+        "server_settings": server_settings,
+        # asyncpg takes libpq-style sslmode values through `ssl`, not as a URL parameter
+        "ssl": url.query.get("sslmode", "require"),
+    }
+    if url.port == SUPABASE_POOLER_PORT:
+        connect_args["statement_cache_size"] = 0
+    url = url.difference_update_query(["sslmode"])
+
+    return create_async_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=30,
+        pool_recycle=3600,
+        pool_pre_ping=True,
+        connect_args=connect_args
+    )
+
+def get_async_engine() -> "AsyncEngine":
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_engine = create_async_db_engine()
+        # expire_on_commit=False: attributes stay loaded after commit, since async
+        # sessions can't lazy-load them again on access
+        _async_session_factory = async_sessionmaker(bind=_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+async def get_async_db() -> AsyncGenerator["AsyncSession", None]:
+    """
+    Dependency to get an async DB session, for `async def` routes.
+    Relationships must be eager-loaded (selectinload/joinedload); lazy loads raise.
+    """
+    get_async_engine()
+    async with _async_session_factory() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database error: {str(e)}")
+            await db.rollback()
+            raise
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections; called on shutdown."""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _async_session_factory = None
 
 # Update exports to include all necessary components
-__all__ = ['Base', 'SessionLocal', 'engine', 'get_db', 'Session']
+__all__ = ['Base', 'SessionLocal', 'engine', 'get_engine', 'get_db', 'Session', 'get_async_db', 'get_async_engine']
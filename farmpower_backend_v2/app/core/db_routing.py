@@ -0,0 +1,154 @@
+"""
+Read-replica routing.
+
+`RoutingSession` sends statements issued inside a `@replica_read` service method
+to a replica engine, and everything else to the primary:
+
+- Flushes and bulk INSERT/UPDATE/DELETE always go to the primary, and once a
+  session has written, its later reads do too, so a request sees its own writes.
+- A session keeps reading from the replica it first picked, so one request
+  doesn't mix snapshots from replicas at different positions.
+- `ReplicaSet` periodically measures each replica's lag, in a background
+  thread so requests never wait on a replica, and leaves out those that are
+  unreachable or more than `max_lag_s` behind; with none left, or before the
+  first measurement has finished, reads go to the primary.
+"""
+import functools
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+# Seconds of replay lag; zero when the replica has replayed everything it received,
+# otherwise an idle primary would make a caught-up replica look further and further behind
+POSTGRES_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaSet:
+    """Replica engines plus a periodically refreshed list of those fit to serve reads."""
+
+    def __init__(
+        self, engines: Sequence[Engine], max_lag_s: float, check_interval_s: float, probe_timeout_s: float = 3.0
+    ):
+        self.engines = list(engines)
+        self.max_lag = max_lag_s
+        self.check_interval = check_interval_s
+        self.probe_timeout = probe_timeout_s
+        self._lock = threading.Lock()
+        self._usable: List[Engine] = []
+        self._checked_at: Optional[float] = None
+        self._probing = False
+        self._turn = itertools.count()
+
+    def choose(self) -> Optional[Engine]:
+        """A usable replica (round-robin), or None to read from the primary."""
+        usable = self._current()
+        if not usable:
+            return None
+        return usable[next(self._turn) % len(usable)]
+
+    def replica_lag(self, engine: Engine) -> Optional[float]:
+        """Replication lag in seconds, or None if the replica can't be reached."""
+        try:
+            with engine.connect() as conn:
+                if engine.dialect.name == "postgresql":
+                    # A wedged replica counts as unreachable instead of stalling the probe
+                    conn.execute(text(f"SET LOCAL statement_timeout = {int(self.probe_timeout * 1000)}"))
+                    return float(conn.execute(POSTGRES_LAG_SQL).scalar())
+                conn.execute(text("SELECT 1"))
+                return 0.0 # No replication to measure (e.g. a local SQLite copy)
+        except Exception as e:
+            logger.warning(f"Read replica {engine.url!r} is unreachable: {e}")
+            return None
+
+    def refresh(self) -> None:
+        """Measure every replica now and update the usable list. Blocking."""
+        usable = [engine for engine in self.engines if self._is_usable(engine)]
+        with self._lock:
+            self._usable = usable
+            self._checked_at = time.monotonic()
+
+    def _current(self) -> List[Engine]:
+        checked_at = self._checked_at
+        if checked_at is None or time.monotonic() - checked_at >= self.check_interval:
+            self._start_probe()
+        # The previous result while a probe runs; empty (the primary) until the first one finishes
+        return self._usable
+
+    def _start_probe(self) -> None:
+        with self._lock:
+            if self._probing:
+                return
+            self._probing = True
+        threading.Thread(target=self._probe, name="replica-lag-probe", daemon=True).start()
+
+    def _probe(self) -> None:
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("Read replica lag probe failed")
+        finally:
+            with self._lock:
+                self._probing = False
+
+    def _is_usable(self, engine: Engine) -> bool:
+        lag = self.replica_lag(engine)
+        if lag is not None and lag > self.max_lag:
+            logger.warning(f"Read replica {engine.url!r} is {lag:.1f}s behind; reading from the primary")
+        return lag is not None and lag <= self.max_lag
+
+
+class RoutingSession(Session):
+    """Session bound to the primary that routes `@replica_read` queries to a replica."""
+
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self._replica_reads = 0 # Nesting depth of @replica_read calls in progress
+        self._replica: Optional[Engine] = None
+        self._wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self._wrote = True
+        elif self._replica_reads and not self._wrote and self.replicas is not None:
+            self._replica = self._replica or self.replicas.choose()
+            if self._replica is not None:
+                return self._replica
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+    def close(self) -> None:
+        super().close()
+        self._replica = None
+        self._wrote = False
+
+
+def replica_read(method: F) -> F:
+    """
+    Mark a read-only service method `(self, db, ...)` as safe to serve from a
+    read replica, i.e. results may be up to the replica lag limit out of date.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        db = kwargs["db"] if "db" in kwargs else args[0]
+        if not isinstance(db, RoutingSession):
+            return method(self, *args, **kwargs)
+        db._replica_reads += 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            db._replica_reads -= 1
+    return wrapper
@@ -1,14 +1,15 @@
 from typing import Any, Dict, Optional, Union
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from ..core.config import settings
 from ..core.db import get_db # To get DB session in get_current_user
+from ..core.security import decode_access_token
 from ..models.user import User as UserModel, UserRole # Import UserRole for RoleChecker
 from ..services import user_service # To fetch user from DB
+from ..services.user_identity_cache import user_identity_cache
 from ..schemas.user import TokenData # To validate token payload structure
 
 # This URL must match the path of your token-issuing endpoint (login)
@@ -21,25 +22,28 @@ credentials_exception = HTTPException(
     headers={"WWW-Authenticate": "Bearer"},
 )
 
-async def get_current_user(
+def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ) -> UserModel:
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        email: Optional[str] = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        # Optional: Validate payload against TokenData schema
-        # token_data = TokenData(email=email)
-    except JWTError:
+    # Sync so FastAPI runs the user lookup in its threadpool, not on the event loop
+    payload = decode_access_token(token)
+    if payload is None:
         raise credentials_exception
+    email: Optional[str] = payload.get("sub")
+    if email is None:
+        raise credentials_exception
+    # Optional: Validate payload against TokenData schema
+    # token_data = TokenData(email=email)
 
+    user = user_identity_cache.get(db, email)
+    if user is not None:
+        return user
+    generation = user_identity_cache.generation # Read before loading; see UserIdentityCache.put
     user = user_service.get_user_by_email(db, email=email)
     if user is None:
         raise credentials_exception
+    user_identity_cache.put(email, user, generation)
     return user
 
 async def get_current_active_user(
@@ -0,0 +1,56 @@
+"""
+Loader options derived from response schemas.
+
+Response schemas embed related rows (FieldSchema.owner, .land_usage_plans), and
+serializing them from plain query results lazy-loads each one per row: a page
+of 100 fields is 1 + 200 queries. Services pass `loader_options(Model, Schema)`
+to their listing queries instead, which loads every relationship the schema
+embeds up front, nested embeds included, so a page costs a fixed number of
+queries however long it is:
+
+- many-to-one embeds (owner, customer) are joined into the main query;
+- collections (land_usage_plans) are loaded by one extra `IN` query each, which
+  keeps LIMIT/OFFSET and keyset pagination applying to the parent rows.
+
+Adding a relationship to a response schema changes what is loaded with it.
+"""
+import typing
+from functools import lru_cache
+from typing import Any, Iterator, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import Load, joinedload, selectinload
+
+
+@lru_cache(maxsize=None)
+def loader_options(model: type, schema: Type[BaseModel]) -> Tuple[Load, ...]:
+    """Options for `query.options(*...)` loading everything `schema` embeds from `model` rows."""
+    return tuple(_loaders(model, schema, None, (schema,)))
+
+
+def _loaders(model: type, schema: Type[BaseModel], parent: Optional[Load], path: Tuple[type, ...]) -> Iterator[Load]:
+    relationships = inspect(model).relationships
+    for name, field in schema.model_fields.items():
+        relationship = relationships.get(name)
+        nested = embedded_schema(field.annotation)
+        if relationship is None or nested is None or nested in path:
+            continue
+        attribute = getattr(model, name)
+        if parent is None:
+            loader = selectinload(attribute) if relationship.uselist else joinedload(attribute)
+        else:
+            loader = parent.selectinload(attribute) if relationship.uselist else parent.joinedload(attribute)
+        yield loader
+        yield from _loaders(relationship.mapper.class_, nested, loader, path + (nested,))
+
+
+def embedded_schema(annotation: Any) -> Optional[Type[BaseModel]]:
+    """The schema in `X`, `Optional[X]` or `List[X]`, if X is one."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        schema = embedded_schema(arg)
+        if schema is not None:
+            return schema
+    return None
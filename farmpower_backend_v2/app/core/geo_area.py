@@ -0,0 +1,125 @@
+"""
+Equal-area polygon area for lon/lat GeoJSON, in bulk.
+
+`shape(geometry).area` on lon/lat coordinates is in square degrees, whose size
+in metres varies with latitude. Here vertices are projected onto the WGS84
+Lambert cylindrical equal-area projection (x = a*lon, y = a*q(lat)/2, with
+q the authalic latitude function). That projection preserves ellipsoidal area
+exactly, so a planar shoelace sum over the projected vertices gives square
+metres on the ground. The ellipsoid constants are computed once at import
+and every step is a NumPy array operation, so thousands of polygons cost one
+pass.
+
+Kept free of application imports (NumPy only). The standalone yield
+calculator service ships an identical copy as FARMPOWER/backend/geo_area.py
+(test_geo_area checks they match); change both together.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# WGS84
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+_E2 = WGS84_F * (2 - WGS84_F)
+_E = np.sqrt(_E2)
+
+SQUARE_METRES_PER_HECTARE = 10_000
+
+
+def _authalic_q(lat_rad: np.ndarray) -> np.ndarray:
+    sin_lat = np.sin(lat_rad)
+    e_sin = _E * sin_lat
+    return (1 - _E2) * (sin_lat / (1 - e_sin ** 2) - np.log((1 - e_sin) / (1 + e_sin)) / (2 * _E))
+
+
+def polygon_rings(geometry: Any) -> Optional[List[List[np.ndarray]]]:
+    """
+    Rings of a GeoJSON Polygon/MultiPolygon as float (N, 2) [lon, lat] arrays, one
+    list per polygon with the exterior ring first. None if the geometry is not a
+    (Multi)Polygon or any ring is malformed (fewer than 4 positions, non-numeric).
+    """
+    if not isinstance(geometry, dict):
+        return None
+    if geometry.get("type") == "Polygon":
+        polygons = [geometry.get("coordinates")]
+    elif geometry.get("type") == "MultiPolygon":
+        polygons = list(geometry.get("coordinates") or [])
+    else:
+        return None
+    if not polygons:
+        return None
+
+    parsed = []
+    for polygon in polygons:
+        if not polygon:
+            return None
+        rings = []
+        for ring in polygon:
+            try:
+                coords = np.asarray(ring, dtype=float)
+            except (TypeError, ValueError):
+                return None
+            if coords.ndim != 2 or coords.shape[0] < 4 or coords.shape[1] < 2 or not np.isfinite(coords[:, :2]).all():
+                return None
+            rings.append(coords[:, :2])
+        parsed.append(rings)
+    return parsed
+
+
+def _flatten(geometries: Iterable[Any]) -> Tuple[List[np.ndarray], List[int], List[float], np.ndarray]:
+    """Rings as (N, 2) arrays, with owning geometry index and sign (+1 exterior, -1 hole)."""
+    rings, ring_owner, ring_sign, valid = [], [], [], []
+    for index, geometry in enumerate(geometries):
+        polygons = polygon_rings(geometry)
+        valid.append(polygons is not None)
+        for polygon in polygons or []:
+            for r, coords in enumerate(polygon):
+                rings.append(coords)
+                ring_owner.append(index)
+                ring_sign.append(1.0 if r == 0 else -1.0)
+    return rings, ring_owner, ring_sign, np.asarray(valid, dtype=bool)
+
+
+def polygon_areas_m2(geometries: Sequence[Any]) -> np.ndarray:
+    """
+    Ellipsoidal areas in square metres of GeoJSON Polygon/MultiPolygon geometries
+    with [lon, lat] coordinates. Unsupported or malformed geometries get NaN.
+    """
+    rings, ring_owner, ring_sign, valid = _flatten(geometries)
+    areas = np.full(len(valid), np.nan)
+    if not rings:
+        return areas
+
+    lengths = np.fromiter((len(ring) for ring in rings), dtype=np.int64, count=len(rings))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    coords = np.concatenate(rings)
+    lon, lat = coords[:, 0], np.clip(coords[:, 1], -90.0, 90.0)
+
+    # Longitudes relative to each ring's first vertex, wrapped so rings crossing
+    # the antimeridian stay contiguous; also keeps the shoelace terms small.
+    ring_of_vertex = np.repeat(np.arange(len(rings)), lengths)
+    dlon = (lon - lon[starts][ring_of_vertex] + 180.0) % 360.0 - 180.0
+    x = WGS84_A * np.radians(dlon)
+    y = WGS84_A * _authalic_q(np.radians(lat)) / 2
+    y = y - y[starts][ring_of_vertex]
+
+    successor = np.arange(len(x)) + 1
+    successor[starts + lengths - 1] = starts  # Close each ring, whether or not GeoJSON repeats the first vertex
+    cross = x * y[successor] - x[successor] * y
+    ring_areas = 0.5 * np.abs(np.add.reduceat(cross, starts)) * np.asarray(ring_sign)
+
+    totals = np.zeros(len(valid))
+    np.add.at(totals, np.asarray(ring_owner), ring_areas)
+    areas[valid] = np.abs(totals[valid])
+    return areas
+
+
+def polygon_areas_hectares(geometries: Sequence[Any]) -> np.ndarray:
+    return polygon_areas_m2(geometries) / SQUARE_METRES_PER_HECTARE
+
+
+def area_hectares(geometry: Dict[str, Any]) -> Optional[float]:
+    """Area of one GeoJSON polygon in hectares, or None if it can't be computed."""
+    area = polygon_areas_hectares([geometry])[0]
+    return None if np.isnan(area) else float(area)
@@ -0,0 +1,128 @@
+"""
+Coalescing GPS ingestion for the `update_location` socket event.
+
+Devices report positions at 1-10 Hz, but viewers only need the latest position
+of each device a few times a second. Instead of one emit per incoming point,
+points are buffered per room, keyed by device, and a newer point replaces the
+pending one. A flush loop sends each room a single batched frame every
+`flush_interval_ms`. Buffers are bounded per room; when a room is full, the
+device whose pending point is oldest is evicted, so under backpressure stale
+points are dropped rather than queued.
+"""
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL_MS = 200
+DEFAULT_MAX_DEVICES_PER_ROOM = 256
+
+# (room, frame) -> awaitable send, e.g. sio.emit("location_broadcast", frame, room=room)
+EmitFunc = Callable[[str, Dict[str, Any]], Awaitable[Any]]
+
+
+class LocationCoalescer:
+    """
+    Latest-position-per-device buffer with periodic batched flushes.
+    Not thread-safe: `submit` must be called from the event loop (socket handlers).
+    """
+
+    def __init__(
+        self,
+        emit: EmitFunc,
+        flush_interval_ms: int = DEFAULT_FLUSH_INTERVAL_MS,
+        max_devices_per_room: int = DEFAULT_MAX_DEVICES_PER_ROOM,
+    ):
+        self._emit = emit
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_devices_per_room = max_devices_per_room
+        # room -> device_id -> (fix time, point); insertion order = order devices became pending
+        self._pending: Dict[str, "OrderedDict[str, Tuple[datetime, Dict[str, Any]]]"] = {}
+        self._frame_field_ids: Dict[str, int] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self.stats = {
+            "received": 0,
+            "coalesced": 0,  # Replaced by a newer point from the same device before flushing
+            "dropped_stale": 0,  # Older than the device's pending point (out-of-order delivery)
+            "dropped_overflow": 0,  # Evicted because the room's buffer was full
+            "frames_sent": 0,
+            "points_sent": 0,
+        }
+
+    def submit(self, room: str, field_id: int, device_id: str, point: Dict[str, Any], fix_time: datetime) -> None:
+        """Buffer `point` as the latest position of `device_id` in `room`."""
+        self.stats["received"] += 1
+        devices = self._pending.get(room)
+        if devices is None:
+            devices = self._pending[room] = OrderedDict()
+            self._frame_field_ids[room] = field_id
+
+        previous = devices.get(device_id)
+        if previous is not None:
+            if fix_time < previous[0]:
+                self.stats["dropped_stale"] += 1
+                return
+            self.stats["coalesced"] += 1
+            del devices[device_id] # Re-insert at the end: now the freshest pending device
+        elif len(devices) >= self.max_devices_per_room:
+            devices.popitem(last=False)
+            self.stats["dropped_overflow"] += 1
+        devices[device_id] = (fix_time, point)
+        self._ensure_flush_loop()
+
+    async def flush(self) -> None:
+        """Send every room's pending points as one `location_broadcast` frame per room."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        field_ids, self._frame_field_ids = self._frame_field_ids, {}
+
+        sends = []
+        for room, devices in pending.items():
+            points: List[Dict[str, Any]] = [point for _, point in devices.values()]
+            self.stats["frames_sent"] += 1
+            self.stats["points_sent"] += len(points)
+            sends.append(self._emit(room, {"field_id": field_ids[room], "points": points}))
+        results = await asyncio.gather(*sends, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"location_broadcast emit failed: {result}")
+
+    async def aclose(self) -> None:
+        """Stop the flush loop after sending whatever is still pending."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+
+    def _ensure_flush_loop(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        # A slow flush delays the next one; meanwhile new points keep coalescing
+        # into the bounded buffers instead of piling up as queued emits.
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if not self._pending:
+                continue
+            try:
+                await self.flush()
+            except Exception as e: # Keep the loop alive; the next tick retries with fresh data
+                logger.error(f"GPS flush failed: {e}")
+
+
+def fix_time_utc(timestamp: Optional[datetime]) -> datetime:
+    """Time of a fix as an aware UTC datetime; naive timestamps are taken as UTC, missing ones as now."""
+    if timestamp is None:
+        return datetime.now(timezone.utc)
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
@@ -0,0 +1,79 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse
+
+from .config import settings
+
+T = TypeVar("T")
+
+
+class HashingPoolSaturated(RuntimeError):
+    """Raised instead of queueing when the password hashing pool is full."""
+
+
+class PasswordHashingPool:
+    """
+    Bounded pool for bcrypt work (~250ms of CPU per hash or verify).
+
+    At most `workers` hashes run at once, and at most `max_queue` more wait for a
+    worker; anything beyond that fails immediately with HashingPoolSaturated (a
+    503), so a burst of logins can't tie up every request thread or the CPU that
+    other requests need. bcrypt releases the GIL while hashing, so threads run in
+    parallel on separate cores without a process pool.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.completed = self.rejected = 0
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run `fn(*args)` on the pool and wait for its result."""
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HashingPoolSaturated("Too many password checks in progress")
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._on_done)
+        return future.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    def _on_done(self, future) -> None:
+        self.completed += 1
+        self._slots.release()
+
+
+def hashing_pool_saturated_handler(request: Request, exc: HashingPoolSaturated) -> Response:
+    """Exception handler telling clients to retry shortly instead of waiting in line."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
+password_hashing_pool = PasswordHashingPool(
+    workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
@@ -0,0 +1,104 @@
+"""
+HTTP caching for public listings and detail pages: strong ETags, conditional
+GETs (If-None-Match -> 304 Not Modified) and a Cache-Control policy per route.
+
+ETags are derived without loading the response:
+
+- listings: from the version counters of the resource types the page contains
+  (services/resource_versions.py, bumped by every write to that type);
+- single rows: from the row's `updated_at` plus the versions of what it embeds;
+
+each combined with the URL (path and query) and the response schemas, so a
+deploy that changes a response's shape doesn't answer 304 for old copies. The
+check costs one primary-key query; when the client's copy is current the route
+returns before running its own query or encoding anything:
+
+    validator = tractor_listing_cache.for_listing(request, db)
+    if validator.not_modified:
+        return validator.not_modified_response()
+    ...
+    return validator.apply(list_response(tractors, TractorSchema))
+"""
+import hashlib
+import json
+from functools import cached_property
+from typing import Any, Optional, Sequence, Type
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from ..services.resource_versions import resource_versions
+
+ETAG_HEADER = "ETag"
+
+
+def make_etag(*parts: Any) -> str:
+    """A strong ETag (quoted, no W/ prefix) for the given parts."""
+    return '"%s"' % hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:32]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header covers `etag` (weak comparison, RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def cache_control(max_age_s: int) -> str:
+    if max_age_s <= 0:
+        # Caches may keep the copy but revalidate it (cheaply, with If-None-Match) on every use
+        return "public, no-cache"
+    return f"public, max-age={max_age_s}, must-revalidate"
+
+
+class Validator:
+    """The ETag and Cache-Control headers of one response, and whether the client's copy is current."""
+
+    def __init__(self, etag: str, cache_control_value: str, if_none_match: Optional[str]):
+        self.etag = etag
+        self.headers = {ETAG_HEADER: etag, "Cache-Control": cache_control_value}
+        self.not_modified = etag_matches(if_none_match, etag)
+
+    def not_modified_response(self) -> Response:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers)
+
+    def apply(self, response: Response) -> Response:
+        """Set the headers on `response` (a returned Response, or the one injected into a route)."""
+        response.headers.update(self.headers)
+        return response
+
+
+class CachePolicy:
+    """
+    Caching for one kind of response: the resource types it contains (or, for a
+    single row, embeds), the schemas it is rendered with, and its Cache-Control max-age.
+    """
+
+    def __init__(self, resources: Sequence[str], schemas: Sequence[Type[BaseModel]], max_age_s: int):
+        self.resources = tuple(resources)
+        self.schemas = tuple(schemas)
+        self.cache_control = cache_control(max_age_s)
+
+    @cached_property
+    def _representation(self) -> str:
+        # Changes whenever a response schema does
+        shapes = json.dumps([schema.model_json_schema() for schema in self.schemas], sort_keys=True, default=str)
+        return hashlib.sha256(shapes.encode("utf-8")).hexdigest()
+
+    def for_listing(self, request: Request, db: Session) -> Validator:
+        return self._validator(request, resource_versions.current(db, self.resources))
+
+    def for_row(self, request: Request, db: Session, model: type, row_id: int) -> Optional[Validator]:
+        """None when the row doesn't exist (the route then answers its usual 404)."""
+        found = resource_versions.row_version(db, model, row_id, self.resources)
+        if found is None:
+            return None
+        updated_at, versions = found
+        return self._validator(request, updated_at.isoformat() if updated_at else None, versions)
+
+    def _validator(self, request: Request, *state: Any) -> Validator:
+        etag = make_etag(self._representation, request.url.path, sorted(request.query_params.multi_items()), *state)
+        return Validator(etag, self.cache_control, request.headers.get("if-none-match"))
@@ -1,39 +1,153 @@
+import atexit
+import copy
 import logging
+import random
 import sys
 import json
+import threading
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, RotatingFileHandler
 from pathlib import Path
+from typing import Deque, List, Optional, Sequence
 
-def setup_logging(app_name="FarmPower", log_level=logging.INFO):
+from .config import settings
+
+# Set per request by performance_middleware; copied into every record logged while handling it
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Request fields performance_middleware passes as `extra`, included in JSON logs
+REQUEST_FIELDS = ("method", "path", "status_code", "duration_ms")
+
+_writer: Optional["BackgroundLogWriter"] = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        log_data = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno
+        }
+        if getattr(record, "request_id", None):
+            log_data["request_id"] = record.request_id
+        for field in REQUEST_FIELDS:
+            if hasattr(record, field):
+                log_data[field] = getattr(record, field)
+        if record.exc_info:
+            log_data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(log_data)
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps records with the current request's id (unless one was passed explicitly)."""
+
+    def filter(self, record):
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class BackgroundLogWriter:
     """
-    Configure logging for the application with both file and console output.
-    
-    Args:
-        app_name (str): Name of the application for log identification
-        log_level (int): Logging level (default: logging.INFO)
+    Thread writing queued records to `handlers` in batches. It wakes every
+    `flush_interval_s` rather than per record, so a busy event loop isn't
+    interrupted by a thread switch for every log line.
     """
+
+    def __init__(self, handlers: Sequence[logging.Handler], max_records: int, flush_interval_s: float = 0.05):
+        self.handlers = list(handlers)
+        self.max_records = max_records
+        self.flush_interval = flush_interval_s
+        self._records: Deque[logging.LogRecord] = deque() # append/popleft are atomic
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def put(self, record: logging.LogRecord) -> bool:
+        if len(self._records) >= self.max_records:
+            return False
+        self._records.append(record)
+        return True
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._drain()
+        for handler in self.handlers:
+            handler.close()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self._drain()
+
+    def _drain(self) -> None:
+        while self._records:
+            record = self._records.popleft()
+            for handler in self.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+
+class StdoutHandler(logging.StreamHandler):
+    """Writes to whatever sys.stdout is when the writer thread gets to the record."""
+
+    def __init__(self, level=logging.NOTSET):
+        logging.Handler.__init__(self, level)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler feeding a BackgroundLogWriter: keeps exc_info for the
+    formatters (nothing is pickled) and drops records instead of blocking
+    when the writer has fallen behind.
+    """
+
+    def __init__(self, writer: BackgroundLogWriter):
+        super().__init__(writer)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Merge args now, while they still hold the values at the time of the call
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        if not self.queue.put(record):
+            self.dropped += 1
+
+
+def build_handlers(app_name: str = "FarmPower", log_dir: Path = Path("logs")) -> List[logging.Handler]:
+    """The console, rotating file and rotating JSON file handlers that do the actual writing."""
     # Create logs directory if it doesn't exist
-    log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
-    
+
     # Configure logging format
     log_format = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
-    
-    # Set up root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(log_level)
-    
-    # Clear any existing handlers
-    root_logger.handlers = []
-    
+
     # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = StdoutHandler()
     console_handler.setFormatter(log_format)
-    root_logger.addHandler(console_handler)
-    
+
     # File handler with rotation
     file_handler = RotatingFileHandler(
         filename=log_dir / f"{app_name.lower()}.log",
@@ -42,25 +156,8 @@ def setup_logging(app_name="FarmPower", log_level=logging.INFO):
         encoding='utf-8'
     )
     file_handler.setFormatter(log_format)
-    root_logger.addHandler(file_handler)
-    
+
     # JSON handler for structured logging
-    class JsonFormatter(logging.Formatter):
-        def format(self, record):
-            log_data = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "level": record.levelname,
-                "message": record.getMessage(),
-                "module": record.module,
-                "function": record.funcName,
-                "line": record.lineno
-            }
-            if hasattr(record, "request_id"):
-                log_data["request_id"] = record.request_id
-            if record.exc_info:
-                log_data["exception"] = self.formatException(record.exc_info)
-            return json.dumps(log_data)
-    
     json_handler = RotatingFileHandler(
         filename=log_dir / f"{app_name.lower()}_json.log",
         maxBytes=10485760,  # 10MB
@@ -68,34 +165,86 @@ def setup_logging(app_name="FarmPower", log_level=logging.INFO):
         encoding='utf-8'
     )
     json_handler.setFormatter(JsonFormatter())
-    root_logger.addHandler(json_handler)
-    
+    return [console_handler, file_handler, json_handler]
+
+
+def setup_logging(app_name="FarmPower", log_level=logging.INFO, log_dir: Path = Path("logs")):
+    """
+    Configure logging for the application with both file and console output.
+
+    The root logger only puts records on a bounded queue; a background thread
+    (BackgroundLogWriter) formats them and writes to the console and log files,
+    so logging calls don't do I/O on the event loop.
+
+    Args:
+        app_name (str): Name of the application for log identification
+        log_level (int): Logging level (default: logging.INFO)
+        log_dir (Path): Directory for the rotating log files
+    """
+    global _writer
+    shutdown_logging() # Reconfiguring: flush and stop the previous writer thread
+
+    # Set up root logger
+    root_logger = logging.getLogger()
+    root_logger.setLevel(log_level)
+
+    # Clear any existing handlers
+    root_logger.handlers = []
+
+    _writer = BackgroundLogWriter(build_handlers(app_name, log_dir), max_records=settings.LOG_QUEUE_SIZE)
+    _writer.start()
+    queue_handler = NonBlockingQueueHandler(_writer)
+    queue_handler.addFilter(RequestIdFilter())
+    root_logger.addHandler(queue_handler)
+
     # Log startup message
     root_logger.info(f"=== {app_name} Logging Initialized ===")
     return root_logger
 
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the writer thread."""
+    global _writer
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
+
+atexit.register(shutdown_logging)
+
+
+def should_log_request(status_code: int, duration: float) -> bool:
+    """Errors and slow requests are always logged; other requests at LOG_SUCCESS_SAMPLE_RATE."""
+    if status_code >= 400 or duration >= settings.LOG_SLOW_REQUEST_S:
+        return True
+    return settings.LOG_SUCCESS_SAMPLE_RATE >= 1 or random.random() < settings.LOG_SUCCESS_SAMPLE_RATE
+
 # Performance monitoring middleware
 async def performance_middleware(request, call_next):
-    import time
-    start_time = time.time()
-    
-    response = await call_next(request)
-    
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    token = request_id_var.set(request_id) # Seen by handlers, including those on the threadpool
+    start_time = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+
     # Calculate request duration
-    duration = time.time() - start_time
-    
+    duration = time.perf_counter() - start_time
+
     # Log request details
-    logging.info(
-        f"Request completed",
-        extra={
-            "request_id": request.headers.get("X-Request-ID", "N/A"),
-            "method": request.method,
-            "path": request.url.path,
-            "duration": f"{duration:.3f}s",
-            "status_code": response.status_code
-        }
-    )
-    
+    if should_log_request(response.status_code, duration):
+        logging.info(
+            f"Request completed",
+            extra={
+                "request_id": request_id,
+                "method": request.method,
+                "path": request.url.path,
+                "duration_ms": round(duration * 1000, 3),
+                "status_code": response.status_code
+            }
+        )
+
     # Add timing header
     response.headers["X-Response-Time"] = f"{duration:.3f}s"
-    return response
\ No newline at end of file
+    response.headers["X-Request-ID"] = request_id
+    return response
@@ -0,0 +1,204 @@
+"""
+Prometheus metrics, served by main.py at /metrics in the text exposition format.
+
+Request timings are recorded by MetricsMiddleware on the event loop thread, so
+the hot path is a dictionary lookup and a few integer increments with no lock.
+Everything else (DB pools, caches, Socket.IO) is read from its owner only when
+/metrics is scraped, through collectors registered with `register_collector` or
+`register_cache`. Values are per worker process.
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy.pool import QueuePool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Seconds; request latencies and DB pool checkout waits
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Dict[str, str]
+# (name, type, help, [(labels, value)]); histograms pass Histogram objects as values
+MetricFamily = Tuple[str, str, str, List[Tuple[Labels, object]]]
+
+
+class Histogram:
+    """Bucketed observations. Not thread-safe: observe from one thread, or use `lock`."""
+
+    __slots__ = ("buckets", "counts", "sum", "count", "lock")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS, lock: bool = False):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1) # Per bucket, not cumulative; last is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock() if lock else None
+
+    def observe(self, value: float) -> None:
+        if self.lock is None:
+            self._observe(value)
+        else:
+            with self.lock:
+                self._observe(value)
+
+    def _observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.durations: Dict[Tuple[str, str, str], Histogram] = {}
+        self.in_flight = 0
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route, str(status))
+        histogram = self.durations.get(key)
+        if histogram is None:
+            histogram = self.durations[key] = Histogram()
+        histogram.observe(seconds)
+
+    def collect(self) -> Iterable[MetricFamily]:
+        yield (
+            "http_request_duration_seconds", "histogram", "HTTP request latency by route template.",
+            [({"method": m, "route": r, "status": s}, h) for (m, r, s), h in list(self.durations.items())],
+        )
+        yield ("http_requests_in_flight", "gauge", "HTTP requests being handled.", [({}, self.in_flight)])
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.requests = RequestMetrics()
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = [self.requests.collect, self._collect_caches]
+        self._caches: Dict[str, Callable[[], Tuple[int, int]]] = {}
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        """`collector` is called on every scrape and yields metric families."""
+        self._collectors.append(collector)
+
+    def register_cache(self, name: str, stats: Callable[[], Tuple[int, int]]) -> None:
+        """Report a cache's hit ratio; `stats` returns its (hits, misses) so far."""
+        self._caches[name] = stats
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for collector in self._collectors:
+            for name, kind, help_text, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    if isinstance(value, Histogram):
+                        lines.extend(_histogram_lines(name, labels, value))
+                    else:
+                        lines.append(f"{name}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _collect_caches(self) -> Iterable[MetricFamily]:
+        stats = {name: stats() for name, stats in list(self._caches.items())}
+        yield ("cache_hits_total", "counter", "Cache lookups answered from the cache.",
+               [({"cache": name}, hits) for name, (hits, _) in stats.items()])
+        yield ("cache_misses_total", "counter", "Cache lookups that fell through.",
+               [({"cache": name}, misses) for name, (_, misses) in stats.items()])
+        yield ("cache_hit_ratio", "gauge", "Hits / lookups since the worker started.",
+               [({"cache": name}, hits / (hits + misses)) for name, (hits, misses) in stats.items() if hits + misses])
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _number(value: object) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _histogram_lines(name: str, labels: Labels, histogram: Histogram) -> List[str]:
+    lines = []
+    cumulative = 0
+    counts = list(histogram.counts)
+    for bound, count in zip(histogram.buckets + (float("inf"),), counts):
+        cumulative += count
+        le = "+Inf" if bound == float("inf") else repr(bound)
+        lines.append(f"{name}_bucket{_labels({**labels, 'le': le})} {cumulative}")
+    lines.append(f"{name}_sum{_labels(labels)} {_number(float(histogram.sum))}")
+    lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+    return lines
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, so /tractors/1 and /tractors/2 share a series."""
+    route = scope.get("route")
+    if route is not None:
+        return scope.get("root_path", "") + getattr(route, "path", "")
+    if "app_root_path" in scope: # Inside a mounted non-FastAPI app (Socket.IO, static files)
+        return scope.get("root_path", "") + "/*"
+    return "unmatched" # 404s; raw paths would make unbounded series
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing every HTTP request into `registry`."""
+
+    def __init__(self, app: ASGIApp, registry: "MetricsRegistry"):
+        self.app = app
+        self.requests = registry.requests
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status_code = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.requests.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.requests.in_flight -= 1
+            self.requests.observe(scope["method"], route_template(scope), status_code, time.perf_counter() - started)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = Histogram(lock=True) # Checkouts happen on threadpool workers
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - started)
+
+
+def pool_families(pools: Dict[str, object]) -> Iterable[MetricFamily]:
+    """Gauges for the connection pools of `pools` (engine name -> engine.pool)."""
+    queue_pools = {name: pool for name, pool in pools.items() if isinstance(pool, QueuePool)}
+    for metric, help_text, read in (
+        ("db_pool_size", "Connections the pool keeps open.", lambda pool: pool.size()),
+        ("db_pool_checked_out", "Connections in use.", lambda pool: pool.checkedout()),
+        ("db_pool_checked_in", "Idle connections in the pool.", lambda pool: pool.checkedin()),
+        ("db_pool_overflow", "Connections open beyond the pool size (negative: unopened pool slots).", lambda pool: pool.overflow()),
+    ):
+        yield (metric, "gauge", help_text, [({"engine": name}, read(pool)) for name, pool in queue_pools.items()])
+    yield (
+        "db_pool_checkout_wait_seconds", "histogram", "Time spent waiting for a pooled connection.",
+        [({"engine": name}, pool.checkout_wait) for name, pool in queue_pools.items() if isinstance(pool, TimedQueuePool)],
+    )
+
+
+metrics = MetricsRegistry()
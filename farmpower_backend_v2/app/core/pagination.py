@@ -0,0 +1,173 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Offset paging (`.offset(skip)`) makes the database walk past every skipped row,
+so deep pages get slower the further a client scrolls. Keyset paging instead
+filters on the sort key of the last row already seen, e.g.
+`WHERE (created_at, id) < (:last_created_at, :last_id)`, which an index on
+the same columns answers in constant time regardless of depth.
+
+Cursors are opaque, URL-safe tokens encoding the sort key name and the values
+of the last row on the page. Services return a `Page` (a list carrying
+`next_cursor`); routers expose it through the `X-Next-Cursor` response header
+so existing list responses keep their shape.
+"""
+import base64
+import binascii
+import enum
+import json
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Tuple
+
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import Select, and_, or_, tuple_
+from sqlalchemy.orm import Query
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# (column, descending) pairs; the last column must be unique (normally the primary key)
+SortKey = Sequence[Tuple[InstrumentedAttribute, bool]]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor token is malformed or was issued for a different sort order."""
+
+
+class Page(list):
+    """A page of results. Behaves as a plain list, plus the cursor for the following page."""
+
+    def __init__(self, items=(), next_cursor: Optional[str] = None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+
+
+def _sort_key_name(sort_key: SortKey) -> str:
+    return ",".join(column.key for column, _ in sort_key)
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _from_json_value(column: InstrumentedAttribute, value: Any) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if issubclass(python_type, enum.Enum):
+        return python_type(value)
+    return python_type(value)
+
+
+def encode_cursor(sort_key: SortKey, values: Sequence[Any]) -> str:
+    payload = {"k": _sort_key_name(sort_key), "v": [_to_json_value(v) for v in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(sort_key: SortKey, cursor: str) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["k"] != _sort_key_name(sort_key) or len(payload["v"]) != len(sort_key):
+            raise InvalidCursorError("Cursor does not match this listing's sort order")
+        return [_from_json_value(column, value) for (column, _), value in zip(sort_key, payload["v"])]
+    except InvalidCursorError:
+        raise
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(f"Malformed cursor: {e}") from e
+
+
+def _after(sort_key: SortKey, values: Sequence[Any]):
+    """Filter clause selecting rows that sort strictly after `values`."""
+    directions = {descending for _, descending in sort_key}
+    columns = [column for column, _ in sort_key]
+    if len(directions) == 1:
+        # Row-value comparison; served directly by a composite index on the same columns
+        if directions.pop():
+            return tuple_(*columns) < tuple_(*values)
+        return tuple_(*columns) > tuple_(*values)
+
+    # Mixed directions: expand to (a > x) OR (a = x AND b < y) OR ...
+    clauses = []
+    for i, (column, descending) in enumerate(sort_key):
+        equal_prefix = [columns[j] == values[j] for j in range(i)]
+        step = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal_prefix, step))
+    return or_(*clauses)
+
+
+def _ordered(query: Query, sort_key: SortKey) -> Query:
+    return query.order_by(*[column.desc() if descending else column.asc() for column, descending in sort_key])
+
+
+def _to_page(rows: List[Any], sort_key: SortKey, limit: int) -> Page:
+    # Callers fetch one extra row to learn whether another page exists without a COUNT
+    if len(rows) <= limit:
+        return Page(rows)
+    rows = rows[:limit]
+    next_cursor = encode_cursor(sort_key, [getattr(rows[-1], column.key) for column, _ in sort_key])
+    return Page(rows, next_cursor=next_cursor)
+
+
+def keyset_paginate(query: Query, sort_key: SortKey, limit: int, cursor: Optional[str] = None) -> Page:
+    """
+    Order `query` by `sort_key` and return up to `limit` rows following `cursor`.
+    Sort key columns are assumed non-null.
+    """
+    if cursor:
+        query = query.filter(_after(sort_key, decode_cursor(sort_key, cursor)))
+    return _to_page(_ordered(query, sort_key).limit(limit + 1).all(), sort_key, limit)
+
+
+def offset_paginate(query: Query, sort_key: SortKey, skip: int, limit: int) -> Page:
+    """
+    Legacy offset paging over the same ordering, kept for existing `skip` clients.
+    The returned page still carries a cursor so clients can switch to keyset paging.
+    """
+    return _to_page(_ordered(query, sort_key).offset(skip).limit(limit + 1).all(), sort_key, limit)
+
+
+def paginate(query: Query, sort_key: SortKey, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Page:
+    """Keyset paging unless the caller asked for a non-zero offset without a cursor."""
+    if skip and not cursor:
+        return offset_paginate(query, sort_key, skip, limit)
+    return keyset_paginate(query, sort_key, limit, cursor)
+
+
+async def paginate_async(
+    db: "AsyncSession", stmt: Select, sort_key: SortKey, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> Page:
+    """`paginate` for a `select()` statement executed on an AsyncSession."""
+    if cursor:
+        stmt = stmt.where(_after(sort_key, decode_cursor(sort_key, cursor)))
+    elif skip:
+        stmt = stmt.offset(skip)
+    result = await db.execute(_ordered(stmt, sort_key).limit(limit + 1))
+    return _to_page(list(result.scalars().all()), sort_key, limit)
+
+
+def set_next_cursor_header(response: Response, page: Sequence[Any]) -> None:
+    next_cursor = getattr(page, "next_cursor", None)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+def invalid_cursor_handler(request: Request, exc: InvalidCursorError) -> Response:
+    """Exception handler turning a bad cursor into a 400 instead of a 500."""
+    return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)})
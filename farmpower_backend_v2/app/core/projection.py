@@ -0,0 +1,83 @@
+"""
+Column projections for list endpoints (`fields=`).
+
+Listings normally load whole rows and serialize every schema field, including
+large `description` text, `coordinates` and `image_urls` JSON, when a UI only
+renders cards. With `fields=card` an endpoint returns its card schema, and with
+`fields=id,name,price` just those fields. Either way the query loads only the
+columns the response reads (`load_only`, plus the sort key for paging cursors)
+and the rows are serialized straight to JSON without the full response model.
+"""
+from typing import Any, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from .pagination import SortKey, set_next_cursor_header
+from .responses import ORJSONResponse, encoder_for
+
+CARD_VIEW = "card"
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return (e.g. `id,name,price`), or `card` for the card view"
+
+
+def schema_attributes(schema: Type[BaseModel]) -> Tuple[str, ...]:
+    """Attribute names `schema` reads from an ORM object (validation aliases included)."""
+    return tuple(
+        field.validation_alias if isinstance(field.validation_alias, str) else name
+        for name, field in schema.model_fields.items()
+    )
+
+
+class FieldSelection:
+    """The columns a sparse response needs, and how to serialize rows loaded with only those."""
+
+    def __init__(self, columns: Sequence[str], card_schema: Optional[Type[BaseModel]] = None):
+        self.columns = tuple(columns)
+        self.card_schema = card_schema
+
+    def serialize(self, items: Sequence[Any]) -> List[Any]:
+        if self.card_schema is not None:
+            to_python = encoder_for(self.card_schema).to_python
+            return [to_python(item) for item in items]
+        return [{name: getattr(item, name) for name in self.columns} for item in items]
+
+    def response(self, items: Sequence[Any]) -> ORJSONResponse:
+        response = ORJSONResponse(self.serialize(items))
+        set_next_cursor_header(response, items)
+        return response
+
+
+def parse_fields(
+    fields: Optional[str], model: type, schema: Type[BaseModel], card_schema: Type[BaseModel]
+) -> Optional[FieldSelection]:
+    """
+    None for the full response; otherwise the selection for `fields=card` or a
+    comma-separated subset of `schema`'s column fields. Unknown names are a 400.
+    """
+    if not fields:
+        return None
+    if fields == CARD_VIEW:
+        return FieldSelection(schema_attributes(card_schema), card_schema)
+
+    column_names = set(inspect(model).column_attrs.keys())
+    allowed = [name for name in schema.model_fields if name in column_names]
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in allowed]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown) or fields!r}. Choose from {', '.join(allowed)} or {CARD_VIEW!r}."
+        )
+    return FieldSelection(names)
+
+
+def projection_options(model: type, columns: Sequence[str], sort_key: SortKey = ()) -> Tuple[LoaderOption, ...]:
+    """`load_only` the given column names, plus the sort key columns paging cursors are built from."""
+    column_names = set(inspect(model).column_attrs.keys())
+    attributes = [getattr(model, name) for name in columns if name in column_names]
+    attributes += [column for column, _ in sort_key if column.key not in columns]
+    return (load_only(*attributes),)
@@ -0,0 +1,185 @@
+"""
+Per-request SQL statement counts and time.
+
+Every Engine (including the sync engine inside an AsyncEngine) reports its
+cursor executions to the QueryStats of the code running them, found through a
+ContextVar set by `track_queries`. QueryStatsMiddleware tracks each HTTP
+request: sync handlers and dependencies run on the threadpool with a copy of the
+request's context, so their statements count too. The totals are returned as
+X-DB-Query-Count / X-DB-Query-Time headers and recorded for /metrics.
+
+The same statement run many times in one request is usually an N+1 lazy load
+(one SELECT per row of a listing); those are logged with the statement.
+
+Tests put budgets on endpoints and service calls with the `query_budget`
+fixture (app/tests/conftest.py):
+
+    with query_budget(2):
+        client.get("/messages/conversations/")
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .metrics import Histogram, MetricFamily, route_template
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Query-Time" # Milliseconds
+
+# Statements per request
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+
+class QueryStats:
+    """Statements executed inside a `track_queries` block, also counted by enclosing blocks."""
+
+    def __init__(self, parent: Optional["QueryStats"] = None, record_statements: bool = False):
+        self.parent = parent
+        self.count = 0
+        self.seconds = 0.0
+        self.executions: Dict[str, int] = {} # Statement -> times run
+        self.statements: Optional[List[str]] = [] if record_statements else None
+
+    def add(self, statement: str, seconds: float) -> None:
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.seconds += seconds
+            stats.executions[statement] = stats.executions.get(statement, 0) + 1
+            if stats.statements is not None:
+                stats.statements.append(statement)
+            stats = stats.parent
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements run at least `threshold` times, most repeated first."""
+        repeats = [(statement, n) for statement, n in self.executions.items() if n >= threshold]
+        return sorted(repeats, key=lambda item: -item[1])
+
+
+@contextmanager
+def track_queries(record_statements: bool = False) -> Iterator[QueryStats]:
+    stats = QueryStats(parent=_current.get(), record_statements=record_statements)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[QueryStats]:
+    """Raise QueryBudgetExceeded, listing the statements, if the block runs more than `max_queries`."""
+    with track_queries(record_statements=True) as stats:
+        yield stats
+    if stats.count > max_queries:
+        listing = "\n".join(f"  {statement}" for statement in stats.statements)
+        raise QueryBudgetExceeded(f"{stats.count} queries, budget {max_queries}:\n{listing}")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    started = conn.info.get("query_started")
+    if stats is not None and started:
+        stats.add(statement, time.perf_counter() - started.pop())
+
+
+def _handle_error(exception_context) -> None:
+    # Failed statements never reach after_cursor_execute
+    started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def install_query_stats() -> None:
+    """Listen on every Engine; cheap (one ContextVar lookup) for statements run outside `track_queries`."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+class QueryMetrics:
+    """Per-route statement counts and time; observed on the event loop thread, like RequestMetrics."""
+
+    def __init__(self):
+        self.counts: Dict[Tuple[str, str], Histogram] = {}
+        self.seconds: Dict[Tuple[str, str], Histogram] = {}
+        self.repeated: Dict[Tuple[str, str], int] = {}
+
+    def observe(self, method: str, route: str, stats: QueryStats, repeated: int) -> None:
+        key = (method, route)
+        if key not in self.counts:
+            self.counts[key] = Histogram(QUERY_COUNT_BUCKETS)
+            self.seconds[key] = Histogram()
+        self.counts[key].observe(stats.count)
+        self.seconds[key].observe(stats.seconds)
+        if repeated:
+            self.repeated[key] = self.repeated.get(key, 0) + 1
+
+    def collect(self) -> Iterable[MetricFamily]:
+        yield ("db_queries_per_request", "histogram", "SQL statements run per HTTP request.",
+               [({"method": m, "route": r}, h) for (m, r), h in list(self.counts.items())])
+        yield ("db_query_seconds_per_request", "histogram", "Time spent in SQL statements per HTTP request.",
+               [({"method": m, "route": r}, h) for (m, r), h in list(self.seconds.items())])
+        yield ("db_repeated_query_requests_total", "counter", "Requests that repeated a statement (likely N+1).",
+               [({"method": m, "route": r}, n) for (m, r), n in list(self.repeated.items())])
+
+
+class QueryStatsMiddleware:
+    """Pure ASGI middleware tracking the statements each HTTP request runs."""
+
+    def __init__(self, app: ASGIApp, query_metrics: QueryMetrics, headers: bool = True, repeat_threshold: int = 5):
+        self.app = app
+        self.query_metrics = query_metrics
+        self.headers = headers
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_headers(message: Message) -> None:
+                if self.headers and message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers[QUERY_COUNT_HEADER] = str(stats.count)
+                    headers[QUERY_TIME_HEADER] = f"{stats.seconds * 1000:.1f}"
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_headers)
+            finally:
+                self._record(scope, stats)
+
+    def _record(self, scope: Scope, stats: QueryStats) -> None:
+        route = route_template(scope)
+        repeated = stats.repeated(self.repeat_threshold)
+        for statement, n in repeated:
+            logger.warning(
+                f"Possible N+1: {scope['method']} {route} ran the same statement {n} times: {statement[:300]}"
+            )
+        self.query_metrics.observe(scope["method"], route, stats, len(repeated))
+
+
+query_metrics = QueryMetrics()
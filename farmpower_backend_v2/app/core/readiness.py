@@ -0,0 +1,82 @@
+"""
+Database readiness, reported by /health.
+
+The app no longer waits for the database before binding its port. Instead a
+background task started at application startup checks connectivity, retrying
+with exponential backoff until the first success and then re-checking every
+`interval_s`. /health reads the latest result rather than querying per request.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+import anyio.to_thread
+
+from .config import settings
+from .db import check_database_connection
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseReadiness:
+    def __init__(self, check: Callable[[], None], interval_s: float, max_backoff_s: float):
+        self.check = check # Blocking; raises when the database is unreachable
+        self.interval = interval_s
+        self.max_backoff = max_backoff_s
+        self.ready = False
+        self.last_error: Optional[str] = None
+        self.checked_at: Optional[float] = None # time.time() of the latest check
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def check_once(self) -> bool:
+        try:
+            await anyio.to_thread.run_sync(self.check)
+        except Exception as e:
+            if self.ready or self.last_error is None:
+                logger.warning(f"Database unreachable: {e}")
+            self.ready, self.last_error = False, str(e)
+        else:
+            if not self.ready:
+                logger.info("✅ Database reachable")
+            self.ready, self.last_error = True, None
+        self.checked_at = time.time()
+        return self.ready
+
+    def status(self) -> Dict[str, Any]:
+        if self.ready:
+            database = "connected"
+        elif self.last_error is None:
+            database = "connecting"
+        else:
+            database = f"error: {self.last_error}"
+        return {"ready": self.ready, "database": database, "checked_at": self.checked_at}
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            if await self.check_once():
+                backoff = 1.0
+                await asyncio.sleep(self.interval)
+            else:
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+db_readiness = DatabaseReadiness(
+    check_database_connection,
+    interval_s=settings.DB_HEALTH_CHECK_INTERVAL_S,
+    max_backoff_s=settings.DB_CONNECT_MAX_BACKOFF_S
+)
@@ -0,0 +1,84 @@
+"""
+Real-time delivery to connected clients over Socket.IO.
+
+Every authenticated socket joins a `user_{id}` room (see socket_manager). The
+service layer is synchronous and runs in FastAPI's threadpool, so it cannot
+await `sio.emit` directly. Instead services queue events on their DB session
+with `emit_to_user_after_commit`; the events are sent once that session
+commits (and dropped if it rolls back), so clients never hear about rows that
+do not exist. Sends are scheduled onto the server's event loop, which is
+captured at application startup with `bind_event_loop`.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "realtime_pending_emits"
+_LISTENING_KEY = "realtime_listening"
+
+# (room, event name, JSON-serializable payload)
+PendingEmit = Tuple[str, str, Dict[str, Any]]
+
+
+def user_room(user_id: int) -> str:
+    """Name of the Socket.IO room holding all of a user's connections."""
+    return f"user_{user_id}"
+
+
+class RealtimeDispatcher:
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind_event_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Remember the loop the Socket.IO server runs on. Until bound, emits are dropped."""
+        self._loop = loop
+
+    def emit_to_user_after_commit(self, db: Session, user_id: int, event_name: str, payload: Dict[str, Any]) -> None:
+        """Queue `event_name` for `user_id`'s room, sent when `db` next commits."""
+        db.info.setdefault(_PENDING_KEY, []).append((user_room(user_id), event_name, payload))
+        if not db.info.get(_LISTENING_KEY):
+            event.listen(db, "after_commit", self._on_commit)
+            event.listen(db, "after_soft_rollback", self._on_rollback)
+            db.info[_LISTENING_KEY] = True
+
+    def emit_to_user(self, user_id: int, event_name: str, payload: Dict[str, Any]) -> None:
+        """Send immediately, for events not tied to a database write."""
+        self._dispatch([(user_room(user_id), event_name, payload)])
+
+    def _on_commit(self, db: Session) -> None:
+        self._dispatch(db.info.pop(_PENDING_KEY, []))
+
+    def _on_rollback(self, db: Session, previous_transaction) -> None:
+        if previous_transaction.parent is None: # Savepoint rollbacks keep the outer transaction's emits
+            db.info.pop(_PENDING_KEY, None)
+
+    def _dispatch(self, emits: List[PendingEmit]) -> None:
+        loop = self._loop
+        if not emits or loop is None or loop.is_closed():
+            return
+        from .socket_manager import sio # Deferred: socket_manager imports this module
+
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        for room, event_name, payload in emits:
+            if on_loop: # Called from an async route handler
+                task = loop.create_task(sio.emit(event_name, payload, room=room))
+                task.add_done_callback(self._log_failure)
+            else: # Called from a threadpool worker (sync route handler)
+                future = asyncio.run_coroutine_threadsafe(sio.emit(event_name, payload, room=room), loop)
+                future.add_done_callback(self._log_failure)
+
+    @staticmethod
+    def _log_failure(future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning(f"Real-time emit failed: {future.exception()}")
+
+
+realtime = RealtimeDispatcher()
@@ -0,0 +1,192 @@
+"""
+In-process full-text search index.
+
+Used as the fallback search engine when the database has no native text search
+(SQLite in development and tests). Postgres deployments search through the
+tsvector / pg_trgm indexes created alongside the tables instead.
+"""
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+# Scoring constants (Okapi BM25)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Match quality multipliers for non-exact term matches
+PREFIX_MATCH_WEIGHT = 0.8
+FUZZY_MATCH_WEIGHT = 0.6
+FUZZY_MIN_SIMILARITY = 0.5  # Trigram similarity threshold, same scale as pg_trgm
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lower-case and split text into alphanumeric tokens."""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+
+def trigrams(term: str) -> Set[str]:
+    """Return the trigram set of a term, padded the same way pg_trgm pads words."""
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def trigram_similarity(a: str, b: str) -> float:
+    """Jaccard similarity of two terms' trigram sets (0.0 - 1.0)."""
+    ta, tb = trigrams(a), trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+
+class InvertedIndex:
+    """
+    Thread-safe inverted index with BM25 ranking.
+
+    Documents are identified by an integer id and made of named text fields,
+    each field carrying a weight (e.g. a match in `name` counts more than one
+    in `description`). Query tokens are matched exactly, by prefix (so partial
+    input like "joh" finds "john") and by trigram similarity (so "deer" finds
+    "deere"). Every query token must match for a document to be returned.
+    """
+
+    def __init__(self, field_weights: Mapping[str, float]):
+        self.field_weights = dict(field_weights)
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+            self._doc_terms: Dict[int, Dict[str, float]] = {}
+            self._doc_lengths: Dict[int, float] = {}
+            self._total_length = 0.0
+            self._trigram_terms: Dict[str, Set[str]] = defaultdict(set)
+            self._sorted_terms: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._doc_terms
+
+    def add(self, doc_id: int, fields: Mapping[str, Optional[str]]) -> None:
+        """Index (or re-index) a document."""
+        term_weights: Dict[str, float] = defaultdict(float)
+        for field_name, weight in self.field_weights.items():
+            for token in tokenize(fields.get(field_name)):
+                term_weights[token] += weight
+
+        with self._lock:
+            self._remove_locked(doc_id)
+            if not term_weights:
+                return
+            for term, weight in term_weights.items():
+                if term not in self._postings:
+                    self._add_term_locked(term)
+                self._postings[term][doc_id] = weight
+            length = sum(term_weights.values())
+            self._doc_terms[doc_id] = dict(term_weights)
+            self._doc_lengths[doc_id] = length
+            self._total_length += length
+
+    def remove(self, doc_id: int) -> None:
+        with self._lock:
+            self._remove_locked(doc_id)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Return `(doc_id, score)` pairs for documents matching every query token,
+        best match first. Ties are broken by ascending doc_id.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        with self._lock:
+            doc_count = len(self._doc_terms)
+            if doc_count == 0:
+                return []
+            avg_length = self._total_length / doc_count
+
+            scores: Optional[Dict[int, float]] = None
+            for token in tokens:
+                token_scores: Dict[int, float] = {}
+                for term, match_weight in self._expand_locked(token):
+                    postings = self._postings[term]
+                    idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for doc_id, tf in postings.items():
+                        norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_lengths[doc_id] / avg_length)
+                        score = match_weight * idf * tf * (BM25_K1 + 1) / (tf + norm)
+                        if score > token_scores.get(doc_id, 0.0):
+                            token_scores[doc_id] = score
+
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {
+                        doc_id: score + token_scores[doc_id]
+                        for doc_id, score in scores.items()
+                        if doc_id in token_scores
+                    }
+                if not scores:
+                    return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit is not None else ranked
+
+    # --- Internal helpers (caller holds the lock) ---
+
+    def _add_term_locked(self, term: str) -> None:
+        for gram in trigrams(term):
+            self._trigram_terms[gram].add(term)
+        self._sorted_terms = None
+
+    def _remove_locked(self, doc_id: int) -> None:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+                for gram in trigrams(term):
+                    gram_terms = self._trigram_terms[gram]
+                    gram_terms.discard(term)
+                    if not gram_terms:
+                        del self._trigram_terms[gram]
+                self._sorted_terms = None
+
+    def _expand_locked(self, token: str) -> List[Tuple[str, float]]:
+        """Map a query token to indexed terms with a match-quality weight."""
+        matches: Dict[str, float] = {}
+        if token in self._postings:
+            matches[token] = 1.0
+
+        if len(token) >= 2:
+            if self._sorted_terms is None:
+                self._sorted_terms = sorted(self._postings)
+            terms = self._sorted_terms
+            i = bisect_left(terms, token)
+            while i < len(terms) and terms[i].startswith(token):
+                matches.setdefault(terms[i], PREFIX_MATCH_WEIGHT)
+                i += 1
+
+        if not matches and len(token) >= 3:
+            candidates: Set[str] = set()
+            for gram in trigrams(token):
+                candidates |= self._trigram_terms.get(gram, set())
+            for term in candidates:
+                similarity = trigram_similarity(token, term)
+                if similarity >= FUZZY_MIN_SIMILARITY:
+                    matches[term] = FUZZY_MATCH_WEIGHT * similarity
+
+        return list(matches.items())
@@ -1,4 +1,7 @@
+import hashlib
+import hmac
 import random
+import secrets
 import string
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
@@ -7,15 +10,17 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from ..core.config import settings # For JWT secret, algorithm, expiry
+from .hashing import password_hashing_pool
 
-# Password Hashing (bcrypt)
+# Password Hashing (bcrypt). Runs on the bounded hashing pool, which raises
+# HashingPoolSaturated (a 503) rather than queue without limit during a login burst.
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hashing_pool.run(pwd_context.verify, plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hashing_pool.run(pwd_context.hash, password)
 
 # OTP Generation and Hashing
 def generate_otp(length: int = 6) -> str:
@@ -24,16 +29,28 @@ def generate_otp(length: int = 6) -> str:
         raise ValueError("OTP length must be positive")
     return "".join(random.choices(string.digits, k=length))
 
+OTP_HASH_SCHEME = "hmac-sha256"
+
+def _otp_mac(salt: str, otp: str) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), f"otp:{salt}:{otp}".encode(), hashlib.sha256).hexdigest()
+
 def get_otp_hash(otp: str) -> str:
-    """Hashes an OTP using the same context as passwords for consistency."""
-    # While bcrypt is strong, it might be slower than needed for OTPs.
-    # For very high-traffic OTP systems, a faster hash like SHA256 might be considered,
-    # but storing OTP hashes is better than plain text if they live for any duration.
-    return pwd_context.hash(otp)
+    """
+    Hashes an OTP with a salted HMAC keyed by SECRET_KEY. A 6-digit code can't
+    be protected by a slow hash anyway (10^6 guesses); the server-side key is
+    what stops a leaked row being brute-forced, and this takes microseconds
+    instead of bcrypt's ~250ms.
+    """
+    salt = secrets.token_hex(8)
+    return f"{OTP_HASH_SCHEME}${salt}${_otp_mac(salt, otp)}"
 
 def verify_otp(plain_otp: str, hashed_otp: str) -> bool:
     """Verifies a plain OTP against a hashed OTP."""
-    return pwd_context.verify(plain_otp, hashed_otp)
+    scheme, _, rest = hashed_otp.partition("$")
+    if scheme != OTP_HASH_SCHEME:
+        return verify_password(plain_otp, hashed_otp) # bcrypt hash issued before the switch
+    salt, _, mac = rest.partition("$")
+    return hmac.compare_digest(_otp_mac(salt, plain_otp), mac)
 
 # JWT Token Handling
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -46,17 +63,16 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
 
     to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc)}) # Add issued_at timestamp
 
-    # Ensure SECRET_KEY and ALGORITHM are available from settings
-    if not settings.SECRET_KEY or not settings.ALGORITHM:
+    # Ensure SECRET_KEY and JWT_ALGORITHM are available from settings
+    if not settings.SECRET_KEY or not settings.JWT_ALGORITHM:
         raise ValueError("JWT Secret Key or Algorithm not configured in settings.")
 
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
-# Example decode function (will be part of dependencies.py usually)
-# def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
-#     try:
-#         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-#         return payload
-#     except JWTError:
-#         return None
+def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
+    """Returns the token payload, or None if the token is invalid or expired."""
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError:
+        return None
@@ -1,4 +1,23 @@
+import asyncio
+import logging
+from typing import Optional
+from urllib.parse import parse_qs
+
 import socketio
+from pydantic import ValidationError
+
+from .config import settings
+from .db import SessionLocal
+from .gps_ingest import LocationCoalescer, fix_time_utc
+from .metrics import metrics
+from .realtime import user_room
+from .security import decode_access_token
+from ..models.user import UserRole
+from ..schemas.gps import LocationUpdate
+from ..services import field_service, user_service
+from ..services.track_service import track_store
+
+logger = logging.getLogger(__name__)
 
 # Create a Socket.IO server instance
 # async_mode="asgi" is for FastAPI/Uvicorn integration.
@@ -11,40 +30,131 @@ sio = socketio.AsyncServer(
 )
 
 # Create an ASGI application that wraps the Socket.IO server
+# Mounted by main.py at /socket.io (the client default), hence the empty path here
 socket_app = socketio.ASGIApp(
     sio,
-    # socketio_path='socket.io' # Default path, can be customized if needed e.g. /ws/socket.io
+    socketio_path="",
 )
 
+
+def _socket_metrics():
+    """Connection and room counts per namespace; rooms grouped by kind (`field_3` -> field)."""
+    connections, rooms, members = [], {}, {}
+    for namespace, namespace_rooms in list(sio.manager.rooms.items()):
+        connected = namespace_rooms.get(None, {})
+        connections.append(({"namespace": namespace}, len(connected)))
+        for room, room_members in list(namespace_rooms.items()):
+            if room is None or room in connected: # Every sid also has a room of its own
+                continue
+            key = (namespace, str(room).split("_", 1)[0])
+            rooms[key] = rooms.get(key, 0) + 1
+            members[key] = members.get(key, 0) + len(room_members)
+    yield ("socketio_connections", "gauge", "Connected Socket.IO clients.", connections)
+    yield ("socketio_rooms", "gauge", "Occupied Socket.IO rooms by kind.",
+           [({"namespace": ns, "kind": kind}, count) for (ns, kind), count in rooms.items()])
+    yield ("socketio_room_members", "gauge", "Room memberships by room kind.",
+           [({"namespace": ns, "kind": kind}, count) for (ns, kind), count in members.items()])
+
+metrics.register_collector(_socket_metrics)
+
 # --- Basic Socket.IO Event Handlers ---
 
+def _extract_token(environ: dict, auth: Optional[dict]) -> Optional[str]:
+    """Bearer token from the Socket.IO auth payload, the Authorization header, or `?token=`."""
+    if auth and auth.get("token"):
+        return auth["token"]
+    header = environ.get("HTTP_AUTHORIZATION", "")
+    if header.lower().startswith("bearer "):
+        return header[7:]
+    return parse_qs(environ.get("QUERY_STRING", "")).get("token", [None])[0]
+
+
+def _authenticate(token: str) -> Optional[int]:
+    """Resolve a token to an active user's id. Blocking (DB lookup), run off the event loop."""
+    payload = decode_access_token(token)
+    if not payload or not payload.get("sub"):
+        return None
+    db = SessionLocal()
+    try:
+        user = user_service.get_user_by_email(db, email=payload["sub"])
+        if user is None or not user.is_active:
+            return None
+        return user.id
+    finally:
+        db.close()
+
+
+def _can_access_field(user_id: int, field_id: int) -> bool:
+    """
+    Whether the user owns `field_id` or is an admin, as the HTTP field routes
+    require. Blocking (DB lookup), run off the event loop.
+    """
+    db = SessionLocal()
+    try:
+        field = field_service.get_field_by_id(db, field_id=field_id)
+        if field is None:
+            return False
+        if field.owner_id == user_id:
+            return True
+        user = user_service.get_user_by_id(db, user_id=user_id)
+        return user is not None and user.role == UserRole.ADMIN
+    finally:
+        db.close()
+
+
+async def _authorize_field(sid, field_id: int) -> bool:
+    """
+    Check the connection's user may read and write `field_id`'s GPS. Granted
+    fields are remembered in the socket session, so a stream of location
+    updates costs one lookup per field rather than one per fix.
+    """
+    session = await sio.get_session(sid)
+    granted = session.get("fields", set())
+    if field_id in granted:
+        return True
+    if not await asyncio.to_thread(_can_access_field, session["user_id"], field_id):
+        logger.warning(f"Socket.IO client {sid} (user_id={session['user_id']}) denied access to field {field_id}")
+        return False
+    await sio.save_session(sid, {**session, "fields": granted | {field_id}})
+    return True
+
+
+def _field_id(data) -> Optional[int]:
+    try:
+        field_id = int(data.get("field_id"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+    return field_id if field_id > 0 else None
+
+
 @sio.event
-async def connect(sid, environ):
+async def connect(sid, environ, auth=None):
     """
     Handles new client connections.
-    `environ` contains the WSGI/ASGI environment, including headers for potential auth.
+    Clients authenticate with the same JWT as the HTTP API, passed as
+    `io(url, {auth: {token}})`, and join their `user_{id}` room for pushes.
     """
-    print(f"Socket.IO client connected: SID={sid}")
-    # TODO: Authentication logic
-    # Example: token = environ.get('HTTP_AUTHORIZATION', '').split('Bearer ')[-1]
-    # user = await authenticate_ws_user(token) # Your async function
-    # if not user:
-    #     raise socketio.exceptions.ConnectionRefusedError('Authentication failed')
-    # await sio.save_session(sid, {'user_id': user.id, 'username': user.email})
-    # print(f"User {user.email} authenticated for SID {sid}")
+    token = _extract_token(environ, auth)
+    user_id = await asyncio.to_thread(_authenticate, token) if token else None
+    if user_id is None:
+        raise socketio.exceptions.ConnectionRefusedError("Authentication failed")
+
+    await sio.save_session(sid, {"user_id": user_id})
+    await sio.enter_room(sid, user_room(user_id))
+    logger.info(f"Socket.IO client connected: SID={sid}, user_id={user_id}")
     await sio.emit('connection_ack', {'message': 'Successfully connected!', 'sid': sid}, room=sid)
 
 
 @sio.event
 async def disconnect(sid):
     """Handles client disconnections."""
-    print(f"Socket.IO client disconnected: SID={sid}")
+    logger.info(f"Socket.IO client disconnected: SID={sid}")
     # session = await sio.get_session(sid)
     # if session and 'field_room' in session:
     #     room_name = session['field_room']
     #     # Notify others in the room
     #     await sio.emit("user_left_field", {"sid": sid, "user_id": session.get('user_id')}, room=room_name, skip_sid=sid)
-    #     print(f"User {session.get('user_id')} (SID: {sid}) left room {room_name}")
+    #     logger.info(f"User {session.get('user_id')} (SID: {sid}) left room {room_name}")
     # Clean up session if needed
     # await sio.save_session(sid, {})
 
@@ -53,16 +163,19 @@ async def disconnect(sid):
 
 @sio.on("join_field_room")
 async def handle_join_field_room(sid, data: dict):
-    """Allows a client to join a room for a specific field_id to receive GPS updates."""
-    field_id = data.get("field_id")
+    """Allows a client to join a room for a specific field_id to receive GPS updates. Owner or admin only."""
+    field_id = _field_id(data)
     if not field_id:
         await sio.emit("room_join_error", {"message": "field_id is required"}, room=sid)
         return
+    if not await _authorize_field(sid, field_id):
+        await sio.emit("room_join_error", {"message": "Not authorized to access this field"}, room=sid)
+        return
 
     room_name = f"field_{field_id}"
-    sio.enter_room(sid, room_name)
+    await sio.enter_room(sid, room_name)
     # await sio.save_session(sid, {**await sio.get_session(sid), 'field_room': room_name}) # Store current room
-    print(f"Client {sid} joined room: {room_name}")
+    logger.info(f"Client {sid} joined room: {room_name}")
     await sio.emit("room_joined_ack", {"room": room_name}, room=sid)
     # Notify others in the room (optional)
     # await sio.emit("user_joined_field", {"sid": sid, "field_id": field_id}, room=room_name, skip_sid=sid)
@@ -71,18 +184,18 @@ async def handle_join_field_room(sid, data: dict):
 @sio.on("leave_field_room")
 async def handle_leave_field_room(sid, data: dict):
     """Allows a client to leave a field-specific room."""
-    field_id = data.get("field_id")
+    field_id = _field_id(data)
     if not field_id:
         await sio.emit("room_leave_error", {"message": "field_id is required"}, room=sid)
         return
 
     room_name = f"field_{field_id}"
-    sio.leave_room(sid, room_name)
+    await sio.leave_room(sid, room_name)
     # session = await sio.get_session(sid)
     # if session and session.get('field_room') == room_name:
     #     del session['field_room'] # Remove from session
     #     await sio.save_session(sid, session)
-    print(f"Client {sid} left room: {room_name}")
+    logger.info(f"Client {sid} left room: {room_name}")
     await sio.emit("room_left_ack", {"room": room_name}, room=sid)
     # Notify others (optional)
     # await sio.emit("user_left_field", {"sid": sid, "field_id": field_id}, room=room_name, skip_sid=sid)
@@ -90,26 +203,35 @@ async def handle_leave_field_room(sid, data: dict):
 
 # --- GPS Location Updates ---
 
+location_coalescer = LocationCoalescer(
+    emit=lambda room, frame: sio.emit("location_broadcast", frame, room=room),
+    flush_interval_ms=settings.GPS_FLUSH_INTERVAL_MS,
+    max_devices_per_room=settings.GPS_MAX_DEVICES_PER_ROOM,
+)
+
+
 @sio.on("update_location")
 async def handle_update_location(sid, data: dict):
     """
     Handles incoming GPS location updates from a client.
-    Data should ideally include: {'field_id': ..., 'latitude': ..., 'longitude': ..., 'timestamp': ...}
+    Data: {'field_id': ..., 'latitude': ..., 'longitude': ..., 'device_id'?: ..., 'timestamp'?: ...}
+    Only the field's owner (or an admin) may send updates for it.
+    Points are validated, recorded to the track store and coalesced; the field room receives batched
+    `location_broadcast` frames {'field_id': ..., 'points': [...]} holding the
+    latest point per device. Frames include the sender's own device.
     """
-    print(f"Received location update from SID {sid}: {data}")
-
-    field_id = data.get("field_id")
-    # TODO: Validate data structure (lat, lon, field_id)
-    # TODO: Authenticate: Check if user associated with 'sid' is allowed to update this 'field_id'.
-    #       This requires retrieving user from session: session = await sio.get_session(sid)
-    #       Then, check user's permissions for the field_id.
-
-    if field_id:
-        room_name = f"field_{field_id}"
-        # Broadcast the location data to all clients in the specific field's room, except the sender.
-        await sio.emit("location_broadcast", data, room=room_name, skip_sid=sid)
-        print(f"Location data from SID {sid} broadcasted to room {room_name}")
-    else:
-        # Send error back to sender if field_id is missing
-        await sio.emit("location_update_error", {"message": "field_id is required in location data"}, room=sid)
-        print(f"Location update from SID {sid} rejected: missing field_id.")
+    try:
+        update = LocationUpdate.model_validate(data)
+    except ValidationError as e:
+        await sio.emit("location_update_error", {"message": "Invalid location data", "errors": e.errors(include_url=False, include_context=False)}, room=sid)
+        return
+    if not await _authorize_field(sid, update.field_id):
+        await sio.emit("location_update_error", {"message": "Not authorized to update this field"}, room=sid)
+        return
+
+    fix_time = fix_time_utc(update.timestamp)
+    device_id = update.device_id or sid
+    point = update.model_dump(mode="json", exclude_none=True, exclude={"field_id"})
+    point.update(device_id=device_id, timestamp=fix_time.isoformat())
+    track_store.append(update.field_id, device_id, fix_time, update.latitude, update.longitude) # Recorded for replay
+    location_coalescer.submit(f"field_{update.field_id}", update.field_id, device_id, point, fix_time)
@@ -0,0 +1,179 @@
+"""
+Bounding-box spatial index and exact predicates for lon/lat GeoJSON polygons.
+
+`STRTree` is a static R-tree bulk-loaded with the Sort-Tile-Recursive algorithm:
+boxes are sorted into vertical slices by x, then by y within each slice, and
+packed `NODE_CAPACITY` to a node, level by level. Each level is a set of NumPy
+arrays, so a query tests one level's candidate nodes in a single vectorized step
+and touches only a handful of nodes per level; with tens of thousands of boxes
+that is a few levels and well under a millisecond. The tree is immutable; to
+reflect changes, build a new one.
+
+Boxes and polygons are taken in raw lon/lat, so a polygon crossing the
+antimeridian is treated as going the long way round the globe. Query boxes
+may cross it (see `parse_bbox`).
+"""
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from .geo_area import polygon_rings
+
+BBox = Tuple[float, float, float, float]  # min_lon, min_lat, max_lon, max_lat
+
+NODE_CAPACITY = 16
+
+
+def parse_bbox(value: str) -> List[BBox]:
+    """
+    Parse "min_lon,min_lat,max_lon,max_lat". A box with min_lon > max_lon crosses the
+    antimeridian and is returned as its two halves. Raises ValueError if malformed.
+    """
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(part) for part in value.split(","))
+    except ValueError:
+        raise ValueError("bbox must be four comma-separated numbers: min_lon,min_lat,max_lon,max_lat")
+    if not all(-180 <= lon <= 180 for lon in (min_lon, max_lon)) or not all(-90 <= lat <= 90 for lat in (min_lat, max_lat)):
+        raise ValueError("bbox longitudes must be within [-180, 180] and latitudes within [-90, 90]")
+    if min_lat > max_lat:
+        raise ValueError("bbox min_lat must not exceed max_lat")
+    if min_lon > max_lon:
+        return [(min_lon, min_lat, 180.0, max_lat), (-180.0, min_lat, max_lon, max_lat)]
+    return [(min_lon, min_lat, max_lon, max_lat)]
+
+
+def geometry_bounds(geometry: Any) -> Optional[BBox]:
+    """Bounding box of a GeoJSON Polygon/MultiPolygon, or None if it isn't one."""
+    polygons = polygon_rings(geometry)
+    if polygons is None:
+        return None
+    coords = np.concatenate([ring for polygon in polygons for ring in polygon])
+    min_lon, min_lat = coords.min(axis=0)
+    max_lon, max_lat = coords.max(axis=0)
+    return float(min_lon), float(min_lat), float(max_lon), float(max_lat)
+
+
+def _edges(rings: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    # (start, end) points of every ring edge, closing rings that don't repeat their first vertex
+    starts = np.concatenate(rings)
+    ends = np.concatenate([np.roll(ring, -1, axis=0) for ring in rings])
+    return starts, ends
+
+
+def _contains_point(rings: List[np.ndarray], lon: float, lat: float) -> bool:
+    # Even-odd crossing count over all rings, so points in holes are outside
+    (x0, y0), (x1, y1) = (a.T for a in _edges(rings))
+    straddles = (y0 > lat) != (y1 > lat)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = x0 + (lat - y0) * (x1 - x0) / (y1 - y0)
+    return bool(np.count_nonzero(straddles & (lon < x_cross)) % 2)
+
+
+def point_in_geometry(geometry: Any, lon: float, lat: float) -> bool:
+    """Whether (lon, lat) lies inside a GeoJSON Polygon/MultiPolygon (holes excluded)."""
+    polygons = polygon_rings(geometry)
+    return bool(polygons) and any(_contains_point(rings, lon, lat) for rings in polygons)
+
+
+def _segments_hit_box(starts: np.ndarray, ends: np.ndarray, bbox: BBox) -> bool:
+    # Liang-Barsky clipping of every segment against the box at once
+    min_x, min_y, max_x, max_y = bbox
+    d = ends - starts
+    p = np.stack([-d[:, 0], d[:, 0], -d[:, 1], d[:, 1]], axis=1)
+    q = np.stack([starts[:, 0] - min_x, max_x - starts[:, 0], starts[:, 1] - min_y, max_y - starts[:, 1]], axis=1)
+    parallel_outside = ((p == 0) & (q < 0)).any(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = q / p
+    t_enter = np.where(p < 0, r, 0.0).max(axis=1)
+    t_exit = np.where(p > 0, r, 1.0).min(axis=1)
+    return bool(np.any(~parallel_outside & (t_enter <= t_exit)))
+
+
+def geometry_intersects_bbox(geometry: Any, bbox: BBox) -> bool:
+    """Whether a GeoJSON Polygon/MultiPolygon and a lon/lat box share any point."""
+    polygons = polygon_rings(geometry)
+    if not polygons:
+        return False
+    for rings in polygons:
+        # An edge entering the box, or the box lying wholly inside the polygon
+        if _segments_hit_box(*_edges(rings), bbox) or _contains_point(rings, bbox[0], bbox[1]):
+            return True
+    return False
+
+
+class STRTree:
+    """Immutable R-tree over an (n, 4) array of boxes; queries return indices into that array."""
+
+    def __init__(self, boxes: np.ndarray, node_capacity: int = NODE_CAPACITY):
+        boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+        self.size = len(boxes)
+        self.node_capacity = node_capacity
+        order = self._str_order(boxes)
+        self._item_ids = order
+        self._item_boxes = boxes[order]
+        # Levels from the leaves up; node i of a level covers entries [start[i], end[i]) of the level below
+        self._levels: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        level_boxes = self._item_boxes
+        while True:
+            starts = np.arange(0, len(level_boxes), node_capacity)
+            ends = np.minimum(starts + node_capacity, len(level_boxes))
+            node_boxes = self._union(level_boxes, starts)
+            order = self._str_order(node_boxes)
+            self._levels.append((node_boxes[order], starts[order], ends[order]))
+            level_boxes = node_boxes[order]
+            if len(level_boxes) <= 1:
+                break
+
+    def _str_order(self, boxes: np.ndarray) -> np.ndarray:
+        n = len(boxes)
+        if n <= self.node_capacity:
+            return np.arange(n)
+        cx = (boxes[:, 0] + boxes[:, 2]) / 2
+        cy = (boxes[:, 1] + boxes[:, 3]) / 2
+        leaf_count = -(-n // self.node_capacity)
+        slice_size = self.node_capacity * int(np.ceil(np.sqrt(leaf_count)))
+        by_x = np.argsort(cx, kind="stable")
+        slice_of = np.empty(n, dtype=np.int64)
+        slice_of[by_x] = np.arange(n) // slice_size
+        # Sort by slice, then by y within the slice
+        return np.lexsort((cy, slice_of))
+
+    @staticmethod
+    def _union(boxes: np.ndarray, starts: np.ndarray) -> np.ndarray:
+        if len(boxes) == 0:
+            return np.empty((0, 4))
+        return np.column_stack([
+            np.minimum.reduceat(boxes[:, 0], starts),
+            np.minimum.reduceat(boxes[:, 1], starts),
+            np.maximum.reduceat(boxes[:, 2], starts),
+            np.maximum.reduceat(boxes[:, 3], starts),
+        ])
+
+    @staticmethod
+    def _overlapping(boxes: np.ndarray, bbox: BBox) -> np.ndarray:
+        min_x, min_y, max_x, max_y = bbox
+        return (boxes[:, 0] <= max_x) & (boxes[:, 2] >= min_x) & (boxes[:, 1] <= max_y) & (boxes[:, 3] >= min_y)
+
+    @staticmethod
+    def _expand(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        # Concatenation of arange(start, end) for each range, without a Python loop
+        lengths = ends - starts
+        offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+        return offsets + np.arange(lengths.sum())
+
+    def query(self, bbox: BBox) -> np.ndarray:
+        """Indices of the boxes overlapping `bbox` (edges touching count), in no particular order."""
+        if self.size == 0:
+            return np.empty(0, dtype=np.int64)
+        candidates = np.arange(len(self._levels[-1][0]))
+        for node_boxes, starts, ends in reversed(self._levels):
+            hits = candidates[self._overlapping(node_boxes[candidates], bbox)]
+            if not len(hits):
+                return np.empty(0, dtype=np.int64)
+            candidates = self._expand(starts[hits], ends[hits])
+        hits = candidates[self._overlapping(self._item_boxes[candidates], bbox)]
+        return self._item_ids[hits]
+
+    def query_point(self, lon: float, lat: float) -> np.ndarray:
+        """Indices of the boxes containing the point."""
+        return self.query((lon, lat, lon, lat))
@@ -0,0 +1,209 @@
+"""
+Compact GPS track storage.
+
+Fixes arriving over `update_location` are appended to an open segment per
+(field, device): three `array('q')` columns holding epoch milliseconds and
+latitude/longitude in 1e-7 degree units. Segments are sealed when full and
+periodically flushed to the `gps_track_segments` table by a background task.
+On disk each column is delta-encoded, since consecutive fixes differ by small
+amounts, and the deltas are zlib-compressed. This takes a few bytes per point
+instead of a row per point.
+"""
+import asyncio
+import logging
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from datetime import datetime, timezone
+from itertools import accumulate
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+TRACK_CODEC_VERSION = 1
+COORD_SCALE = 10_000_000  # 1e-7 degrees, ~1 cm
+_HEADER = struct.Struct("<BI")  # version, point count
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+DEFAULT_FLUSH_INTERVAL_S = 10
+DEFAULT_SEGMENT_MAX_POINTS = 1000
+MAX_UNSAVED_SEGMENTS = 10_000  # Kept for retry while the database is unreachable; oldest dropped beyond
+
+
+def to_epoch_ms(value: datetime) -> int:
+    """Epoch milliseconds for a datetime; naive values are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+def from_epoch_ms(value: int) -> datetime:
+    """Naive UTC datetime, matching how the models store timestamps."""
+    return datetime.fromtimestamp(value / 1000, tz=timezone.utc).replace(tzinfo=None)
+
+
+def encode_track(times_ms: Sequence[int], lats: Sequence[int], lons: Sequence[int]) -> bytes:
+    """Delta-encode and compress equal-length int columns."""
+    payload = bytearray(_HEADER.pack(TRACK_CODEC_VERSION, len(times_ms)))
+    for column in (times_ms, lats, lons):
+        deltas = array("q", column)
+        for i in range(len(deltas) - 1, 0, -1):
+            deltas[i] -= deltas[i - 1]
+        if not _LITTLE_ENDIAN:
+            deltas.byteswap()
+        payload += deltas.tobytes()
+    return zlib.compress(bytes(payload), 6)
+
+
+def decode_track(data: bytes) -> Tuple[array, array, array]:
+    """Inverse of `encode_track`: (times_ms, lats, lons) as `array('q')` columns."""
+    raw = zlib.decompress(data)
+    version, count = _HEADER.unpack_from(raw)
+    if version != TRACK_CODEC_VERSION:
+        raise ValueError(f"Unsupported track codec version {version}")
+    columns = []
+    offset, width = _HEADER.size, count * 8
+    for _ in range(3):
+        deltas = array("q")
+        deltas.frombytes(raw[offset:offset + width])
+        if not _LITTLE_ENDIAN:
+            deltas.byteswap()
+        columns.append(array("q", accumulate(deltas)))
+        offset += width
+    return columns[0], columns[1], columns[2]
+
+
+class TrackSegmentData(NamedTuple):
+    field_id: int
+    device_id: str
+    start_time: datetime
+    end_time: datetime
+    point_count: int
+    data: bytes
+
+
+class _OpenSegment:
+    __slots__ = ("times", "lats", "lons")
+
+    def __init__(self):
+        self.times = array("q")
+        self.lats = array("q")
+        self.lons = array("q")
+
+    def seal(self, field_id: int, device_id: str) -> TrackSegmentData:
+        return TrackSegmentData(
+            field_id=field_id,
+            device_id=device_id,
+            start_time=from_epoch_ms(self.times[0]),
+            end_time=from_epoch_ms(self.times[-1]),
+            point_count=len(self.times),
+            data=encode_track(self.times, self.lats, self.lons),
+        )
+
+
+class TrackStore:
+    """
+    In-process buffer of GPS fixes, flushed as compressed segments by `save`.
+    `append` runs on the event loop, `flush` on a worker thread; a lock guards the swap.
+    """
+
+    def __init__(
+        self,
+        save: Callable[[List[TrackSegmentData]], None],
+        flush_interval_s: float = DEFAULT_FLUSH_INTERVAL_S,
+        segment_max_points: int = DEFAULT_SEGMENT_MAX_POINTS,
+    ):
+        self._save = save
+        self.flush_interval = flush_interval_s
+        self.segment_max_points = segment_max_points
+        self._lock = threading.Lock()
+        self._open: Dict[Tuple[int, str], _OpenSegment] = {}
+        self._sealed: List[TrackSegmentData] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def append(self, field_id: int, device_id: str, fix_time: datetime, latitude: float, longitude: float) -> bool:
+        """Record a fix. Returns False for a fix older than the device's previous one."""
+        t = to_epoch_ms(fix_time)
+        key = (field_id, device_id)
+        with self._lock:
+            segment = self._open.get(key)
+            if segment is None:
+                segment = self._open[key] = _OpenSegment()
+            elif t < segment.times[-1]:
+                return False # Keep segments time-ordered; late fixes are already superseded
+            segment.times.append(t)
+            segment.lats.append(round(latitude * COORD_SCALE))
+            segment.lons.append(round(longitude * COORD_SCALE))
+            if len(segment.times) >= self.segment_max_points:
+                self._sealed.append(segment.seal(field_id, device_id))
+                del self._open[key]
+        self._ensure_flush_loop()
+        return True
+
+    def drain(self) -> List[TrackSegmentData]:
+        """Seal every open segment and hand over everything not yet saved."""
+        with self._lock:
+            open_segments, self._open = self._open, {}
+            sealed, self._sealed = self._sealed, []
+        # Encoding happens outside the lock so appends are not held up
+        return sealed + [segment.seal(field_id, device_id) for (field_id, device_id), segment in open_segments.items()]
+
+    def flush(self) -> int:
+        """Save all buffered fixes; blocking. Returns the number of segments saved."""
+        segments = self.drain()
+        if not segments:
+            return 0
+        try:
+            self._save(segments)
+        except Exception as e:
+            logger.error(f"Saving {len(segments)} GPS track segments failed, will retry: {e}")
+            with self._lock:
+                self._sealed = (segments + self._sealed)[-MAX_UNSAVED_SEGMENTS:]
+            return 0
+        return len(segments)
+
+    def pending_points(
+        self, field_id: int, start_ms: int, end_ms: int, device_id: Optional[str] = None
+    ) -> Iterator[Tuple[str, int, int, int]]:
+        """Buffered (device_id, time_ms, lat, lon) fixes for a field within a window, not yet saved."""
+        with self._lock:
+            snapshot = [
+                (key[1], array("q", seg.times), array("q", seg.lats), array("q", seg.lons))
+                for key, seg in self._open.items()
+                if key[0] == field_id and (device_id is None or key[1] == device_id)
+            ]
+            sealed = [
+                segment for segment in self._sealed
+                if segment.field_id == field_id and (device_id is None or segment.device_id == device_id)
+            ]
+        snapshot += [(segment.device_id, *decode_track(segment.data)) for segment in sealed]
+        for device, times, lats, lons in snapshot:
+            for t, lat, lon in zip(times, lats, lons):
+                if start_ms <= t <= end_ms:
+                    yield device, t, lat, lon
+
+    async def aclose(self) -> None:
+        """Stop the flush loop and save whatever is buffered."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await asyncio.to_thread(self.flush)
+
+    def _ensure_flush_loop(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return # Not on an event loop (scripts/tests); callers flush explicitly
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await asyncio.to_thread(self.flush) # Sync DB write off the event loop
@@ -1,9 +1,13 @@
 from typing import List, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
+from app.core.pagination import Page, paginate
 from app.models.equipment import Equipment, Booking, MaintenanceRecord
 from app.schemas.equipment import EquipmentCreate, EquipmentFilter, BookingCreate, MaintenanceRecordCreate
 
+# Listing order for paging: newest first, id breaks ties between equal timestamps
+EQUIPMENT_SORT_KEY = ((Equipment.created_at, True), (Equipment.id, True))
+
 def create_equipment(db: Session, equipment: EquipmentCreate, owner_id: int) -> Equipment:
     db_equipment = Equipment(
         **equipment.dict(),
@@ -24,8 +28,9 @@ def get_equipment_list(
     db: Session,
     filter_params: EquipmentFilter,
     skip: int = 0,
-    limit: int = 10
-) -> List[Equipment]:
+    limit: int = 10,
+    cursor: Optional[str] = None
+) -> Page:
     query = db.query(Equipment)
 
     if filter_params.type:
@@ -46,7 +51,7 @@ def get_equipment_list(
             (Booking.end_date >= filter_params.available_from)
         ))
 
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, EQUIPMENT_SORT_KEY, skip=skip, limit=limit, cursor=cursor)
 
 def update_equipment(db: Session, equipment_id: int, equipment_data: EquipmentCreate) -> Equipment:
     db_equipment = get_equipment(db, equipment_id)
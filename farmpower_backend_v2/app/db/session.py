@@ -1,33 +1,6 @@
-import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
-
-from app.core.config import settings
-
-# Get database URL from settings
-database_url = settings.DATABASE_URL
-
-# Create engine with appropriate configuration
-if os.getenv("TESTING") == "True":
-    # Use SQLite for testing
-    engine = create_engine(
-        "sqlite:///./test.db",
-        connect_args={"check_same_thread": False}
-    )
-else:
-    # PostgreSQL configuration for production
-    engine = create_engine(
-        database_url,
-        poolclass=QueuePool,
-        pool_size=10,
-        max_overflow=20,
-        pool_timeout=30,
-        pool_pre_ping=True
-    )
-
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# One lazily created engine and pool for the whole app (see app.core.db);
+# nothing connects at import
+from app.core.db import SessionLocal
 
 # Dependency
 def get_db():
@@ -35,4 +8,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -12,6 +12,8 @@ from . import notification
 from . import part
 from . import service_booking
 from . import crop_calculator
+from . import gps_track
+from . import resource_version
 
 __all__ = [
     "User",
@@ -23,5 +25,8 @@ __all__ = [
     "Part",
     "Notification",
     "Message",
+    "ConversationSummary",
     "CropCalculation",
+    "GpsTrackSegment",
+    "ResourceVersion",
 ]
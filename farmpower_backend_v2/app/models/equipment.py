@@ -41,7 +41,7 @@ class Equipment(Base):
     maintenance_records = relationship("MaintenanceRecord", back_populates="equipment")
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False) # Keyset paging sort key
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class MaintenanceRecord(Base):
@@ -1,10 +1,14 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, JSON, Index
 from sqlalchemy.orm import relationship
 from ..core.db import Base
 
 class Field(Base):
     __tablename__ = "fields"
+    __table_args__ = (
+        # Keyset pagination: matches the listing sort order
+        Index("ix_fields_owner_id_name_id", "owner_id", "name", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False)
@@ -14,6 +18,13 @@ class Field(Base):
     coordinates = Column(JSON, nullable=False)
 
     area_hectares = Column(Float, nullable=True)
+
+    # Bounding box of `coordinates`, kept in sync by FieldService; NULL when the
+    # geometry isn't a (Multi)Polygon. Loaded into the in-process spatial index.
+    min_lon = Column(Float, nullable=True)
+    min_lat = Column(Float, nullable=True)
+    max_lon = Column(Float, nullable=True)
+    max_lat = Column(Float, nullable=True)
     crop_info = Column(String, nullable=True) # Current crop or general notes
     soil_type = Column(String, nullable=True) # Placeholder, to be populated later
 
@@ -30,5 +41,8 @@ class Field(Base):
     # For now, assuming a Field can have multiple crop entries/history linked to it.
     crop_entries = relationship("Crop", back_populates="field", cascade="all, delete-orphan") # Crop model will have a field_id FK
 
+    # Recorded GPS tracks; replayed via /fields/{id}/tracks
+    gps_track_segments = relationship("GpsTrackSegment", back_populates="field", cascade="all, delete-orphan", passive_deletes=True)
+
     def __repr__(self):
         return f"<Field(id={self.id}, name='{self.name}', owner_id={self.owner_id})>"
@@ -0,0 +1,32 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, LargeBinary, Index
+from sqlalchemy.orm import relationship
+from ..core.db import Base
+
+class GpsTrackSegment(Base):
+    """
+    A run of GPS fixes from one device on one field, stored compressed.
+    `data` holds delta-encoded time/lat/lon columns (see core/track_store.py).
+    """
+    __tablename__ = "gps_track_segments"
+    __table_args__ = (
+        # Replay: a field's segments overlapping a time window, in time order
+        Index("ix_gps_track_segments_field_id_start_time", "field_id", "start_time"),
+        Index("ix_gps_track_segments_field_id_device_id_start_time", "field_id", "device_id", "start_time"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    field_id = Column(Integer, ForeignKey("fields.id", ondelete="CASCADE"), nullable=False)
+    device_id = Column(String(64), nullable=False)
+
+    start_time = Column(DateTime, nullable=False) # First fix in the segment (UTC)
+    end_time = Column(DateTime, nullable=False) # Last fix in the segment (UTC)
+    point_count = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    field = relationship("Field", back_populates="gps_track_segments")
+
+    def __repr__(self):
+        return f"<GpsTrackSegment(id={self.id}, field_id={self.field_id}, device='{self.device_id}', points={self.point_count})>"
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Text, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from ..core.db import Base
 
@@ -12,6 +12,10 @@ def generate_conversation_id(user1_id: int, user2_id: int) -> str:
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Keyset pagination: matches the listing sort order
+        Index("ix_messages_conversation_id_created_at_id", "conversation_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -24,7 +28,7 @@ class Message(Base):
 
     content = Column(Text, nullable=False)
 
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True, nullable=False) # Keyset paging sort key
     is_read_by_recipient = Column(Boolean, default=False, nullable=False, index=True)
 
     # Relationships
@@ -33,3 +37,34 @@ class Message(Base):
 
     def __repr__(self):
         return f"<Message(id={self.id}, from={self.sender_id}, to={self.recipient_id}, convo='{self.conversation_id}')>"
+
+
+class ConversationSummary(Base):
+    """
+    Materialized inbox entry: one row per participant per conversation.
+    Maintained by MessageService alongside message writes so the inbox is a
+    single indexed read instead of a group-by plus a COUNT per conversation.
+    """
+    __tablename__ = "conversation_summaries"
+    __table_args__ = (
+        UniqueConstraint("conversation_id", "user_id", name="uq_conversation_summaries_conversation_user"),
+        # Inbox listing: a user's conversations, most recent first
+        Index("ix_conversation_summaries_user_id_last_message_at", "user_id", "last_message_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    conversation_id = Column(String, nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False) # Whose inbox this row belongs to
+    other_user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+    last_message_id = Column(Integer, ForeignKey("messages.id", ondelete="SET NULL"), nullable=True)
+    last_message_content = Column(Text, nullable=True)
+    last_message_at = Column(DateTime, nullable=True)
+    unread_count = Column(Integer, default=0, nullable=False) # Messages to user_id not yet read
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    other_user = relationship("User", foreign_keys=[other_user_id])
+
+    def __repr__(self):
+        return f"<ConversationSummary(convo='{self.conversation_id}', user={self.user_id}, unread={self.unread_count})>"
@@ -1,6 +1,6 @@
 import enum
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum as SQLAlchemyEnum, Boolean, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum as SQLAlchemyEnum, Boolean, Text, Index
 from sqlalchemy.orm import relationship
 from ..core.db import Base
 
@@ -18,6 +18,10 @@ class NotificationType(enum.Enum):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Keyset pagination: matches the listing sort order
+        Index("ix_notifications_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)  # Recipient of the notification
@@ -32,7 +36,7 @@ class Notification(Base):
     related_entity_type = Column(String(50), nullable=True, index=True)  # e.g., "tractor", "service_booking", "message_thread", "part"
     related_entity_id = Column(Integer, nullable=True, index=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True, nullable=False) # Keyset paging sort key
     # No updated_at for notifications, they are typically immutable once created, only status changes.
 
     recipient = relationship("User", back_populates="notifications")
@@ -1,10 +1,14 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, JSON, Text
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, JSON, Text, Index
 from sqlalchemy.orm import relationship
 from ..core.db import Base
 
 class Part(Base):
     __tablename__ = "parts"
+    __table_args__ = (
+        # Keyset pagination: matches the listing sort order
+        Index("ix_parts_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), index=True, nullable=False)
@@ -26,7 +30,7 @@ class Part(Base):
 
     seller_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True, nullable=False) # Keyset paging sort key
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     seller = relationship("User", back_populates="parts_listed")
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, BigInteger, event
+from ..core.db import Base
+
+# Rows exist from the start (seeded with the table here, and by the Alembic
+# migration), so writes only ever UPDATE one; inserting on a type's first write
+# would race between workers on the primary key
+VERSIONED_RESOURCES = ("tractors", "parts", "users")
+
+class ResourceVersion(Base):
+    """
+    A counter per resource type ("tractors", "parts", "users") that every write
+    to that type increments in its own transaction. HTTP ETags for listings are
+    built from it (see core/http_cache.py), so one primary-key read tells whether
+    a cached page is still current.
+    """
+    __tablename__ = "resource_versions"
+
+    resource = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ResourceVersion(resource='{self.resource}', version={self.version})>"
+
+
+@event.listens_for(ResourceVersion.__table__, "after_create")
+def _seed_resource_versions(target, connection, **kw):
+    connection.execute(target.insert(), [{"resource": resource, "version": 0} for resource in VERSIONED_RESOURCES])
@@ -1,6 +1,6 @@
 import enum
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum as SQLAlchemyEnum, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum as SQLAlchemyEnum, Text, Index
 from sqlalchemy.orm import relationship
 from ..core.db import Base
 
@@ -14,6 +14,11 @@ class ServiceStatus(enum.Enum):
 
 class ServiceBooking(Base):
     __tablename__ = "service_bookings"
+    __table_args__ = (
+        # Keyset pagination: matches the listing sort order
+        Index("ix_service_bookings_user_id_scheduled_date_id", "user_id", "scheduled_date", "id"),
+        Index("ix_service_bookings_provider_id_scheduled_date_id", "service_provider_id", "scheduled_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -1,10 +1,21 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, JSON # Added JSON
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, JSON, DDL, event, Index # Added JSON
 from sqlalchemy.orm import relationship
 from ..core.db import Base
 
+# Text document searched by TractorService.search_tractors on Postgres.
+# The query must use this exact expression for the planner to pick the GIN indexes below.
+TRACTOR_SEARCH_DOCUMENT_SQL = (
+    "coalesce(name, '') || ' ' || coalesce(brand, '') || ' ' || coalesce(model, '') || ' ' || "
+    "coalesce(location, '') || ' ' || coalesce(description, '')"
+)
+
 class Tractor(Base):
     __tablename__ = "tractors"
+    __table_args__ = (
+        # Keyset pagination: matches the listing sort order
+        Index("ix_tractors_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False)
@@ -20,7 +31,7 @@ class Tractor(Base):
     # Store as JSON array of strings. Default to an empty list.
     image_urls = Column(JSON, nullable=True, default=lambda: [])
 
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True, nullable=False) # Keyset paging sort key
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     owner_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
@@ -31,3 +42,18 @@ class Tractor(Base):
 
     def __repr__(self):
         return f"<Tractor(id={self.id}, name='{self.name}', owner_id={self.owner_id})>"
+
+
+# Postgres-only full-text and trigram indexes. SQLite falls back to the in-process
+# index in app/core/search.py. Existing databases get these via the Alembic migration.
+for _statement in (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_tractors_search_tsv ON tractors "
+    f"USING gin (to_tsvector('simple'::regconfig, {TRACTOR_SEARCH_DOCUMENT_SQL}))",
+    "CREATE INDEX IF NOT EXISTS ix_tractors_search_trgm ON tractors "
+    f"USING gin (({TRACTOR_SEARCH_DOCUMENT_SQL}) gin_trgm_ops)",
+    # Keep the substring brand/location filters (ILIKE '%...%') indexed as well
+    "CREATE INDEX IF NOT EXISTS ix_tractors_brand_trgm ON tractors USING gin (brand gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_tractors_location_trgm ON tractors USING gin (location gin_trgm_ops)",
+):
+    event.listen(Tractor.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
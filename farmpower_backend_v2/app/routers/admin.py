@@ -1,15 +1,16 @@
 from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from sqlalchemy.orm import Session
 
 from ..core.db import get_db
+from ..core.pagination import set_next_cursor_header
 from ..core.dependencies import get_current_active_user, RoleChecker # RoleChecker for admin-only routes
 from ..models.user import User as UserModel, UserRole
 from ..schemas.user import UserSchema # For returning user details
 from ..schemas.tractor import TractorSchema # For returning tractor listings
 from ..schemas.part import PartSchema # For returning part listings
-from ..services import user_service, tractor_service, part_service, admin_service # Import all relevant services
+from ..services import user_service, tractor_service, part_service, admin_service, user_identity_cache # Import all relevant services
 
 router = APIRouter(
     prefix="/admin",
@@ -24,7 +25,7 @@ router = APIRouter(
 # --- User Management by Admin ---
 
 @router.get("/users/", response_model=List[UserSchema])
-async def admin_list_all_users(
+def admin_list_all_users(
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500) # Admin might need larger limits
@@ -36,7 +37,7 @@ async def admin_list_all_users(
     return users
 
 @router.post("/users/{user_id}/ban", response_model=UserSchema)
-async def admin_ban_user_account(user_id: int, db: Session = Depends(get_db)):
+def admin_ban_user_account(user_id: int, db: Session = Depends(get_db)):
     """
     [ADMIN ONLY] Ban a user account. This sets `is_banned=True` and `is_active=False`.
     """
@@ -52,7 +53,7 @@ async def admin_ban_user_account(user_id: int, db: Session = Depends(get_db)):
     return banned_user
 
 @router.post("/users/{user_id}/unban", response_model=UserSchema)
-async def admin_unban_user_account(user_id: int, db: Session = Depends(get_db)):
+def admin_unban_user_account(user_id: int, db: Session = Depends(get_db)):
     """
     [ADMIN ONLY] Unban a user account. This sets `is_banned=False`.
     Does not automatically re-activate the account.
@@ -69,14 +70,16 @@ async def admin_unban_user_account(user_id: int, db: Session = Depends(get_db)):
 # --- Listings Management by Admin ---
 
 @router.get("/tractors/", response_model=List[TractorSchema])
-async def admin_list_all_tractors(
+def admin_list_all_tractors(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     # Add other filters from tractor_service.get_tractors if needed by admin
     brand: Optional[str] = Query(None),
     location: Optional[str] = Query(None),
-    owner_id: Optional[int] = Query(None, description="Filter by original owner ID")
+    owner_id: Optional[int] = Query(None, description="Filter by original owner ID"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page")
 ):
     """
     [ADMIN ONLY] Get a list of all tractor listings in the system.
@@ -84,30 +87,41 @@ async def admin_list_all_tractors(
     # The `owner_id` filter is passed directly. Other filters can be added.
     # The `tractor_service.get_tractors` can be used directly.
     # If it needs an 'admin_mode' flag, that would be a service layer change.
-    tractors = tractor_service.get_tractors(db, skip=skip, limit=limit, brand=brand, location=location, owner_id=owner_id)
+    tractors = tractor_service.get_tractors(db, skip=skip, limit=limit, brand=brand, location=location, owner_id=owner_id, cursor=cursor)
+    set_next_cursor_header(response, tractors)
     return tractors
 
 @router.get("/parts/", response_model=List[PartSchema])
-async def admin_list_all_parts(
+def admin_list_all_parts(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     # Add other filters from part_service.get_parts if needed
     category: Optional[str] = Query(None),
-    seller_id: Optional[int] = Query(None, description="Filter by original seller ID")
+    seller_id: Optional[int] = Query(None, description="Filter by original seller ID"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page")
 ):
     """
     [ADMIN ONLY] Get a list of all part listings in the system.
     """
-    parts = part_service.get_parts(db, skip=skip, limit=limit, category=category, seller_id=seller_id)
+    parts = part_service.get_parts(db, skip=skip, limit=limit, category=category, seller_id=seller_id, cursor=cursor)
+    set_next_cursor_header(response, parts)
     return parts
 
 # TODO: Admin endpoints for deleting/suspending specific tractor/part listings if different from user actions
 
 # --- Site Analytics ---
 @router.get("/statistics/", response_model=Dict[str, Any])
-async def admin_get_site_statistics(db: Session = Depends(get_db)):
+def admin_get_site_statistics(db: Session = Depends(get_db)):
     """
     [ADMIN ONLY] Get basic site statistics (e.g., counts of users, listings).
     """
     return admin_service.get_site_statistics(db)
+
+@router.get("/cache-statistics/", response_model=Dict[str, Any])
+def admin_get_cache_statistics():
+    """
+    [ADMIN ONLY] Hit/miss counters of this worker's authenticated-user cache.
+    """
+    return {"user_identity_cache": user_identity_cache.stats()}
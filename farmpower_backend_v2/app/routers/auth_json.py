@@ -6,8 +6,6 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
-from slowapi.util import get_remote_address
-from slowapi import Limiter, _rate_limit_exceeded_handler
 
 from ..core.db import get_db
 from ..schemas.user import Token, TokenData  # reuse existing Token
@@ -16,18 +14,11 @@ from ..services import user_service
 from ..core.security import verify_password, create_access_token
 from ..models.user import User as UserModel
 
-# Create a local limiter instance if global one is not available
-try:
-    from middleware.rate_limit import limiter as global_limiter
-except ImportError:
-    global_limiter = Limiter(key_func=get_remote_address)
-
 router = APIRouter(prefix="/api/users", tags=["Auth (JSON)"])
 
-# 20 requests per minute for unauthenticated login attempts
+# Limited to 20 requests per minute per client (RATE_LIMIT_LOGIN in middleware.rate_limit)
 @router.post("/login", response_model=Token)
-@global_limiter.limit("20/minute")
-async def json_login(
+def json_login(
     credentials: LoginRequest,
     request: Request,
     db: Session = Depends(get_db),
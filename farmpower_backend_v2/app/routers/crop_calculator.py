@@ -43,7 +43,7 @@ async def calculate_profit(request: CropProfitRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/save")
-async def save_calculation(
+def save_calculation(
     calculation: CropCalculationHistory,
     db: Session = Depends(get_db)
 ):
@@ -66,7 +66,7 @@ async def save_calculation(
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/history", response_model=List[CropCalculationHistory])
-async def get_calculation_history(db: Session = Depends(get_db)):
+def get_calculation_history(db: Session = Depends(get_db)):
     """Get history of crop profit calculations."""
     try:
         calculations = db.query(CropCalculation).order_by(
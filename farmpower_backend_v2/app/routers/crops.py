@@ -17,7 +17,7 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=CropSchema, status_code=status.HTTP_201_CREATED)
-async def create_new_crop_profitability_entry(
+def create_new_crop_profitability_entry(
     crop_in: CropCreate,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -30,7 +30,7 @@ async def create_new_crop_profitability_entry(
     return crop_service.create_crop(db=db, crop_in=crop_in, user_id=current_user.id)
 
 @router.get("/", response_model=List[CropSchema])
-async def get_user_created_crop_entries(
+def get_user_created_crop_entries(
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user),
     skip: int = Query(0, ge=0),
@@ -43,7 +43,7 @@ async def get_user_created_crop_entries(
     return crop_service.get_crops_by_user(db=db, user_id=current_user.id, skip=skip, limit=limit)
 
 @router.get("/{crop_id}", response_model=CropSchema)
-async def get_specific_crop_entry_details(
+def get_specific_crop_entry_details(
     crop_id: int,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -60,7 +60,7 @@ async def get_specific_crop_entry_details(
     return db_crop
 
 @router.put("/{crop_id}", response_model=CropSchema)
-async def update_crop_entry_details(
+def update_crop_entry_details(
     crop_id: int,
     crop_in: CropUpdate,
     db: Session = Depends(get_db),
@@ -78,7 +78,7 @@ async def update_crop_entry_details(
     return crop_service.update_crop(db=db, db_crop=db_crop, crop_in=crop_in)
 
 @router.delete("/{crop_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_crop_entry_permanently(
+def delete_crop_entry_permanently(
     crop_id: int,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -99,7 +99,7 @@ async def delete_crop_entry_permanently(
     return
 
 @router.get("/{crop_id}/profit", response_model=ProfitCalculationResult)
-async def get_profitability_analysis_for_crop(
+def get_profitability_analysis_for_crop(
     crop_id: int,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -1,15 +1,25 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import json
+from datetime import datetime, timedelta
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 
 from sqlalchemy.orm import Session
 
-from ..core.db import get_db
+from ..core.db import get_db, SessionLocal
+from ..core.gps_ingest import fix_time_utc
+from ..core.track_store import to_epoch_ms
+from ..core.pagination import set_next_cursor_header
+from ..core.responses import list_response
+from ..core.projection import FIELDS_DESCRIPTION, parse_fields
+from ..core.spatial_index import parse_bbox
 from ..core.dependencies import get_current_active_user # Assuming RoleChecker might be used for specific admin actions
 from ..models.user import User as UserModel, UserRole # UserRole for admin checks
-# FieldModel and LandUsagePlanModel are not directly used here as service handles DB interaction
-from ..schemas.field import FieldSchema, FieldCreate, FieldUpdate
+from ..models.field import Field as FieldModel # For `fields=` column selection; the service handles DB interaction
+from ..schemas.field import FieldSchema, FieldCardSchema, FieldCreate, FieldUpdate
 from ..schemas.land_usage_plan import LandUsagePlanSchema, LandUsagePlanCreate, LandUsagePlanUpdate
 from ..services import field_service # Import the field_service instance
+from ..services.track_service import track_service, track_store
 
 router = APIRouter(
     prefix="/fields",
@@ -17,10 +27,13 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+DEFAULT_TRACK_WINDOW = timedelta(hours=1)
+TRACK_STREAM_CHUNK_POINTS = 500 # NDJSON lines per streamed chunk
+
 # --- Field Endpoints ---
 
 @router.post("/", response_model=FieldSchema, status_code=status.HTTP_201_CREATED)
-async def create_new_user_field(
+def create_new_user_field(
     field_in: FieldCreate,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -30,17 +43,53 @@ async def create_new_user_field(
     return field_service.create_field(db=db, field_in=field_in, owner_id=current_user.id)
 
 @router.get("/", response_model=List[FieldSchema])
-async def get_current_user_fields(
+def get_current_user_fields(
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user),
     skip: int = Query(0, ge=0),
-    limit: int = Query(10, ge=1, le=100)
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
+    """
+    Get all fields registered by the currently authenticated user.
+    `fields=card` returns listing cards (FieldCardSchema) without boundaries, owner or plans.
+    """
+    selection = parse_fields(fields, FieldModel, FieldSchema, FieldCardSchema)
+    user_fields = field_service.get_fields_by_owner(
+        db=db, owner_id=current_user.id, skip=skip, limit=limit, cursor=cursor,
+        columns=selection.columns if selection else None
+    )
+    if selection:
+        return selection.response(user_fields)
+    return list_response(user_fields, FieldSchema)
+
+@router.get("/search", response_model=List[FieldSchema])
+def search_current_user_fields_in_bbox(
+    bbox: str = Query(..., description="min_lon,min_lat,max_lon,max_lat in WGS84; min_lon > max_lon crosses the antimeridian", examples=["-93.7,41.9,-93.4,42.1"]),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
 ):
-    """Get all fields registered by the currently authenticated user."""
-    return field_service.get_fields_by_owner(db=db, owner_id=current_user.id, skip=skip, limit=limit)
+    """Get the current user's fields whose boundary intersects a map viewport, ordered by name."""
+    try:
+        boxes = parse_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return field_service.search_fields_in_bbox(db=db, boxes=boxes, owner_id=current_user.id, limit=limit)
+
+@router.get("/locate", response_model=List[FieldSchema])
+def locate_current_user_fields_at_point(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """Get the current user's fields containing a point, e.g. the field a tractor is in."""
+    return field_service.locate_fields(db=db, lon=lon, lat=lat, owner_id=current_user.id)
 
 @router.get("/{field_id}", response_model=FieldSchema)
-async def get_specific_field_details(
+def get_specific_field_details(
     field_id: int,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -53,8 +102,59 @@ async def get_specific_field_details(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this field")
     return db_field
 
+@router.get("/{field_id}/tracks")
+def replay_field_gps_tracks(
+    field_id: int,
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user),
+    start: Optional[datetime] = Query(None, description="Window start (UTC); defaults to one hour before `end`"),
+    end: Optional[datetime] = Query(None, description="Window end (UTC); defaults to now"),
+    device_id: Optional[str] = Query(None, max_length=64, description="Only this device's track"),
+    max_points: int = Query(2000, ge=10, le=20000, description="Approximate points per device after downsampling")
+):
+    """
+    Stream recorded GPS fixes for a field as NDJSON, one point per line:
+    `{"device_id", "timestamp", "latitude", "longitude"}`. The window is
+    downsampled to about `max_points` per device. User must own the field or be an ADMIN.
+    """
+    db_field = field_service.get_field_by_id(db, field_id=field_id)
+    if not db_field:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Field not found")
+    if db_field.owner_id != current_user.id and current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this field")
+
+    end = fix_time_utc(end)
+    start = fix_time_utc(start) if start else end - DEFAULT_TRACK_WINDOW
+    if start >= end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end.")
+    return StreamingResponse(
+        _stream_track_points(field_id, start, end, device_id, max_points),
+        media_type="application/x-ndjson"
+    )
+
+def _stream_track_points(field_id: int, start: datetime, end: datetime, device_id: Optional[str], max_points: int):
+    # Runs in the threadpool while the response streams, so it uses its own session
+    db = SessionLocal()
+    try:
+        pending = track_store.pending_points(field_id, to_epoch_ms(start), to_epoch_ms(end), device_id)
+        chunk = []
+        for point in track_service.iter_track_points(db, field_id, start, end, device_id, max_points, pending):
+            chunk.append(json.dumps({
+                "device_id": point.device_id,
+                "timestamp": point.timestamp.isoformat() + "Z",
+                "latitude": point.latitude,
+                "longitude": point.longitude,
+            }))
+            if len(chunk) >= TRACK_STREAM_CHUNK_POINTS:
+                yield "\n".join(chunk) + "\n"
+                chunk = []
+        if chunk:
+            yield "\n".join(chunk) + "\n"
+    finally:
+        db.close()
+
 @router.put("/{field_id}", response_model=FieldSchema)
-async def update_user_field_details(
+def update_user_field_details(
     field_id: int,
     field_in: FieldUpdate,
     db: Session = Depends(get_db),
@@ -69,7 +169,7 @@ async def update_user_field_details(
     return field_service.update_field(db=db, db_field=db_field, field_in=field_in)
 
 @router.delete("/{field_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user_field(
+def delete_user_field(
     field_id: int,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -89,7 +189,7 @@ async def delete_user_field(
 # --- Land Usage Plan Endpoints (Nested under Fields) ---
 
 @router.post("/{field_id}/plans/", response_model=LandUsagePlanSchema, status_code=status.HTTP_201_CREATED)
-async def create_plan_for_field(
+def create_plan_for_field(
     field_id: int,
     plan_in: LandUsagePlanCreate,
     db: Session = Depends(get_db),
@@ -104,12 +204,14 @@ async def create_plan_for_field(
     return field_service.create_land_usage_plan(db=db, plan_in=plan_in, field_id=field_id)
 
 @router.get("/{field_id}/plans/", response_model=List[LandUsagePlanSchema])
-async def list_plans_for_field(
+def list_plans_for_field(
     field_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user),
     skip: int = Query(0, ge=0),
-    limit: int = Query(10, ge=1, le=100)
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page")
 ):
     """Get all land usage plans for a specific field. User must own field or be ADMIN."""
     db_field = field_service.get_field_by_id(db, field_id=field_id)
@@ -117,12 +219,14 @@ async def list_plans_for_field(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Field not found")
     if db_field.owner_id != current_user.id and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view plans for this field")
-    return field_service.get_plans_for_field(db=db, field_id=field_id, skip=skip, limit=limit)
+    plans = field_service.get_plans_for_field(db=db, field_id=field_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor_header(response, plans)
+    return plans
 
 # Standalone plan management might be useful too, but requires careful auth.
 # These are accessed via /fields/plans/{plan_id}
 @router.get("/plans/{plan_id}", response_model=LandUsagePlanSchema)
-async def get_specific_land_usage_plan(
+def get_specific_land_usage_plan(
     plan_id: int,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -139,7 +243,7 @@ async def get_specific_land_usage_plan(
     return db_plan
 
 @router.put("/plans/{plan_id}", response_model=LandUsagePlanSchema)
-async def update_specific_land_usage_plan(
+def update_specific_land_usage_plan(
     plan_id: int,
     plan_in: LandUsagePlanUpdate,
     db: Session = Depends(get_db),
@@ -157,7 +261,7 @@ async def update_specific_land_usage_plan(
     return field_service.update_land_usage_plan(db=db, db_plan=db_plan, plan_in=plan_in)
 
 @router.delete("/plans/{plan_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_specific_land_usage_plan(
+def delete_specific_land_usage_plan(
     plan_id: int,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from ..database import get_db
-from ..schemas.tractor import TractorSchema, TractorCreate, TractorUpdate
+from ..core.config import settings
+from ..core.http_cache import CachePolicy
+from ..core.responses import list_response
+from ..core.projection import FIELDS_DESCRIPTION, parse_fields
+from ..schemas.tractor import TractorSchema, TractorCardSchema, TractorCreate, TractorUpdate
 from ..schemas.part import PartSchema, PartCreate, PartUpdate
 from ..core.dependencies import get_current_user
 from ..services.tractor_service import tractor_service
 from ..services.part_service import part_service
+from ..services.resource_versions import TRACTORS, USERS
+from ..models.tractor import Tractor as TractorModel
 from ..models.user import User as UserModel # Import User model for type hinting current_user
 
 router = APIRouter(
@@ -14,6 +20,13 @@ router = APIRouter(
     tags=["marketplace"]
 )
 
+# Conditional GETs (core/http_cache.py); tractors embed their owner
+tractor_listing_cache = CachePolicy(
+    (TRACTORS, USERS), [TractorSchema, TractorCardSchema], max_age_s=settings.HTTP_CACHE_LISTING_MAX_AGE_S
+)
+tractor_detail_cache = CachePolicy((USERS,), [TractorSchema], max_age_s=settings.HTTP_CACHE_DETAIL_MAX_AGE_S)
+featured_cache = CachePolicy((TRACTORS, USERS), [TractorSchema], max_age_s=settings.HTTP_CACHE_FEATURED_MAX_AGE_S)
+
 # Dummy data moved to a more appropriate place or seeded via service if needed
 
 @router.post("/seed-dummy-data", status_code=status.HTTP_200_OK)
@@ -96,22 +109,46 @@ def seed_dummy_data(db: Session = Depends(get_db)):
 # Tractor endpoints
 @router.get("/tractors", response_model=List[TractorSchema])
 def get_tractors(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=200),
     brand: Optional[str] = Query(None, description="Filter by brand name (case-insensitive)"),
     location: Optional[str] = Query(None, description="Filter by location (case-insensitive)"),
     min_price: Optional[float] = Query(None, alias="minPrice", gt=0, description="Minimum price filter"),
     max_price: Optional[float] = Query(None, alias="maxPrice", gt=0, description="Maximum price filter"),
+    q: Optional[str] = Query(None, min_length=1, max_length=200, description="Full-text search, results ranked by relevance"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
-    tractors = tractor_service.get_tractors(db, skip=skip, limit=limit, brand=brand, location=location, min_price=min_price, max_price=max_price)
-    return tractors
+    # With `fields`, only the selected columns are loaded and returned (TractorCardSchema for `card`)
+    selection = parse_fields(fields, TractorModel, TractorSchema, TractorCardSchema)
+    validator = tractor_listing_cache.for_listing(request, db)
+    if validator.not_modified:
+        return validator.not_modified_response()
+    if q:
+        if cursor:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="cursor cannot be combined with q; use skip to page search results.")
+        tractors = tractor_service.search_tractors(db, q=q, skip=skip, limit=limit, brand=brand, location=location, min_price=min_price, max_price=max_price)
+        return validator.apply(selection.response(tractors) if selection else list_response(tractors, TractorSchema, paged=False))
+    tractors = tractor_service.get_tractors(
+        db, skip=skip, limit=limit, brand=brand, location=location, min_price=min_price, max_price=max_price, cursor=cursor,
+        columns=selection.columns if selection else None
+    )
+    if selection:
+        return validator.apply(selection.response(tractors))
+    return validator.apply(list_response(tractors, TractorSchema))
 
 @router.get("/tractors/{tractor_id}", response_model=TractorSchema)
-def get_tractor(tractor_id: int, db: Session = Depends(get_db)):
+def get_tractor(tractor_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    validator = tractor_detail_cache.for_row(request, db, TractorModel, tractor_id)
+    if validator and validator.not_modified:
+        return validator.not_modified_response()
     tractor = tractor_service.get_tractor_by_id(db, tractor_id)
     if not tractor:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tractor not found")
+    if validator:
+        validator.apply(response)
     return tractor
 
 @router.post("/tractors", response_model=TractorSchema, status_code=status.HTTP_201_CREATED)
@@ -162,10 +199,11 @@ def get_parts(
     min_price: Optional[float] = Query(None, alias="minPrice", gt=0),
     max_price: Optional[float] = Query(None, alias="maxPrice", gt=0),
     location: Optional[str] = Query(None, description="Filter by seller's location for the part"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db)
 ):
-    parts = part_service.get_parts(db, skip=skip, limit=limit, category=category, brand=brand, min_price=min_price, max_price=max_price, location=location)
-    return parts
+    parts = part_service.get_parts(db, skip=skip, limit=limit, category=category, brand=brand, min_price=min_price, max_price=max_price, location=location, cursor=cursor)
+    return list_response(parts, PartSchema)
 
 @router.get("/parts/{part_id}", response_model=PartSchema)
 def get_part(part_id: int, db: Session = Depends(get_db)):
@@ -215,12 +253,16 @@ def delete_part(
 # Featured listings endpoint
 @router.get("/featured", response_model=List[TractorSchema])
 def get_featured_listings(
+    request: Request,
     limit: int = Query(6, ge=1),
     db: Session = Depends(get_db)
 ):
+    validator = featured_cache.for_listing(request, db)
+    if validator.not_modified:
+        return validator.not_modified_response()
     # This assumes 'is_featured' is a field in the Tractor model. If not, it needs to be added.
     # For now, it will fetch all and limit, or you might need a different logic for 'featured'.
     featured_tractors = tractor_service.get_tractors(db, limit=limit) # Adjust as per your 'featured' logic
     # If 'is_featured' exists in the model and you want to filter by it:
     # featured_tractors = db.query(TractorModel).filter(TractorModel.is_featured == True).limit(limit).all()
-    return featured_tractors 
\ No newline at end of file
+    return validator.apply(list_response(featured_tractors, TractorSchema, paged=False))
@@ -1,9 +1,10 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from sqlalchemy.orm import Session
 
 from ..core.db import get_db
+from ..core.pagination import set_next_cursor_header
 from ..core.dependencies import get_current_active_user
 from ..models.user import User as UserModel
 from ..schemas.message import MessageSchema, MessageCreate, ConversationSchema
@@ -16,7 +17,7 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=MessageSchema, status_code=status.HTTP_201_CREATED)
-async def send_new_message(
+def send_new_message(
     message_in: MessageCreate,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -36,7 +37,7 @@ async def send_new_message(
     return message_service.create_message(db=db, message_in=message_in, sender_id=current_user.id)
 
 @router.get("/conversations/", response_model=List[ConversationSchema])
-async def get_my_conversations(
+def get_my_conversations(
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
 ):
@@ -47,12 +48,14 @@ async def get_my_conversations(
     return message_service.get_conversations_for_user(db=db, user_id=current_user.id)
 
 @router.get("/conversation/{conversation_id}", response_model=List[MessageSchema])
-async def get_messages_in_conversation(
+def get_messages_in_conversation(
     conversation_id: str,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user),
     skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=200) # Default 50 messages, max 200
+    limit: int = Query(50, ge=1, le=200), # Default 50 messages, max 200
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page")
 ):
     """
     Get messages for a specific conversation ID.
@@ -63,9 +66,9 @@ async def get_messages_in_conversation(
     # as it filters by user_id being sender or recipient within that conversation_id.
     # However, an explicit check here could be an additional layer.
     messages = message_service.get_messages_for_conversation(
-        db=db, conversation_id=conversation_id, user_id=current_user.id, skip=skip, limit=limit
+        db=db, conversation_id=conversation_id, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor
     )
-    if not messages and skip == 0: # If no messages and it's the first page, maybe convo doesn't exist for user
+    if not messages and skip == 0 and not cursor: # If no messages and it's the first page, maybe convo doesn't exist for user
         # Check if conversation_id is valid for this user by trying to parse participants
         try:
             ids_str = conversation_id.split('-')
@@ -76,10 +79,11 @@ async def get_messages_in_conversation(
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid conversation ID format.")
         # If user is part of convo but no messages, return empty list (which it does)
 
+    set_next_cursor_header(response, messages)
     return messages
 
 @router.post("/conversation/{conversation_id}/read", status_code=status.HTTP_200_OK)
-async def mark_conversation_as_read(
+def mark_conversation_as_read(
     conversation_id: str,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -1,9 +1,10 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from sqlalchemy.orm import Session
 
 from ..core.db import get_db
+from ..core.pagination import set_next_cursor_header
 from ..core.dependencies import get_current_active_user, RoleChecker # RoleChecker for admin-only create
 from ..models.user import User as UserModel, UserRole
 from ..schemas.notification import NotificationSchema, NotificationCreateInternal # For admin/internal creation
@@ -19,7 +20,7 @@ router = APIRouter(
 # For user-triggered notifications (e.g. new message), the logic would be within those specific services/routers.
 @router.post("/", response_model=NotificationSchema, status_code=status.HTTP_201_CREATED,
              dependencies=[Depends(RoleChecker([UserRole.ADMIN]))]) # Example: Admin only
-async def create_notification_for_user(
+def create_notification_for_user(
     notification_in: NotificationCreateInternal, # Requires user_id to be specified
     db: Session = Depends(get_db)
 ):
@@ -30,22 +31,26 @@ async def create_notification_for_user(
     return notification_service.create_notification(db=db, notification_in=notification_in)
 
 @router.get("/", response_model=List[NotificationSchema])
-async def get_my_notifications(
+def get_my_notifications(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    unread_only: Optional[bool] = Query(False, description="Set to true to fetch only unread notifications")
+    unread_only: Optional[bool] = Query(False, description="Set to true to fetch only unread notifications"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page")
 ):
     """
     Get notifications for the currently authenticated user. Supports pagination and filtering by unread status.
     """
-    return notification_service.get_notifications_for_user(
-        db=db, user_id=current_user.id, skip=skip, limit=limit, unread_only=unread_only
+    notifications = notification_service.get_notifications_for_user(
+        db=db, user_id=current_user.id, skip=skip, limit=limit, unread_only=unread_only, cursor=cursor
     )
+    set_next_cursor_header(response, notifications)
+    return notifications
 
 @router.patch("/{notification_id}/read", response_model=NotificationSchema)
-async def mark_one_notification_as_read(
+def mark_one_notification_as_read(
     notification_id: int,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -64,7 +69,7 @@ async def mark_one_notification_as_read(
     return updated_notification
 
 @router.post("/read-all", status_code=status.HTTP_200_OK)
-async def mark_all_my_notifications_as_read(
+def mark_all_my_notifications_as_read(
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
 ):
@@ -1,15 +1,21 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, File, UploadFile
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm.attributes import flag_modified
 
 
+from ..core.config import settings
 from ..core.db import get_db
+from ..core.http_cache import CachePolicy
+from ..core.responses import list_response
+from ..core.projection import FIELDS_DESCRIPTION, parse_fields
 from ..core.dependencies import get_current_active_user
 from ..models.user import User as UserModel, UserRole
 from ..models.part import Part as PartModel # Renamed to avoid confusion
-from ..schemas.part import PartSchema, PartCreate, PartUpdate
+from ..schemas.part import PartSchema, PartCardSchema, PartCreate, PartUpdate
 from ..services import part_service, s3_service # Import services
+from ..services.resource_versions import resource_versions, PARTS
 
 router = APIRouter(
     prefix="/parts",
@@ -17,8 +23,12 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Conditional GETs (core/http_cache.py)
+part_listing_cache = CachePolicy((PARTS,), [PartSchema, PartCardSchema], max_age_s=settings.HTTP_CACHE_LISTING_MAX_AGE_S)
+part_detail_cache = CachePolicy((), [PartSchema], max_age_s=settings.HTTP_CACHE_DETAIL_MAX_AGE_S)
+
 @router.post("/", response_model=PartSchema, status_code=status.HTTP_201_CREATED)
-async def list_new_part_for_sale(
+def list_new_part_for_sale(
     part_in: PartCreate,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -30,7 +40,8 @@ async def list_new_part_for_sale(
     return part_service.create_part(db=db, part_in=part_in, seller_id=current_user.id)
 
 @router.get("/", response_model=List[PartSchema])
-async def browse_all_parts_for_sale(
+def browse_all_parts_for_sale(
+    request: Request,
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=200),
@@ -40,36 +51,56 @@ async def browse_all_parts_for_sale(
     min_price: Optional[float] = Query(None, alias="minPrice", gt=0),
     max_price: Optional[float] = Query(None, alias="maxPrice", gt=0),
     location: Optional[str] = Query(None, description="Filter by seller's location for the part"),
-    seller_id: Optional[int] = Query(None, description="Filter by seller's user ID")
+    seller_id: Optional[int] = Query(None, description="Filter by seller's user ID"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
     """
     Browse available tractor parts. Open to public.
     Supports filtering by category, tractor brand compatibility, condition, price range, location, and seller.
+    Newest first; pass the `X-Next-Cursor` response header back as `cursor` for the next page.
+    `fields=card` returns listing cards (PartCardSchema); `fields=id,name,price` just those fields.
+    Responses carry an `ETag`; with a matching `If-None-Match` the answer is a bodiless 304.
     """
     if max_price is not None and min_price is not None and max_price < min_price:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="maxPrice cannot be less than minPrice.")
 
+    selection = parse_fields(fields, PartModel, PartSchema, PartCardSchema)
+    validator = part_listing_cache.for_listing(request, db)
+    if validator.not_modified:
+        return validator.not_modified_response()
     parts = part_service.get_parts(
         db, skip=skip, limit=limit, category=category, tractor_brand=tractor_brand,
-        condition=condition, min_price=min_price, max_price=max_price, location=location, seller_id=seller_id
+        condition=condition, min_price=min_price, max_price=max_price, location=location, seller_id=seller_id,
+        cursor=cursor, columns=selection.columns if selection else None
     )
-    return parts
+    if selection:
+        return validator.apply(selection.response(parts))
+    return validator.apply(list_response(parts, PartSchema))
 
 @router.get("/{part_id}", response_model=PartSchema)
-async def get_part_listing_details(
+def get_part_listing_details(
     part_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Get detailed information about a specific part listing. Open to public.
+    Send the `ETag` back as `If-None-Match` to get a 304 when the listing hasn't changed.
     """
+    validator = part_detail_cache.for_row(request, db, PartModel, part_id)
+    if validator and validator.not_modified:
+        return validator.not_modified_response()
     db_part = part_service.get_part_by_id(db, part_id=part_id)
     if db_part is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Part not found")
+    if validator:
+        validator.apply(response)
     return db_part
 
 @router.put("/{part_id}", response_model=PartSchema)
-async def update_part_listing_details(
+def update_part_listing_details(
     part_id: int,
     part_in: PartUpdate,
     db: Session = Depends(get_db),
@@ -89,7 +120,7 @@ async def update_part_listing_details(
     return part_service.update_part(db=db, db_part=db_part, part_in=part_in)
 
 @router.delete("/{part_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def remove_part_listing(
+def remove_part_listing(
     part_id: int,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -121,7 +152,8 @@ async def upload_part_image(
     Upload an image for a part. The image URL will be added to the part's image_urls list.
     Requires authentication. User must be the seller of the part or an ADMIN.
     """
-    db_part = part_service.get_part_by_id(db, part_id=part_id)
+    # Async for the upload itself; DB calls go to the threadpool to keep the event loop free
+    db_part = await run_in_threadpool(part_service.get_part_by_id, db, part_id=part_id)
     if not db_part:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Part not found")
 
@@ -137,14 +169,16 @@ async def upload_part_image(
     if not image_url:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to upload image.")
 
-    if db_part.image_urls is None: # Should be initialized as default=[] in model
-        db_part.image_urls = []
+    return await run_in_threadpool(_add_image_url, db, db_part, image_url)
 
+def _add_image_url(db: Session, db_part: PartModel, image_url: str) -> PartSchema:
+    if db_part.image_urls is None: # Should be initialized as default=[] in the model
+        db_part.image_urls = []
     db_part.image_urls.append(image_url)
-    flag_modified(db_part, "image_urls") # Mark as modified for SQLAlchemy
-
+    flag_modified(db_part, "image_urls") # Mark the JSON field as modified for SQLAlchemy
     db.add(db_part)
+    resource_versions.bump(db, PARTS)
     db.commit()
     db.refresh(db_part)
-
-    return db_part
+    # Serialized here rather than on the event loop, since it may lazy-load relationships
+    return PartSchema.model_validate(db_part)
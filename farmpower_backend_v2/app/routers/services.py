@@ -1,9 +1,10 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from sqlalchemy.orm import Session
 
 from ..core.db import get_db
+from ..core.pagination import set_next_cursor_header
 from ..core.dependencies import get_current_active_user
 from ..models.user import User as UserModel, UserRole
 from ..models.service_booking import ServiceStatus # For status updates
@@ -17,7 +18,7 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=ServiceBookingSchema, status_code=status.HTTP_201_CREATED)
-async def create_new_service_booking(
+def create_new_service_booking(
     booking_in: ServiceBookingCreate,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -30,12 +31,14 @@ async def create_new_service_booking(
     return service_booking_service.create_booking(db=db, booking_in=booking_in, user_id=current_user.id)
 
 @router.get("/", response_model=List[ServiceBookingSchema])
-async def get_service_bookings_list(
+def get_service_bookings_list(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    view_as_provider: bool = Query(False, description="Set to true if service provider is viewing their assigned bookings")
+    view_as_provider: bool = Query(False, description="Set to true if service provider is viewing their assigned bookings"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page")
 ):
     """
     Get a list of service bookings.
@@ -44,14 +47,16 @@ async def get_service_bookings_list(
     - Admins see all bookings.
     """
     if current_user.role == UserRole.ADMIN:
-        return service_booking_service.get_all_bookings(db=db, skip=skip, limit=limit)
+        bookings = service_booking_service.get_all_bookings(db=db, skip=skip, limit=limit, cursor=cursor)
     elif current_user.role == UserRole.SERVICE_PROVIDER and view_as_provider:
-        return service_booking_service.get_bookings_by_provider(db=db, provider_id=current_user.id, skip=skip, limit=limit)
+        bookings = service_booking_service.get_bookings_by_provider(db=db, provider_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
     else: # Default for FARMER, DEALER, or SERVICE_PROVIDER not viewing as provider
-        return service_booking_service.get_bookings_by_user(db=db, user_id=current_user.id, skip=skip, limit=limit)
+        bookings = service_booking_service.get_bookings_by_user(db=db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor_header(response, bookings)
+    return bookings
 
 @router.get("/{booking_id}", response_model=ServiceBookingSchema)
-async def get_specific_service_booking_details(
+def get_specific_service_booking_details(
     booking_id: int,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -73,7 +78,7 @@ async def get_specific_service_booking_details(
     return booking
 
 @router.put("/{booking_id}", response_model=ServiceBookingSchema)
-async def update_service_booking_details(
+def update_service_booking_details(
     booking_id: int,
     booking_in: ServiceBookingUpdate,
     db: Session = Depends(get_db),
@@ -101,7 +106,7 @@ async def update_service_booking_details(
     return service_booking_service.update_booking(db=db, db_booking=db_booking, booking_in=booking_in)
 
 @router.patch("/{booking_id}/status", response_model=ServiceBookingSchema)
-async def update_service_booking_status_endpoint(
+def update_service_booking_status_endpoint(
     booking_id: int,
     status_in: ServiceStatus, # Directly pass the new status
     db: Session = Depends(get_db),
@@ -130,7 +135,7 @@ async def update_service_booking_status_endpoint(
 
 
 @router.delete("/{booking_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def cancel_or_delete_service_booking(
+def cancel_or_delete_service_booking(
     booking_id: int,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -1,16 +1,21 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, File, UploadFile
 
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm.attributes import flag_modified
 
 
+from ..core.config import settings
 from ..core.db import get_db
+from ..core.http_cache import CachePolicy
+from ..core.responses import list_response
 from ..core.dependencies import get_current_active_user # Assuming RoleChecker is not needed for basic CRUD auth by owner/admin
 from ..models.user import User as UserModel, UserRole # UserRole for checking admin
 from ..models.tractor import Tractor as TractorModel
 from ..schemas.tractor import TractorSchema, TractorCreate, TractorUpdate
 from ..services import tractor_service, s3_service # Import s3_service for image upload
+from ..services.resource_versions import resource_versions, TRACTORS, USERS
 
 router = APIRouter(
     prefix="/tractors",
@@ -18,8 +23,12 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Conditional GETs (core/http_cache.py); tractors embed their owner
+tractor_listing_cache = CachePolicy((TRACTORS, USERS), [TractorSchema], max_age_s=settings.HTTP_CACHE_LISTING_MAX_AGE_S)
+tractor_detail_cache = CachePolicy((USERS,), [TractorSchema], max_age_s=settings.HTTP_CACHE_DETAIL_MAX_AGE_S)
+
 @router.post("/", response_model=TractorSchema, status_code=status.HTTP_201_CREATED)
-async def create_new_tractor_listing(
+def create_new_tractor_listing(
     tractor_in: TractorCreate,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -31,7 +40,8 @@ async def create_new_tractor_listing(
     return tractor_service.create_tractor(db=db, tractor_in=tractor_in, owner_id=current_user.id)
 
 @router.get("/", response_model=List[TractorSchema])
-async def get_all_tractor_listings(
+def get_all_tractor_listings(
+    request: Request,
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=200), # Max 200 items
@@ -39,36 +49,63 @@ async def get_all_tractor_listings(
     location: Optional[str] = Query(None, description="Filter by location (case-insensitive)"),
     min_price: Optional[float] = Query(None, alias="minPrice", gt=0, description="Minimum price filter"),
     max_price: Optional[float] = Query(None, alias="maxPrice", gt=0, description="Maximum price filter"),
-    owner_id: Optional[int] = Query(None, description="Filter by owner's user ID")
+    owner_id: Optional[int] = Query(None, description="Filter by owner's user ID"),
+    q: Optional[str] = Query(None, min_length=1, max_length=200, description="Full-text search over name, brand, model, location and description (results ranked by relevance)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page")
 ):
     """
-    Get a list of all available tractors. Supports filtering and pagination.
+    Get a list of all available tractors, newest first. Supports filtering and pagination.
+    Pass the `X-Next-Cursor` response header back as `cursor` to fetch the next page;
+    `skip` still works but gets slower on deep pages.
+    With `q`, results are ranked by search relevance instead and paged with `skip` only.
+    Responses carry an `ETag`; with a matching `If-None-Match` the answer is a bodiless 304.
     No authentication required for browsing.
     """
     if max_price is not None and min_price is not None and max_price < min_price:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="maxPrice cannot be less than minPrice.")
 
+    validator = tractor_listing_cache.for_listing(request, db)
+    if validator.not_modified:
+        return validator.not_modified_response()
+
+    if q:
+        if cursor:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="cursor cannot be combined with q; use skip to page search results.")
+        tractors = tractor_service.search_tractors(
+            db, q=q, skip=skip, limit=limit, brand=brand, location=location,
+            min_price=min_price, max_price=max_price, owner_id=owner_id
+        )
+        return validator.apply(list_response(tractors, TractorSchema, paged=False))
     tractors = tractor_service.get_tractors(
         db, skip=skip, limit=limit, brand=brand, location=location,
-        min_price=min_price, max_price=max_price, owner_id=owner_id
+        min_price=min_price, max_price=max_price, owner_id=owner_id, cursor=cursor
     )
-    return tractors
+    # Encoded straight from the rows; response_model still documents the shape
+    return validator.apply(list_response(tractors, TractorSchema))
 
 @router.get("/{tractor_id}", response_model=TractorSchema)
-async def get_tractor_listing_details(
+def get_tractor_listing_details(
     tractor_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Get detailed information about a specific tractor listing. No authentication required.
+    Send the `ETag` back as `If-None-Match` to get a 304 when the listing hasn't changed.
     """
+    validator = tractor_detail_cache.for_row(request, db, TractorModel, tractor_id)
+    if validator and validator.not_modified:
+        return validator.not_modified_response()
     db_tractor = tractor_service.get_tractor_by_id(db, tractor_id=tractor_id)
     if db_tractor is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tractor not found")
+    if validator:
+        validator.apply(response)
     return db_tractor
 
 @router.put("/{tractor_id}", response_model=TractorSchema)
-async def update_existing_tractor_listing(
+def update_existing_tractor_listing(
     tractor_id: int,
     tractor_in: TractorUpdate,
     db: Session = Depends(get_db),
@@ -88,7 +125,7 @@ async def update_existing_tractor_listing(
     return tractor_service.update_tractor(db=db, db_tractor=db_tractor, tractor_in=tractor_in)
 
 @router.delete("/{tractor_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def remove_tractor_listing_permanently(
+def remove_tractor_listing_permanently(
     tractor_id: int,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -123,7 +160,8 @@ async def upload_tractor_image_to_s3(
     Upload an image for a tractor. The image URL will be added to the tractor's image_urls list.
     Requires authentication. User must be the owner of the tractor or an ADMIN.
     """
-    db_tractor = tractor_service.get_tractor_by_id(db, tractor_id=tractor_id)
+    # Async for the upload itself; DB calls go to the threadpool to keep the event loop free
+    db_tractor = await run_in_threadpool(tractor_service.get_tractor_by_id, db, tractor_id=tractor_id)
     if not db_tractor:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tractor not found")
 
@@ -142,18 +180,16 @@ async def upload_tractor_image_to_s3(
     if not image_url:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to upload image.")
 
-    # Ensure image_urls is a list. It should be initialized as default=[] in the model.
-    if db_tractor.image_urls is None: # Should not happen with default=[]
-        db_tractor.image_urls = []
+    return await run_in_threadpool(_add_image_url, db, db_tractor, image_url)
 
-    # Append new URL. This mutates the list if it's already a Python list.
+def _add_image_url(db: Session, db_tractor: TractorModel, image_url: str) -> TractorSchema:
+    if db_tractor.image_urls is None: # Should be initialized as default=[] in the model
+        db_tractor.image_urls = []
     db_tractor.image_urls.append(image_url)
-
-    # Mark the JSON field as modified for SQLAlchemy to detect the change.
-    flag_modified(db_tractor, "image_urls")
-
-    db.add(db_tractor) # Add to session to ensure changes are tracked
+    flag_modified(db_tractor, "image_urls") # Mark the JSON field as modified for SQLAlchemy
+    db.add(db_tractor)
+    resource_versions.bump(db, TRACTORS)
     db.commit()
     db.refresh(db_tractor)
-
-    return db_tractor
+    # Serialized here rather than on the event loop, since it may lazy-load relationships
+    return TractorSchema.model_validate(db_tractor)
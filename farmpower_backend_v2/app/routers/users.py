@@ -15,7 +15,7 @@ router = APIRouter(
 )
 
 @router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+def register_user(user: UserCreate, db: Session = Depends(get_db)):
     """
     Create a new user.
     """
@@ -33,7 +33,7 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
 # Note: The tokenUrl for OAuth2PasswordBearer should match this endpoint's path
 # If router prefix is /users, then tokenUrl="/users/login/token" is correct
 @router.post("/login/token", response_model=Token)
-async def login_for_access_token(
+def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
@@ -73,7 +73,7 @@ async def read_users_me(current_user: UserModel = Depends(get_current_active_use
     return current_user
 
 @router.get("/{user_id}", response_model=UserSchema)
-async def read_user_by_id(
+def read_user_by_id(
     user_id: int,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -90,7 +90,7 @@ async def read_user_by_id(
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this user's data")
 
 @router.put("/{user_id}", response_model=UserSchema)
-async def update_user_details(
+def update_user_details(
     user_id: int,
     user_in: UserUpdate,
     db: Session = Depends(get_db),
@@ -113,7 +113,7 @@ async def update_user_details(
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this user's data")
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user_by_id(
+def delete_user_by_id(
     user_id: int,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
@@ -135,7 +135,7 @@ async def delete_user_by_id(
 
 
 @router.get("/", response_model=List[UserSchema], dependencies=[Depends(RoleChecker([UserRole.ADMIN]))])
-async def list_all_users(
+def list_all_users(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100
@@ -153,7 +153,7 @@ from ..schemas.user import OTPRequest, OTPVerify # Import OTP schemas
 # --- OTP Verification Endpoints ---
 
 @router.post("/request-verification-otp", status_code=status.HTTP_200_OK)
-async def request_otp_for_verification(
+def request_otp_for_verification(
     otp_request: OTPRequest,
     db: Session = Depends(get_db)
 ):
@@ -178,7 +178,7 @@ async def request_otp_for_verification(
     return {"message": "An OTP has been sent to your email address for verification."}
 
 @router.post("/verify-otp", status_code=status.HTTP_200_OK)
-async def verify_account_otp(
+def verify_account_otp(
     otp_verify: OTPVerify,
     db: Session = Depends(get_db)
 ):
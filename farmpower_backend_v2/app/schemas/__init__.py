@@ -10,7 +10,7 @@ from .user import (
     OTPVerify,
     UserRole # Re-export UserRole if it's commonly used with schemas
 )
-from .tractor import TractorSchema, TractorCreate, TractorUpdate, TractorBase
+from .tractor import TractorSchema, TractorCreate, TractorUpdate, TractorBase, TractorCardSchema
 from .land_usage_plan import (
     LandUsagePlanBase,
     LandUsagePlanCreate,
@@ -22,6 +22,7 @@ from .field import (
     FieldCreate,
     FieldUpdate,
     FieldSchema,
+    FieldCardSchema,
 )
 from .crop import (
     CropBase,
@@ -44,6 +45,7 @@ from .part import ( # Import part schemas
     PartCreate,
     PartUpdate,
     PartSchema,
+    PartCardSchema,
 )
 from .notification import ( # Import notification schemas
     NotificationBase,
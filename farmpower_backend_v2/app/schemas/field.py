@@ -19,7 +19,7 @@ class FieldBase(BaseModel):
             [100.0, 0.0], [101.0, 0.0], [101.0, 1.0], [100.0, 1.0], [100.0, 0.0]
         ]]
     })
-    area_hectares: Optional[float] = Field(None, gt=0, example=12.5)
+    area_hectares: Optional[float] = Field(None, gt=0, example=12.5, description="Computed from `coordinates` when it is a Polygon/MultiPolygon; otherwise kept as given")
     crop_info: Optional[str] = Field(None, max_length=255, example="Currently planted with Winter Wheat")
     # soil_type is managed separately or via different mechanism, not in base create/update directly by user initially
 
@@ -45,3 +45,14 @@ class FieldSchema(FieldBase): # For responses
 
     class Config:
         from_attributes = True # Pydantic V2 (orm_mode)
+
+class FieldCardSchema(BaseModel): # Listing card (`fields=card`): no boundary, owner or plans
+    id: int
+    name: str
+    area_hectares: Optional[float] = None
+    crop_info: Optional[str] = None
+    soil_type: Optional[str] = None
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+class LocationUpdate(BaseModel):
+    """A single GPS fix sent by a tractor/device over the `update_location` socket event."""
+    field_id: int = Field(..., gt=0)
+    latitude: float = Field(..., ge=-90, le=90, allow_inf_nan=False, example=41.8781)
+    longitude: float = Field(..., ge=-180, le=180, allow_inf_nan=False, example=-93.0977)
+    device_id: Optional[str] = Field(None, min_length=1, max_length=64, description="Stable device identifier; defaults to the socket session.")
+    timestamp: Optional[datetime] = Field(None, description="Time of the fix (ISO 8601 or epoch seconds); defaults to receipt time.")
+    heading: Optional[float] = Field(None, ge=0, lt=360, allow_inf_nan=False)
+    speed: Optional[float] = Field(None, ge=0, allow_inf_nan=False, description="Ground speed in m/s")
+    accuracy: Optional[float] = Field(None, ge=0, allow_inf_nan=False, description="Horizontal accuracy in metres")
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 
@@ -41,3 +41,24 @@ class PartSchema(PartBase):
 
     class Config:
         from_attributes = True
+
+# Listing card (`fields=card`): no description or image list, just the first image
+class PartCardSchema(BaseModel):
+    id: int
+    name: str
+    category: str
+    brand: Optional[str] = None
+    price: float
+    location: Optional[str] = None
+    condition: Optional[str] = None
+    quantity: int
+    thumbnail_url: Optional[str] = Field(None, validation_alias="image_urls")
+    created_at: datetime
+
+    @field_validator("thumbnail_url", mode="before")
+    @classmethod
+    def first_image(cls, image_urls):
+        return image_urls[0] if image_urls else None
+
+    class Config:
+        from_attributes = True
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 
@@ -45,3 +45,25 @@ class TractorSchema(TractorBase):
 
     class Config:
         from_attributes = True
+
+# Listing card (`fields=card`): no description, owner or image list, just the first image
+class TractorCardSchema(BaseModel):
+    id: int
+    name: str
+    brand: str
+    model: str
+    year: int
+    price: float
+    location: str
+    horsepower: Optional[int] = None
+    condition: Optional[str] = None
+    thumbnail_url: Optional[str] = Field(None, validation_alias="image_urls")
+    created_at: datetime
+
+    @field_validator("thumbnail_url", mode="before")
+    @classmethod
+    def first_image(cls, image_urls):
+        return image_urls[0] if image_urls else None
+
+    class Config:
+        from_attributes = True
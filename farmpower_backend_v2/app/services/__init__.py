@@ -9,5 +9,9 @@ from .part_service import part_service
 from .notification_service import notification_service
 from .message_service import message_service
 from .admin_service import admin_service # Import admin_service
+from .service_booking_service import service_booking_service
+from .track_service import track_service
+from .user_identity_cache import user_identity_cache
+from .resource_versions import resource_versions
 
 # When other services are created:
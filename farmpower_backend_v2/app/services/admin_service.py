@@ -4,6 +4,8 @@ from typing import Dict, Any, Optional
 from ..models.user import User as UserModel
 from ..models.tractor import Tractor as TractorModel
 from ..models.part import Part as PartModel
+from .user_identity_cache import user_identity_cache
+from .resource_versions import resource_versions, USERS
 # Import other models as needed for more stats
 
 class AdminService:
@@ -15,6 +17,8 @@ class AdminService:
             db_user.is_banned = True
             db_user.is_active = False # Typically banning also deactivates
             db.add(db_user)
+            user_identity_cache.invalidate_user(db, db_user.id) # Takes effect on the user's next request
+            resource_versions.bump(db, USERS) # Listings embed owners (is_banned, is_active)
             db.commit()
             db.refresh(db_user)
         return db_user
@@ -29,6 +33,8 @@ class AdminService:
             # For now, let's assume it does not automatically re-activate; admin can do it separately if needed.
             # db_user.is_active = True
             db.add(db_user)
+            user_identity_cache.invalidate_user(db, db_user.id)
+            resource_versions.bump(db, USERS)
             db.commit()
             db.refresh(db_user)
         return db_user
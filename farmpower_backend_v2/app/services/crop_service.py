@@ -1,19 +1,24 @@
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 
+from ..core.eager_loading import loader_options
 from ..models.crop import Crop as CropModel
-from ..schemas.crop import CropCreate, CropUpdate, ProfitCalculationResult
+from ..schemas.crop import CropCreate, CropSchema, CropUpdate, ProfitCalculationResult
 
 class CropService:
     def get_crop_by_id(self, db: Session, crop_id: int) -> Optional[CropModel]:
         return db.query(CropModel).filter(CropModel.id == crop_id).first()
 
+    def _listing_query(self, db: Session):
+        # CropSchema embeds the owner and field; load them with the page
+        return db.query(CropModel).options(*loader_options(CropModel, CropSchema))
+
     def get_crops_by_user(self, db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[CropModel]:
-        return db.query(CropModel).filter(CropModel.user_id == user_id).order_by(CropModel.name).offset(skip).limit(limit).all()
+        return self._listing_query(db).filter(CropModel.user_id == user_id).order_by(CropModel.name).offset(skip).limit(limit).all()
 
     def get_crops_by_field(self, db: Session, field_id: int, skip: int = 0, limit: int = 100) -> List[CropModel]:
         # This might be useful if listing crops specifically associated with a field
-        return db.query(CropModel).filter(CropModel.field_id == field_id).order_by(CropModel.name).offset(skip).limit(limit).all()
+        return self._listing_query(db).filter(CropModel.field_id == field_id).order_by(CropModel.name).offset(skip).limit(limit).all()
 
     def create_crop(self, db: Session, crop_in: CropCreate, user_id: int) -> CropModel:
         crop_data = crop_in.model_dump()
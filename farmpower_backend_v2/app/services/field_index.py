@@ -0,0 +1,76 @@
+import threading
+import time
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.spatial_index import BBox, STRTree
+from ..models.field import Field as FieldModel
+
+
+class _Snapshot(NamedTuple):
+    tree: STRTree
+    field_ids: np.ndarray
+    owner_ids: np.ndarray
+    generation: int
+    built_at: float
+
+
+class FieldIndex:
+    """
+    Process-local STR-tree over every field's bounding box, built lazily from the
+    bbox columns. FieldService invalidates it after geometry writes; edits made by
+    other worker processes are picked up within `max_age_s`.
+    """
+
+    def __init__(self, max_age_s: float):
+        self.max_age = max_age_s
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._snapshot: Optional[_Snapshot] = None
+
+    def invalidate(self) -> None:
+        self._generation += 1
+
+    def candidate_ids(self, db: Session, boxes: List[BBox], owner_id: Optional[int] = None) -> List[int]:
+        """Ids of fields whose bounding box overlaps any of `boxes`, optionally only `owner_id`'s."""
+        snapshot = self._current(db)
+        hits = np.unique(np.concatenate([snapshot.tree.query(box) for box in boxes]))
+        if owner_id is not None:
+            hits = hits[snapshot.owner_ids[hits] == owner_id]
+        return snapshot.field_ids[hits].tolist()
+
+    def _is_fresh(self, snapshot: Optional[_Snapshot]) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.generation == self._generation
+            and time.monotonic() - snapshot.built_at < self.max_age
+        )
+
+    def _current(self, db: Session) -> _Snapshot:
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            return snapshot
+        with self._lock: # One rebuild at a time; concurrent callers reuse its result
+            snapshot = self._snapshot
+            if self._is_fresh(snapshot):
+                return snapshot
+            # Taken before reading, so a write committed mid-rebuild still forces the next one
+            generation = self._generation
+            rows = db.query(
+                FieldModel.id, FieldModel.owner_id,
+                FieldModel.min_lon, FieldModel.min_lat, FieldModel.max_lon, FieldModel.max_lat,
+            ).filter(FieldModel.min_lon.isnot(None)).all()
+            data = np.array(rows, dtype=float).reshape(-1, 6)
+            snapshot = self._snapshot = _Snapshot(
+                tree=STRTree(data[:, 2:]),
+                field_ids=data[:, 0].astype(np.int64),
+                owner_ids=data[:, 1].astype(np.int64),
+                generation=generation,
+                built_at=time.monotonic(),
+            )
+            return snapshot
+
+field_index = FieldIndex(max_age_s=settings.FIELD_INDEX_MAX_AGE_S)
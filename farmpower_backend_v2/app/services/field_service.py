@@ -1,24 +1,70 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
+from ..core.eager_loading import loader_options
+from ..core.geo_area import area_hectares
+from ..core.pagination import Page, paginate
+from ..core.projection import projection_options
+from ..core.spatial_index import BBox, geometry_bounds, geometry_intersects_bbox, point_in_geometry
 from ..models.field import Field as FieldModel
 from ..models.land_usage_plan import LandUsagePlan as LandUsagePlanModel
-from ..schemas.field import FieldCreate, FieldUpdate
+from ..schemas.field import FieldCreate, FieldSchema, FieldUpdate
 from ..schemas.land_usage_plan import LandUsagePlanCreate, LandUsagePlanUpdate
+from .field_index import field_index
+
+# Listing orders for paging; id breaks ties between equal names
+FIELD_SORT_KEY = ((FieldModel.name, False), (FieldModel.id, False))
+LAND_USAGE_PLAN_SORT_KEY = ((LandUsagePlanModel.plan_name, False), (LandUsagePlanModel.id, False))
 
 class FieldService:
     # --- Field Methods ---
     def get_field_by_id(self, db: Session, field_id: int) -> Optional[FieldModel]:
         return db.query(FieldModel).filter(FieldModel.id == field_id).first()
 
-    def get_fields_by_owner(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100) -> List[FieldModel]:
-        return db.query(FieldModel).filter(FieldModel.owner_id == owner_id).order_by(FieldModel.name).offset(skip).limit(limit).all()
+    def get_fields_by_owner(
+        self, db: Session, owner_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None # Load only these (see core.projection) instead of full FieldSchema rows
+    ) -> Page:
+        options = (
+            projection_options(FieldModel, columns, FIELD_SORT_KEY) if columns
+            else loader_options(FieldModel, FieldSchema)
+        )
+        query = db.query(FieldModel).options(*options).filter(FieldModel.owner_id == owner_id)
+        return paginate(query, FIELD_SORT_KEY, skip=skip, limit=limit, cursor=cursor)
+
+    def search_fields_in_bbox(self, db: Session, boxes: List[BBox], owner_id: int, limit: int = 100) -> List[FieldModel]:
+        """Fields of `owner_id` whose boundary intersects any of `boxes`, ordered by name."""
+        candidate_ids = field_index.candidate_ids(db, boxes, owner_id=owner_id)
+        return self._exact_matches(
+            db, candidate_ids, limit,
+            lambda field: any(geometry_intersects_bbox(field.coordinates, box) for box in boxes),
+        )
+
+    def locate_fields(self, db: Session, lon: float, lat: float, owner_id: int) -> List[FieldModel]:
+        """Fields of `owner_id` whose boundary contains the point, ordered by name."""
+        candidate_ids = field_index.candidate_ids(db, [(lon, lat, lon, lat)], owner_id=owner_id)
+        return self._exact_matches(db, candidate_ids, None, lambda field: point_in_geometry(field.coordinates, lon, lat))
+
+    def _exact_matches(self, db: Session, candidate_ids: List[int], limit: Optional[int], predicate) -> List[FieldModel]:
+        # The index only compares bounding boxes; the polygons decide
+        if not candidate_ids:
+            return []
+        query = db.query(FieldModel).options(*loader_options(FieldModel, FieldSchema)).filter(FieldModel.id.in_(candidate_ids)).order_by(FieldModel.name, FieldModel.id)
+        matches = []
+        for field in query.yield_per(500):
+            if predicate(field):
+                matches.append(field)
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
 
     def create_field(self, db: Session, field_in: FieldCreate, owner_id: int) -> FieldModel:
         field_data = field_in.model_dump()
         db_field = FieldModel(**field_data, owner_id=owner_id)
+        self._set_derived_geometry(db_field, area_given=True)
         db.add(db_field)
         db.commit()
+        field_index.invalidate()
         db.refresh(db_field)
         return db_field
 
@@ -26,24 +72,43 @@ class FieldService:
         update_data = field_in.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_field, key, value)
+        if "coordinates" in update_data:
+            self._set_derived_geometry(db_field, area_given="area_hectares" in update_data)
         db.add(db_field) # Mark as dirty
         db.commit()
+        if "coordinates" in update_data:
+            field_index.invalidate()
         db.refresh(db_field)
         return db_field
 
+    def _set_derived_geometry(self, db_field: FieldModel, area_given: bool) -> None:
+        # Boundary-derived area wins over a hand-entered one. When the geometry isn't a
+        # GeoJSON (Multi)Polygon we can measure, keep an area entered with it (`area_given`)
+        # and otherwise clear the one measured from the previous boundary
+        area = area_hectares(db_field.coordinates)
+        if area:
+            db_field.area_hectares = area
+        elif not area_given:
+            db_field.area_hectares = None
+        db_field.min_lon, db_field.min_lat, db_field.max_lon, db_field.max_lat = (
+            geometry_bounds(db_field.coordinates) or (None, None, None, None)
+        )
+
     def delete_field(self, db: Session, field_id: int) -> Optional[FieldModel]:
         db_field = self.get_field_by_id(db, field_id)
         if db_field:
             db.delete(db_field)
             db.commit()
+            field_index.invalidate()
         return db_field # Returns deleted object or None
 
     # --- LandUsagePlan Methods ---
     def get_plan_by_id(self, db: Session, plan_id: int) -> Optional[LandUsagePlanModel]:
         return db.query(LandUsagePlanModel).filter(LandUsagePlanModel.id == plan_id).first()
 
-    def get_plans_for_field(self, db: Session, field_id: int, skip: int = 0, limit: int = 100) -> List[LandUsagePlanModel]:
-        return db.query(LandUsagePlanModel).filter(LandUsagePlanModel.field_id == field_id).order_by(LandUsagePlanModel.plan_name).offset(skip).limit(limit).all()
+    def get_plans_for_field(self, db: Session, field_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Page:
+        query = db.query(LandUsagePlanModel).filter(LandUsagePlanModel.field_id == field_id)
+        return paginate(query, LAND_USAGE_PLAN_SORT_KEY, skip=skip, limit=limit, cursor=cursor)
 
     def create_land_usage_plan(self, db: Session, plan_in: LandUsagePlanCreate, field_id: int) -> LandUsagePlanModel:
         plan_data = plan_in.model_dump()
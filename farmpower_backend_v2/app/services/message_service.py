@@ -1,13 +1,24 @@
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func, desc
-from typing import List, Optional
+from sqlalchemy import or_, case, desc, select
+from typing import TYPE_CHECKING, List, Optional
 
-from ..models.message import Message as MessageModel, generate_conversation_id
+from ..core.eager_loading import loader_options
+from ..core.pagination import Page, paginate, paginate_async
+from ..core.realtime import realtime
+from ..models.message import Message as MessageModel, ConversationSummary as ConversationSummaryModel, generate_conversation_id
 from ..models.user import User as UserModel
-from ..schemas.message import MessageCreate, ConversationSchema
+from ..schemas.message import MessageCreate, MessageSchema, ConversationSchema
 from ..services.notification_service import notification_service # For creating notifications
 from ..schemas.notification import NotificationCreateInternal, NotificationType # For creating notifications
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Thread order for paging: oldest first, id breaks ties between equal timestamps
+MESSAGE_SORT_KEY = ((MessageModel.created_at, False), (MessageModel.id, False))
+
 class MessageService:
     def create_message(self, db: Session, message_in: MessageCreate, sender_id: int) -> MessageModel:
         if sender_id == message_in.recipient_id:
@@ -23,6 +34,12 @@ class MessageService:
             content=message_in.content
         )
         db.add(db_message)
+        db.flush() # Assigns id and created_at for the summaries
+        self._record_message_in_summaries(db, db_message)
+        # Pushed to both participants' open sockets (sender's other devices too) once committed
+        payload = MessageSchema.model_validate(db_message).model_dump(mode="json")
+        for user_id in (db_message.recipient_id, sender_id):
+            realtime.emit_to_user_after_commit(db, user_id, "new_message", payload)
         db.commit()
         db.refresh(db_message)
 
@@ -39,104 +56,62 @@ class MessageService:
                 related_entity_id=db_message.id # Or use conversation_id if linking to the whole convo
             )
             notification_service.create_notification(db=db, notification_in=notification_content)
-            # TODO: Here you might also trigger a real-time event via WebSockets to the recipient if they are online.
-            # from ..core.socket_manager import sio
-            # await sio.emit('new_message', {'conversation_id': conversation_id, 'message': MessageSchema.from_orm(db_message).model_dump()}, room=f'user_{recipient.id}')
-
 
         return db_message
 
     def get_messages_for_conversation(
-        self, db: Session, conversation_id: str, user_id: int, skip: int = 0, limit: int = 50
-    ) -> List[MessageModel]:
+        self, db: Session, conversation_id: str, user_id: int, skip: int = 0, limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Page:
         # Ensure the user_id is part of the conversation to authorize access
         # This check is more robust if done in the router based on current_user
-        messages = (
+        query = (
             db.query(MessageModel)
+            .options(*loader_options(MessageModel, MessageSchema))
             .filter(MessageModel.conversation_id == conversation_id)
             .filter(or_(MessageModel.sender_id == user_id, MessageModel.recipient_id == user_id))
-            .order_by(MessageModel.created_at.asc()) # Typically oldest first in a thread
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
-        return messages
+        return paginate(query, MESSAGE_SORT_KEY, skip=skip, limit=limit, cursor=cursor) # Typically oldest first in a thread
 
     def get_conversations_for_user(self, db: Session, user_id: int) -> List[ConversationSchema]:
         """
-        Retrieves a list of conversations for a user, showing the other participant
-        and the last message.
-        This is a more complex query.
+        Retrieves a list of conversations for a user, showing the other participant,
+        the last message and the unread count, most recent first.
+        Reads the maintained conversation_summaries rows: one indexed query.
         """
-        # Subquery to get the latest message_id for each conversation_id involving the user
-        latest_message_subquery = (
-            db.query(
-                MessageModel.conversation_id,
-                func.max(MessageModel.created_at).label("last_message_time")
-            )
-            .filter(or_(MessageModel.sender_id == user_id, MessageModel.recipient_id == user_id))
-            .group_by(MessageModel.conversation_id)
-            .subquery("latest_messages_sq")
-        )
-
-        # Main query to get the last message and the other user for each conversation
-        conversations_data = (
-            db.query(
-                MessageModel,
-                UserModel.id.label("other_user_id"),
-                UserModel.full_name.label("other_user_full_name"),
-                UserModel.email.label("other_user_email")
-            )
-            .join(
-                latest_message_subquery,
-                and_(
-                    MessageModel.conversation_id == latest_message_subquery.c.conversation_id,
-                    MessageModel.created_at == latest_message_subquery.c.last_message_time
-                )
-            )
-            .join(
-                UserModel,
-                # Join UserModel on the condition that it's the other participant in the conversation
-                or_(
-                    and_(MessageModel.sender_id == UserModel.id, MessageModel.recipient_id == user_id),
-                    and_(MessageModel.recipient_id == UserModel.id, MessageModel.sender_id == user_id)
-                )
-            )
-            .order_by(desc(MessageModel.created_at)) # Show most recent conversations first
+        summaries = (
+            db.query(ConversationSummaryModel)
+            .options(*loader_options(ConversationSummaryModel, ConversationSchema))
+            .filter(ConversationSummaryModel.user_id == user_id)
+            .order_by(desc(ConversationSummaryModel.last_message_at), desc(ConversationSummaryModel.id))
             .all()
         )
+        return [ConversationSchema.model_validate(summary) for summary in summaries]
 
-        # Process results into ConversationSchema
-        # Also count unread messages per conversation
-        result_schemas = []
-        for last_message, other_user_id, other_user_full_name, other_user_email in conversations_data:
-            unread_count = db.query(func.count(MessageModel.id)).filter(
-                MessageModel.conversation_id == last_message.conversation_id,
-                MessageModel.recipient_id == user_id,
-                MessageModel.is_read_by_recipient == False
-            ).scalar() or 0
-
-            result_schemas.append(
-                ConversationSchema(
-                    conversation_id=last_message.conversation_id,
-                    other_user={ # Constructing UserSchema manually or use UserSchema.from_orm if UserModel instance is fetched
-                        "id": other_user_id,
-                        "full_name": other_user_full_name,
-                        "email": other_user_email,
-                        # These fields are required by UserSchema but might not be relevant/fetched for "other_user" summary
-                        "role": UserModel.role.default.value, # Placeholder, ideally fetch actual role or adjust UserSchema
-                        "is_active": True, # Placeholder
-                        "is_verified": True, # Placeholder
-                        "created_at": datetime.min, # Placeholder
-                        "updated_at": datetime.min # Placeholder
-                    },
-                    last_message_content=last_message.content,
-                    last_message_at=last_message.created_at,
-                    unread_count=unread_count
-                )
-            )
-        return result_schemas
+    # --- Async read paths (AsyncSession from get_async_db) ---
+    # Relationships the schemas embed are loaded up front: async sessions can't lazy-load.
 
+    async def get_messages_for_conversation_async(
+        self, db: "AsyncSession", conversation_id: str, user_id: int, skip: int = 0, limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Page:
+        stmt = (
+            select(MessageModel)
+            .options(*loader_options(MessageModel, MessageSchema))
+            .where(MessageModel.conversation_id == conversation_id)
+            .where(or_(MessageModel.sender_id == user_id, MessageModel.recipient_id == user_id))
+        )
+        return await paginate_async(db, stmt, MESSAGE_SORT_KEY, skip=skip, limit=limit, cursor=cursor)
+
+    async def get_conversations_for_user_async(self, db: "AsyncSession", user_id: int) -> List[ConversationSchema]:
+        stmt = (
+            select(ConversationSummaryModel)
+            .options(*loader_options(ConversationSummaryModel, ConversationSchema))
+            .where(ConversationSummaryModel.user_id == user_id)
+            .order_by(desc(ConversationSummaryModel.last_message_at), desc(ConversationSummaryModel.id))
+        )
+        summaries = (await db.execute(stmt)).scalars().all()
+        return [ConversationSchema.model_validate(summary) for summary in summaries]
 
     def mark_messages_as_read(self, db: Session, conversation_id: str, recipient_id: int) -> int:
         """Marks all messages in a conversation as read for the recipient. Returns count of updated messages."""
@@ -149,7 +124,56 @@ class MessageService:
             )
             .update({"is_read_by_recipient": True}, synchronize_session=False)
         )
+        if updated_count:
+            # Decrement rather than reset so a message arriving concurrently stays counted
+            unread = ConversationSummaryModel.unread_count
+            db.query(ConversationSummaryModel).filter(
+                ConversationSummaryModel.conversation_id == conversation_id,
+                ConversationSummaryModel.user_id == recipient_id,
+            ).update(
+                {unread: case((unread > updated_count, unread - updated_count), else_=0)},
+                synchronize_session=False
+            )
         db.commit()
         return updated_count
 
+    # --- Conversation summary maintenance (runs inside the caller's transaction) ---
+
+    def _record_message_in_summaries(self, db: Session, message: MessageModel) -> None:
+        """Point both participants' summaries at `message` and bump the recipient's unread count."""
+        self._upsert_summary(db, message, user_id=message.sender_id, other_user_id=message.recipient_id, unread_increment=0)
+        self._upsert_summary(db, message, user_id=message.recipient_id, other_user_id=message.sender_id, unread_increment=1)
+
+    def _upsert_summary(
+        self, db: Session, message: MessageModel, user_id: int, other_user_id: int, unread_increment: int
+    ) -> None:
+        def update_existing() -> int:
+            return db.query(ConversationSummaryModel).filter(
+                ConversationSummaryModel.conversation_id == message.conversation_id,
+                ConversationSummaryModel.user_id == user_id,
+            ).update({
+                ConversationSummaryModel.last_message_id: message.id,
+                ConversationSummaryModel.last_message_content: message.content,
+                ConversationSummaryModel.last_message_at: message.created_at,
+                # Increment in SQL so concurrent senders don't lose updates
+                ConversationSummaryModel.unread_count: ConversationSummaryModel.unread_count + unread_increment,
+                ConversationSummaryModel.updated_at: datetime.utcnow(),
+            }, synchronize_session=False)
+
+        if update_existing():
+            return
+        try:
+            with db.begin_nested(): # Savepoint: a concurrent first message may insert the row first
+                db.add(ConversationSummaryModel(
+                    conversation_id=message.conversation_id,
+                    user_id=user_id,
+                    other_user_id=other_user_id,
+                    last_message_id=message.id,
+                    last_message_content=message.content,
+                    last_message_at=message.created_at,
+                    unread_count=unread_increment,
+                ))
+        except IntegrityError:
+            update_existing()
+
 message_service = MessageService()
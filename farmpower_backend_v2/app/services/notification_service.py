@@ -1,8 +1,17 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import select
+from typing import TYPE_CHECKING, List, Optional
 
+from ..core.pagination import Page, paginate, paginate_async
+from ..core.realtime import realtime
 from ..models.notification import Notification as NotificationModel, NotificationType
-from ..schemas.notification import NotificationCreateInternal # For creating notifications
+from ..schemas.notification import NotificationCreateInternal, NotificationSchema # For creating notifications
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Listing order for paging: newest first, id breaks ties between equal timestamps
+NOTIFICATION_SORT_KEY = ((NotificationModel.created_at, True), (NotificationModel.id, True))
 
 class NotificationService:
     def get_notification_by_id(self, db: Session, notification_id: int) -> Optional[NotificationModel]:
@@ -14,12 +23,28 @@ class NotificationService:
         user_id: int,
         skip: int = 0,
         limit: int = 20, # Default to 20 notifications per page
-        unread_only: Optional[bool] = False
-    ) -> List[NotificationModel]:
+        unread_only: Optional[bool] = False,
+        cursor: Optional[str] = None
+    ) -> Page:
         query = db.query(NotificationModel).filter(NotificationModel.user_id == user_id)
         if unread_only:
             query = query.filter(NotificationModel.is_read == False)
-        return query.order_by(NotificationModel.created_at.desc()).offset(skip).limit(limit).all()
+        return paginate(query, NOTIFICATION_SORT_KEY, skip=skip, limit=limit, cursor=cursor)
+
+    async def get_notifications_for_user_async(
+        self,
+        db: "AsyncSession",
+        user_id: int,
+        skip: int = 0,
+        limit: int = 20,
+        unread_only: Optional[bool] = False,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """Async variant of `get_notifications_for_user`, for routes using get_async_db."""
+        stmt = select(NotificationModel).where(NotificationModel.user_id == user_id)
+        if unread_only:
+            stmt = stmt.where(NotificationModel.is_read == False)
+        return await paginate_async(db, stmt, NOTIFICATION_SORT_KEY, skip=skip, limit=limit, cursor=cursor)
 
     def create_notification(self, db: Session, notification_in: NotificationCreateInternal) -> NotificationModel:
         """
@@ -36,10 +61,14 @@ class NotificationService:
             # is_read defaults to False in the model
         )
         db.add(db_notification)
+        db.flush() # Assigns id and defaults for the push payload
+        # Pushed to the user's open sockets once the insert commits
+        realtime.emit_to_user_after_commit(
+            db, db_notification.user_id, "new_notification",
+            NotificationSchema.model_validate(db_notification).model_dump(mode="json")
+        )
         db.commit()
         db.refresh(db_notification)
-        # TODO: Here you might trigger a real-time push notification (e.g., via WebSockets or Firebase)
-        # await sio.emit('new_notification', {'notification_id': db_notification.id, 'title': db_notification.title}, room=f'user_{db_notification.user_id}')
         return db_notification
 
     def mark_notification_as_read(self, db: Session, notification_id: int, user_id: int) -> Optional[NotificationModel]:
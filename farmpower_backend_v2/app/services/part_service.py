@@ -1,30 +1,36 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func # For JSON array contains-like operations if needed
-from typing import List, Optional
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import or_, func, select # For JSON array contains-like operations if needed
+from typing import TYPE_CHECKING, List, Optional, Sequence
 
+from ..core.db_routing import replica_read
+from ..core.pagination import Page, paginate, paginate_async
+from ..core.projection import projection_options
 from ..models.part import Part as PartModel
 from ..schemas.part import PartCreate, PartUpdate, PartSchema
 from ..schemas.user import UserSchema
+from .resource_versions import resource_versions, PARTS
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Listing order for paging: newest first, id breaks ties between equal timestamps
+PART_SORT_KEY = ((PartModel.created_at, True), (PartModel.id, True))
 
 class PartService:
     def get_part_by_id(self, db: Session, part_id: int) -> Optional[PartModel]:
         return db.query(PartModel).filter(PartModel.id == part_id).first()
 
-    def get_parts(
+    def _apply_filters(
         self,
-        db: Session,
-        skip: int = 0,
-        limit: int = 100,
+        query: Query,
         category: Optional[str] = None,
-        tractor_brand: Optional[str] = None, # Filter by a single brand compatibility
+        tractor_brand: Optional[str] = None,
         condition: Optional[str] = None,
         min_price: Optional[float] = None,
         max_price: Optional[float] = None,
         location: Optional[str] = None,
         seller_id: Optional[int] = None
-    ) -> List[PartModel]:
-        query = db.query(PartModel)
-
+    ) -> Query:
         if category:
             query = query.filter(PartModel.category.ilike(f"%{category}%"))
         if tractor_brand:
@@ -44,11 +50,62 @@ class PartService:
         if seller_id:
             query = query.filter(PartModel.seller_id == seller_id)
 
-        return query.order_by(PartModel.created_at.desc()).offset(skip).limit(limit).all()
+        return query
+
+    @replica_read
+    def get_parts(
+        self,
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        category: Optional[str] = None,
+        tractor_brand: Optional[str] = None, # Filter by a single brand compatibility
+        condition: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        location: Optional[str] = None,
+        seller_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None # Load only these (see core.projection) instead of whole rows
+    ) -> Page:
+        query = db.query(PartModel)
+        if columns:
+            query = query.options(*projection_options(PartModel, columns, PART_SORT_KEY))
+        query = self._apply_filters(
+            query, category=category, tractor_brand=tractor_brand, condition=condition,
+            min_price=min_price, max_price=max_price, location=location, seller_id=seller_id
+        )
+        return paginate(query, PART_SORT_KEY, skip=skip, limit=limit, cursor=cursor)
+
+    # --- Async read paths (AsyncSession from get_async_db) ---
+
+    async def get_part_by_id_async(self, db: "AsyncSession", part_id: int) -> Optional[PartModel]:
+        return await db.get(PartModel, part_id)
+
+    async def get_parts_async(
+        self,
+        db: "AsyncSession",
+        skip: int = 0,
+        limit: int = 100,
+        category: Optional[str] = None,
+        tractor_brand: Optional[str] = None,
+        condition: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        location: Optional[str] = None,
+        seller_id: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Page:
+        stmt = self._apply_filters(
+            select(PartModel), category=category, tractor_brand=tractor_brand, condition=condition,
+            min_price=min_price, max_price=max_price, location=location, seller_id=seller_id
+        )
+        return await paginate_async(db, stmt, PART_SORT_KEY, skip=skip, limit=limit, cursor=cursor)
 
     def create_part(self, db: Session, part_in: PartCreate, seller_id: int) -> PartModel:
         db_part = PartModel(**part_in.model_dump(), seller_id=seller_id)
         db.add(db_part)
+        resource_versions.bump(db, PARTS)
         db.commit()
         db.refresh(db_part)
         return db_part
@@ -58,6 +115,7 @@ class PartService:
         for key, value in update_data.items():
             setattr(db_part, key, value)
         db.add(db_part)
+        resource_versions.bump(db, PARTS)
         db.commit()
         db.refresh(db_part)
         return db_part
@@ -66,6 +124,7 @@ class PartService:
         db_part = self.get_part_by_id(db, part_id)
         if db_part:
             db.delete(db_part)
+            resource_versions.bump(db, PARTS)
             db.commit()
         return db_part
 
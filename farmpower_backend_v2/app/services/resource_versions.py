@@ -0,0 +1,64 @@
+import logging
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from ..core.db_routing import replica_read
+from ..models.resource_version import ResourceVersion
+
+logger = logging.getLogger(__name__)
+
+# Resource types with a version counter (models/resource_version.py seeds one row each);
+# a listing's ETag covers the types its rows embed
+TRACTORS = "tractors"
+PARTS = "parts"
+USERS = "users"
+
+
+def _version_column(resource: str):
+    # 0 if the type's row is missing
+    subquery = select(ResourceVersion.version).where(ResourceVersion.resource == resource).scalar_subquery()
+    return func.coalesce(subquery, 0)
+
+
+class ResourceVersions:
+    """
+    Version counters per resource type, kept in the database so every worker sees
+    the same value. Services call `bump` for each type a write changes, before
+    committing: the increment commits (or rolls back) with the write itself.
+
+    The reads are `@replica_read`, so they come from the same snapshot source as
+    the listing they validate and an ETag is never newer than the body it tags.
+    """
+
+    def bump(self, db: Session, *resources: str) -> None:
+        result = db.execute(
+            update(ResourceVersion).where(ResourceVersion.resource.in_(resources))
+            .values(version=ResourceVersion.version + 1)
+        )
+        if result.rowcount != len(set(resources)):
+            logger.warning(f"resource_versions rows missing for some of {resources}; run the migrations")
+
+    @replica_read
+    def current(self, db: Session, resources: Sequence[str]) -> Tuple[int, ...]:
+        """The current version of each of `resources`, in one query."""
+        return tuple(db.execute(select(*[_version_column(r) for r in resources])).one())
+
+    @replica_read
+    def row_version(
+        self, db: Session, model: type, row_id: int, resources: Sequence[str] = ()
+    ) -> Optional[Tuple[Optional[datetime], Tuple[int, ...]]]:
+        """
+        `model` row `row_id`'s `updated_at` plus the versions of `resources` (the
+        types it embeds), in one query; None if the row doesn't exist.
+        """
+        row = db.execute(
+            select(model.updated_at, *[_version_column(r) for r in resources]).where(model.id == row_id)
+        ).first()
+        if row is None:
+            return None
+        return row[0], tuple(row[1:])
+
+resource_versions = ResourceVersions()
@@ -1,29 +1,41 @@
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
+from ..core.eager_loading import loader_options
+from ..core.pagination import Page, paginate
 from ..models.service_booking import ServiceBooking as ServiceBookingModel, ServiceStatus
 from ..models.user import UserRole # For role checks if needed
-from ..schemas.service_booking import ServiceBookingCreate, ServiceBookingUpdate
+from ..schemas.service_booking import ServiceBookingCreate, ServiceBookingSchema, ServiceBookingUpdate
+
+# Listing order for paging: latest scheduled first, id breaks ties between equal dates
+BOOKING_SORT_KEY = ((ServiceBookingModel.scheduled_date, True), (ServiceBookingModel.id, True))
 
 class ServiceBookingService:
+    def _listing_query(self, db: Session):
+        # ServiceBookingSchema embeds the customer, tractor and service provider; load them with the page
+        return db.query(ServiceBookingModel).options(*loader_options(ServiceBookingModel, ServiceBookingSchema))
+
     def get_booking_by_id(self, db: Session, booking_id: int) -> Optional[ServiceBookingModel]:
         return db.query(ServiceBookingModel).filter(ServiceBookingModel.id == booking_id).first()
 
-    def get_bookings_by_user(self, db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[ServiceBookingModel]:
+    def get_bookings_by_user(self, db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Page:
         """Get bookings made by a specific user (customer)."""
-        return db.query(ServiceBookingModel).filter(ServiceBookingModel.user_id == user_id).order_by(ServiceBookingModel.scheduled_date.desc()).offset(skip).limit(limit).all()
+        query = self._listing_query(db).filter(ServiceBookingModel.user_id == user_id)
+        return paginate(query, BOOKING_SORT_KEY, skip=skip, limit=limit, cursor=cursor)
 
-    def get_bookings_by_provider(self, db: Session, provider_id: int, skip: int = 0, limit: int = 100) -> List[ServiceBookingModel]:
+    def get_bookings_by_provider(self, db: Session, provider_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Page:
         """Get bookings assigned to a specific service provider."""
-        return db.query(ServiceBookingModel).filter(ServiceBookingModel.service_provider_id == provider_id).order_by(ServiceBookingModel.scheduled_date.desc()).offset(skip).limit(limit).all()
+        query = self._listing_query(db).filter(ServiceBookingModel.service_provider_id == provider_id)
+        return paginate(query, BOOKING_SORT_KEY, skip=skip, limit=limit, cursor=cursor)
 
-    def get_bookings_by_tractor(self, db: Session, tractor_id: int, skip: int = 0, limit: int = 100) -> List[ServiceBookingModel]:
+    def get_bookings_by_tractor(self, db: Session, tractor_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Page:
         """Get bookings associated with a specific tractor."""
-        return db.query(ServiceBookingModel).filter(ServiceBookingModel.tractor_id == tractor_id).order_by(ServiceBookingModel.scheduled_date.desc()).offset(skip).limit(limit).all()
+        query = self._listing_query(db).filter(ServiceBookingModel.tractor_id == tractor_id)
+        return paginate(query, BOOKING_SORT_KEY, skip=skip, limit=limit, cursor=cursor)
 
-    def get_all_bookings(self, db: Session, skip: int = 0, limit: int = 100) -> List[ServiceBookingModel]:
+    def get_all_bookings(self, db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Page:
         """Get all bookings (typically for admin use)."""
-        return db.query(ServiceBookingModel).order_by(ServiceBookingModel.scheduled_date.desc()).offset(skip).limit(limit).all()
+        return paginate(self._listing_query(db), BOOKING_SORT_KEY, skip=skip, limit=limit, cursor=cursor)
 
     def create_booking(self, db: Session, booking_in: ServiceBookingCreate, user_id: int) -> ServiceBookingModel:
         booking_data = booking_in.model_dump()
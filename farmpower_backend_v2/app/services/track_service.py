@@ -0,0 +1,101 @@
+from datetime import datetime
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.db import SessionLocal
+from ..core.track_store import COORD_SCALE, TrackSegmentData, TrackStore, decode_track, from_epoch_ms, to_epoch_ms
+from ..models.field import Field as FieldModel
+from ..models.gps_track import GpsTrackSegment as GpsTrackSegmentModel
+
+# Segments decoded per database round-trip while replaying
+REPLAY_BATCH_SIZE = 50
+
+
+class TrackPoint(NamedTuple):
+    device_id: str
+    timestamp: datetime
+    latitude: float
+    longitude: float
+
+
+class TrackService:
+    def save_segments(self, db: Session, segments: List[TrackSegmentData]) -> int:
+        """Persist sealed segments. Segments for fields that don't exist are discarded."""
+        field_ids = {segment.field_id for segment in segments}
+        existing = {row_id for (row_id,) in db.query(FieldModel.id).filter(FieldModel.id.in_(field_ids))}
+        rows = [
+            GpsTrackSegmentModel(**segment._asdict())
+            for segment in segments if segment.field_id in existing
+        ]
+        db.add_all(rows)
+        db.commit()
+        return len(rows)
+
+    def iter_track_points(
+        self,
+        db: Session,
+        field_id: int,
+        start: datetime,
+        end: datetime,
+        device_id: Optional[str] = None,
+        max_points: int = 2000,
+        pending: Iterable[Tuple[str, int, int, int]] = (),
+    ) -> Iterator[TrackPoint]:
+        """
+        Yield a field's recorded fixes between `start` and `end`, downsampled for display.
+        The window is split into `max_points` time buckets and each device keeps its first
+        fix per bucket. Segments are decoded one at a time, so memory use doesn't depend
+        on track length. `pending` adds fixes not yet flushed to the database.
+        """
+        start_ms, end_ms = to_epoch_ms(start), to_epoch_ms(end)
+        bucket_ms = max(1, (end_ms - start_ms) // max_points)
+        last_bucket = {}
+
+        def sample(device: str, t: int, lat: int, lon: int) -> Optional[TrackPoint]:
+            if not start_ms <= t <= end_ms:
+                return None
+            bucket = (t - start_ms) // bucket_ms
+            if last_bucket.get(device) == bucket:
+                return None
+            last_bucket[device] = bucket
+            return TrackPoint(device, from_epoch_ms(t), lat / COORD_SCALE, lon / COORD_SCALE)
+
+        query = db.query(GpsTrackSegmentModel).filter(
+            GpsTrackSegmentModel.field_id == field_id,
+            GpsTrackSegmentModel.start_time <= from_epoch_ms(end_ms),
+            GpsTrackSegmentModel.end_time >= from_epoch_ms(start_ms),
+        )
+        if device_id:
+            query = query.filter(GpsTrackSegmentModel.device_id == device_id)
+        query = query.order_by(GpsTrackSegmentModel.start_time, GpsTrackSegmentModel.id)
+
+        for segment in query.yield_per(REPLAY_BATCH_SIZE):
+            times, lats, lons = decode_track(segment.data)
+            for t, lat, lon in zip(times, lats, lons):
+                point = sample(segment.device_id, t, lat, lon)
+                if point:
+                    yield point
+        for device, t, lat, lon in pending:
+            point = sample(device, t, lat, lon)
+            if point:
+                yield point
+
+track_service = TrackService()
+
+
+def _save_segments_in_new_session(segments: List[TrackSegmentData]) -> None:
+    # Called from the flush worker thread, outside any request
+    db = SessionLocal()
+    try:
+        track_service.save_segments(db, segments)
+    finally:
+        db.close()
+
+# Live fixes from the update_location socket event, buffered until flushed
+track_store = TrackStore(
+    save=_save_segments_in_new_session,
+    flush_interval_s=settings.GPS_TRACK_FLUSH_INTERVAL_S,
+    segment_max_points=settings.GPS_TRACK_SEGMENT_MAX_POINTS,
+)
@@ -1,27 +1,52 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import threading
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import func, literal, literal_column, or_, select
+from typing import TYPE_CHECKING, List, Optional, Sequence
 
-from ..models.tractor import Tractor as TractorModel
-from ..schemas.tractor import TractorCreate, TractorUpdate
+from ..core.db_routing import replica_read
+from ..core.eager_loading import loader_options
+from ..core.pagination import Page, paginate, paginate_async
+from ..core.projection import projection_options
+from ..core.search import InvertedIndex
+from ..models.tractor import Tractor as TractorModel, TRACTOR_SEARCH_DOCUMENT_SQL
+from ..schemas.tractor import TractorCreate, TractorSchema, TractorUpdate
+from .resource_versions import resource_versions, TRACTORS
 # Assuming User model is not directly manipulated here beyond owner_id
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Relative weight of a query match in each column when ranking search results
+TRACTOR_SEARCH_FIELDS = {
+    "name": 3.0,
+    "brand": 2.0,
+    "model": 2.0,
+    "location": 1.0,
+    "description": 0.5,
+}
+
+# Listing order for paging: newest first, id breaks ties between equal timestamps
+TRACTOR_SORT_KEY = ((TractorModel.created_at, True), (TractorModel.id, True))
+
 class TractorService:
+    def __init__(self):
+        # Fallback search index for databases without native text search (SQLite)
+        self._search_index = InvertedIndex(TRACTOR_SEARCH_FIELDS)
+        self._search_index_signature = None
+        self._search_index_lock = threading.Lock()
+
     def get_tractor_by_id(self, db: Session, tractor_id: int) -> Optional[TractorModel]:
         return db.query(TractorModel).filter(TractorModel.id == tractor_id).first()
 
-    def get_tractors(
+    def _apply_filters(
         self,
-        db: Session,
-        skip: int = 0,
-        limit: int = 100,
+        query: Query,
         brand: Optional[str] = None,
         location: Optional[str] = None,
         min_price: Optional[float] = None,
         max_price: Optional[float] = None,
-        owner_id: Optional[int] = None # Optional filter by owner
-    ) -> List[TractorModel]:
-        query = db.query(TractorModel)
-
+        owner_id: Optional[int] = None
+    ) -> Query:
         if brand:
             query = query.filter(TractorModel.brand.ilike(f"%{brand}%"))
         if location:
@@ -32,30 +57,194 @@ class TractorService:
             query = query.filter(TractorModel.price <= max_price)
         if owner_id:
             query = query.filter(TractorModel.owner_id == owner_id)
+        return query
+
+    @replica_read
+    def get_tractors(
+        self,
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        brand: Optional[str] = None,
+        location: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        owner_id: Optional[int] = None, # Optional filter by owner
+        cursor: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None # Load only these (see core.projection) instead of full TractorSchema rows
+    ) -> Page:
+        options = (
+            projection_options(TractorModel, columns, TRACTOR_SORT_KEY) if columns
+            else loader_options(TractorModel, TractorSchema)
+        )
+        query = self._apply_filters(
+            db.query(TractorModel).options(*options), brand=brand, location=location,
+            min_price=min_price, max_price=max_price, owner_id=owner_id
+        )
+        return paginate(query, TRACTOR_SORT_KEY, skip=skip, limit=limit, cursor=cursor)
+
+    # --- Async read paths (AsyncSession from get_async_db) ---
+    # TractorSchema embeds the owner, so it is loaded up front: async sessions can't lazy-load.
+
+    async def get_tractor_by_id_async(self, db: "AsyncSession", tractor_id: int) -> Optional[TractorModel]:
+        stmt = select(TractorModel).options(*loader_options(TractorModel, TractorSchema)).where(TractorModel.id == tractor_id)
+        return (await db.execute(stmt)).scalars().first()
+
+    async def get_tractors_async(
+        self,
+        db: "AsyncSession",
+        skip: int = 0,
+        limit: int = 100,
+        brand: Optional[str] = None,
+        location: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        owner_id: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Page:
+        stmt = self._apply_filters(
+            select(TractorModel).options(*loader_options(TractorModel, TractorSchema)), brand=brand, location=location,
+            min_price=min_price, max_price=max_price, owner_id=owner_id
+        )
+        return await paginate_async(db, stmt, TRACTOR_SORT_KEY, skip=skip, limit=limit, cursor=cursor)
+
+    @replica_read
+    def search_tractors(
+        self,
+        db: Session,
+        q: str,
+        skip: int = 0,
+        limit: int = 100,
+        brand: Optional[str] = None,
+        location: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        owner_id: Optional[int] = None
+    ) -> List[TractorModel]:
+        """
+        Ranked full-text search over name, brand, model, location and description.
+        Uses the tsvector/pg_trgm indexes on Postgres and the in-process inverted
+        index on other databases. The usual filters narrow the matches.
+        """
+        query = self._apply_filters(
+            db.query(TractorModel), brand=brand, location=location,
+            min_price=min_price, max_price=max_price, owner_id=owner_id
+        )
+
+        if db.get_bind().dialect.name == "postgresql":
+            # Parenthesised: `<%` and `||` share precedence in Postgres
+            document = literal_column(f"({TRACTOR_SEARCH_DOCUMENT_SQL})")
+            config = literal_column("'simple'::regconfig")
+            vector = func.to_tsvector(config, document)
+            ts_query = func.websearch_to_tsquery(config, q)
+            # Full-text match, or fuzzy word match for typos and partial words
+            query = query.filter(or_(vector.op("@@")(ts_query), literal(q).op("<%")(document)))
+            rank = func.ts_rank_cd(vector, ts_query) + func.word_similarity(q, document)
+            query = query.options(*loader_options(TractorModel, TractorSchema))
+            return query.order_by(rank.desc(), TractorModel.id.desc()).offset(skip).limit(limit).all()
+
+        self._ensure_search_index(db)
+        ranked = self._search_index.search(q)
+        if not ranked:
+            return []
 
-        return query.offset(skip).limit(limit).all()
+        ranked_ids = [doc_id for doc_id, _ in ranked]
+        matching_ids = {
+            row_id for (row_id,) in query.filter(TractorModel.id.in_(ranked_ids)).with_entities(TractorModel.id)
+        }
+        page_ids = [doc_id for doc_id in ranked_ids if doc_id in matching_ids][skip:skip + limit]
+        if not page_ids:
+            return []
+        rows = {t.id: t for t in db.query(TractorModel).options(*loader_options(TractorModel, TractorSchema)).filter(TractorModel.id.in_(page_ids))}
+        return [rows[doc_id] for doc_id in page_ids if doc_id in rows]
 
     def create_tractor(self, db: Session, tractor_in: TractorCreate, owner_id: int) -> TractorModel:
         db_tractor = TractorModel(**tractor_in.model_dump(), owner_id=owner_id)
+        indexed = self._indexed_signature(db)
         db.add(db_tractor)
+        resource_versions.bump(db, TRACTORS)
+        written = self._written_signature(db, indexed)
         db.commit()
         db.refresh(db_tractor)
+        self._index_tractor(db_tractor, indexed, written)
         return db_tractor
 
     def update_tractor(self, db: Session, db_tractor: TractorModel, tractor_in: TractorUpdate) -> TractorModel:
         update_data = tractor_in.model_dump(exclude_unset=True)
+        indexed = self._indexed_signature(db)
         for key, value in update_data.items():
             setattr(db_tractor, key, value)
         db.add(db_tractor)
+        resource_versions.bump(db, TRACTORS)
+        written = self._written_signature(db, indexed)
         db.commit()
         db.refresh(db_tractor)
+        self._index_tractor(db_tractor, indexed, written)
         return db_tractor
 
     def delete_tractor(self, db: Session, tractor_id: int) -> Optional[TractorModel]:
         db_tractor = self.get_tractor_by_id(db, tractor_id)
         if db_tractor:
+            indexed = self._indexed_signature(db)
             db.delete(db_tractor)
+            resource_versions.bump(db, TRACTORS)
+            written = self._written_signature(db, indexed)
             db.commit()
+            self._index_tractor(db_tractor, indexed, written, deleted=True)
         return db_tractor
 
+    # --- Fallback search index maintenance ---
+
+    def _index_signature(self, db: Session):
+        # Row count plus latest update time changes on any insert, update or delete,
+        # including writes made by other worker processes.
+        return tuple(db.query(func.count(TractorModel.id), func.max(TractorModel.updated_at)).one())
+
+    def _ensure_search_index(self, db: Session) -> None:
+        with self._search_index_lock:
+            signature = self._index_signature(db)
+            if signature == self._search_index_signature:
+                return
+            self._search_index.clear()
+            columns = [getattr(TractorModel, name) for name in TRACTOR_SEARCH_FIELDS]
+            for row in db.query(TractorModel.id, *columns).yield_per(1000):
+                self._search_index.add(row.id, row._mapping)
+            self._search_index_signature = signature
+
+    def _indexed_signature(self, db: Session):
+        """
+        Before a local write: the table's signature if the fallback index is current,
+        else None (not built, not used on Postgres, or behind another worker's writes).
+        """
+        if self._search_index_signature is None or db.get_bind().dialect.name == "postgresql":
+            return None
+        signature = self._index_signature(db)
+        return signature if signature == self._search_index_signature else None
+
+    def _written_signature(self, db: Session, indexed):
+        # Read inside the write's transaction, so it covers this write and nothing committed after it
+        if indexed is None:
+            return None
+        db.flush()
+        return self._index_signature(db)
+
+    def _index_tractor(self, db_tractor: TractorModel, indexed, written, deleted: bool = False) -> None:
+        """
+        Apply a local write to the fallback index so it does not need a full rebuild.
+        Only when the index was current just before the write: otherwise its signature
+        stays stale and the next search rebuilds it, picking up the other writes too.
+        """
+        if indexed is None:
+            return
+        with self._search_index_lock:
+            if self._search_index_signature != indexed:
+                return # Rebuilt or updated meanwhile by another request
+            if deleted:
+                self._search_index.remove(db_tractor.id)
+            else:
+                self._search_index.add(
+                    db_tractor.id, {name: getattr(db_tractor, name) for name in TRACTOR_SEARCH_FIELDS}
+                )
+            self._search_index_signature = written
+
 tractor_service = TractorService()
@@ -0,0 +1,183 @@
+import logging
+import select
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from ..core.config import settings
+from ..core.db import get_engine
+from ..core.metrics import metrics
+from ..models.user import User as UserModel
+
+logger = logging.getLogger(__name__)
+
+# Postgres NOTIFY channel carrying the ids of users whose cached identity is stale
+INVALIDATION_CHANNEL = "user_identity_invalidated"
+
+_PENDING_KEY = "user_identity_pending_invalidations"
+_LISTENING_KEY = "user_identity_listening"
+
+
+class UserIdentityCache:
+    """
+    TTL + LRU cache of User rows keyed by token subject (email), so authenticating
+    a request doesn't need a query. Entries are detached snapshots; each request
+    gets its own session-bound copy via `merge(load=False)`.
+
+    Services call `invalidate_user` when a user changes. On Postgres the
+    invalidation is also sent with NOTIFY when the transaction commits, and every
+    worker's listener thread drops its copy; while a worker isn't listening it
+    bypasses the cache, so a ban is never served from a stale entry.
+    """
+
+    def __init__(self, max_entries: int, ttl_s: float):
+        self.max_entries = max_entries
+        self.ttl = ttl_s
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, UserModel]]" = OrderedDict()
+        self._subject_by_user: Dict[int, str] = {}
+        self._generation = 0 # Bumped by every invalidation; see `put`
+        self._listening = False
+        self._stop = threading.Event()
+        self._listener: Optional[threading.Thread] = None
+        self.hits = self.misses = self.bypassed = self.evictions = self.invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, db: Session, subject: str) -> Optional[UserModel]:
+        """The cached user for `subject`, merged into `db` without a query, or None."""
+        if not self._usable():
+            self.bypassed += 1
+            return None
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None or time.monotonic() - entry[0] >= self.ttl:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(subject)
+            self.hits += 1
+            snapshot = entry[1]
+        return db.merge(snapshot, load=False)
+
+    def put(self, subject: str, user: UserModel, generation: int) -> None:
+        """
+        Cache `user` (just loaded from the database) under `subject`. `generation` is
+        the value read before loading it: if a user was invalidated since, the row
+        may predate that change and is not cached.
+        """
+        if not self._usable():
+            return
+        mapper = inspect(UserModel)
+        snapshot = UserModel(**{attr.key: getattr(user, attr.key) for attr in mapper.column_attrs})
+        make_transient_to_detached(snapshot)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[subject] = (time.monotonic(), snapshot)
+            self._entries.move_to_end(subject)
+            self._subject_by_user[snapshot.id] = subject
+            while len(self._entries) > self.max_entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._subject_by_user.pop(evicted.id, None)
+                self.evictions += 1
+
+    def invalidate_user(self, db: Session, user_id: int) -> None:
+        """
+        Drop `user_id`'s entry now and again when `db` commits (a concurrent request
+        may re-cache the old row in between), and tell other workers on commit.
+        """
+        self._invalidate_local(user_id)
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(text("SELECT pg_notify(:channel, :user_id)"), {"channel": INVALIDATION_CHANNEL, "user_id": str(user_id)})
+        db.info.setdefault(_PENDING_KEY, set()).add(user_id)
+        if not db.info.get(_LISTENING_KEY):
+            event.listen(db, "after_commit", self._on_commit)
+            db.info[_LISTENING_KEY] = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._subject_by_user.clear()
+            self._generation += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    # --- Cross-worker invalidation (Postgres LISTEN/NOTIFY) ---
+
+    def start_listener(self) -> None:
+        if self._listener is None:
+            self._stop.clear()
+            self._listener = threading.Thread(target=self._listen, name="user-identity-cache-listener", daemon=True)
+            self._listener.start()
+
+    def stop_listener(self) -> None:
+        self._stop.set()
+        self._listener = None
+
+    def _usable(self) -> bool:
+        # Only Postgres deployments run several workers against one database; a
+        # worker that can't hear invalidations from the others must not use the cache
+        return self._listening or get_engine().dialect.name != "postgresql"
+
+    def _on_commit(self, db: Session) -> None:
+        for user_id in db.info.pop(_PENDING_KEY, ()):
+            self._invalidate_local(user_id)
+
+    def _invalidate_local(self, user_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            subject = self._subject_by_user.pop(user_id, None)
+            if subject is not None:
+                self._entries.pop(subject, None)
+            self.invalidations += 1
+
+    def _listen(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            engine = get_engine()
+            if engine.dialect.name != "postgresql":
+                return # Single-process database; nothing to listen for
+            if engine.dialect.driver != "psycopg2":
+                logger.warning(f"User identity cache disabled: no LISTEN support for driver {engine.dialect.driver}")
+                return
+            try:
+                raw = engine.raw_connection()
+                try:
+                    conn = raw.driver_connection
+                    conn.autocommit = True
+                    conn.cursor().execute(f"LISTEN {INVALIDATION_CHANNEL}")
+                    self.clear() # Invalidations sent while not listening were missed
+                    self._listening = True
+                    backoff = 1.0
+                    while not self._stop.is_set():
+                        if select.select([conn], [], [], 5) == ([], [], []):
+                            continue
+                        conn.poll()
+                        while conn.notifies:
+                            self._invalidate_local(int(conn.notifies.pop(0).payload))
+                finally:
+                    self._listening = False
+                    raw.invalidate() # Don't return a LISTENing autocommit connection to the pool
+            except Exception as e:
+                logger.warning(f"User identity cache listener disconnected: {e}; retrying in {backoff:.0f}s")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30)
+
+user_identity_cache = UserIdentityCache(
+    max_entries=settings.USER_CACHE_MAX_ENTRIES, ttl_s=settings.USER_CACHE_TTL_S
+)
+metrics.register_cache("user_identity", lambda: (user_identity_cache.hits, user_identity_cache.misses))
@@ -5,6 +5,8 @@ from datetime import datetime, timedelta, timezone
 from ..models.user import User as UserModel, UserRole
 from ..schemas.user import UserCreate, UserUpdate
 from ..core.security import get_password_hash, generate_otp, get_otp_hash, verify_otp
+from .user_identity_cache import user_identity_cache
+from .resource_versions import resource_versions, USERS
 # from ..core.config import settings # If OTP_EXPIRE_MINUTES needs to be configurable
 
 # For now, OTP expiry is hardcoded, can be moved to settings if needed
@@ -49,6 +51,9 @@ class UserService:
             setattr(db_user, field, value)
 
         db.add(db_user) # Add to session to track changes
+        user_identity_cache.invalidate_user(db, db_user.id)
+        # Listings embed the whole UserSchema (including updated_at), so every user write counts
+        resource_versions.bump(db, USERS)
         db.commit()
         db.refresh(db_user)
         return db_user
@@ -57,6 +62,8 @@ class UserService:
         db_user = self.get_user_by_id(db, user_id)
         if db_user:
             db.delete(db_user)
+            user_identity_cache.invalidate_user(db, db_user.id)
+            resource_versions.bump(db, USERS)
             db.commit()
         return db_user # Returns the deleted user or None
 
@@ -74,6 +81,8 @@ class UserService:
         user.is_verified = False # Reset verification status when new OTP is set
 
         db.add(user)
+        user_identity_cache.invalidate_user(db, user.id)
+        resource_versions.bump(db, USERS)
         db.commit()
         db.refresh(user)
         return plain_otp
@@ -91,6 +100,8 @@ class UserService:
             user.otp_secret = None
             user.otp_expiry = None
             db.add(user)
+            user_identity_cache.invalidate_user(db, user.id)
+            resource_versions.bump(db, USERS)
             db.commit()
             return False
 
@@ -102,6 +113,8 @@ class UserService:
         user.otp_secret = None
         user.otp_expiry = None
         db.add(user)
+        user_identity_cache.invalidate_user(db, user.id)
+        resource_versions.bump(db, USERS)
         db.commit()
         db.refresh(user)
         return True
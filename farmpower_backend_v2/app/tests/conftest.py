@@ -4,6 +4,7 @@ from typing import Generator, Dict
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 import tempfile
 from pathlib import Path
 
@@ -16,7 +17,10 @@ from app.tests.test_engine import (
 )
 
 # Import app modules
+from app import database
+from app.core import db as core_db
 from app.core.config import settings
+from app.core.query_stats import assert_max_queries
 from app.db.base import Base
 from app.db.session import get_db
 from main import app
@@ -29,6 +33,53 @@ os.environ["UPLOAD_DIR"] = TEMP_DIR
 os.environ["TESTING"] = "True"
 os.environ["DATABASE_URL"] = "sqlite:///./test.db"
 
+@pytest.fixture
+def query_budget():
+    """`with query_budget(n):` fails the test if the block runs more than n SQL statements."""
+    return assert_max_queries
+
+@pytest.fixture
+def memory_engines():
+    """
+    Factory for private in-memory SQLite databases holding every app table, disposed
+    after the test. StaticPool shares each one's single connection across threads.
+    """
+    engines = []
+
+    def make():
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        core_db.Base.metadata.create_all(bind=engine)
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+@pytest.fixture
+def memory_engine(memory_engines):
+    """One private in-memory database; test files seed it through `memory_session`."""
+    return memory_engines()
+
+@pytest.fixture
+def memory_sessions(memory_engine):
+    """sessionmaker for `memory_engine`."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=memory_engine)
+
+@pytest.fixture
+def memory_session(memory_sessions):
+    session = memory_sessions()
+    yield session
+    session.close()
+
+@pytest.fixture
+def memory_client(memory_session):
+    """TestClient for the app, with both get_db dependencies answering `memory_session`."""
+    for get_db_dependency in (core_db.get_db, database.get_db):
+        app.dependency_overrides[get_db_dependency] = lambda: memory_session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_database():
     # Set up
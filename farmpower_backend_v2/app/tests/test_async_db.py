@@ -0,0 +1,51 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.db import Base, to_async_url
+from app.models.tractor import Tractor
+from app.models.user import User
+from app.schemas.tractor import TractorSchema
+from app.services.tractor_service import TractorService
+
+
+def test_async_url_uses_async_drivers():
+    assert to_async_url("postgresql://u:p@db.example.com:6543/postgres").drivername == "postgresql+asyncpg"
+    assert to_async_url("postgres://u:p@localhost/farm").drivername == "postgresql+asyncpg"
+    assert to_async_url("sqlite:///./test.db").drivername == "sqlite+aiosqlite"
+
+
+def test_async_listing_pages_like_the_sync_one():
+    pytest.importorskip("greenlet")
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+        async with factory() as db:
+            db.add(User(id=1, email="dealer@example.com", hashed_password="x"))
+            base = datetime(2025, 1, 1)
+            db.add_all(
+                Tractor(name=f"Tractor {i}", brand="Kubota", model="M7", year=2020, price=1000.0 + i,
+                        location="Iowa", owner_id=1, created_at=base + timedelta(hours=i))
+                for i in range(5)
+            )
+            await db.commit()
+
+        service = TractorService()
+        async with factory() as db:
+            first = await service.get_tractors_async(db, limit=3)
+            second = await service.get_tractors_async(db, limit=3, cursor=first.next_cursor)
+            one = await service.get_tractor_by_id_async(db, 2)
+            # Owner was eager-loaded, so serialization doesn't touch the session
+            TractorSchema.model_validate(one)
+        await engine.dispose()
+        return [t.id for t in first], [t.id for t in second], first.next_cursor, second.next_cursor
+
+    first, second, first_cursor, second_cursor = asyncio.run(scenario())
+    assert first == [5, 4, 3] and first_cursor
+    assert second == [2, 1] and second_cursor is None
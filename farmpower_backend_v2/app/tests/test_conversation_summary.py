@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import event
+
+from app.models.message import ConversationSummary
+from app.models.user import User
+from app.schemas.message import MessageCreate
+from app.services.message_service import MessageService
+
+
+@pytest.fixture
+def session(memory_session):
+    db = memory_session
+    for user_id, email in [(1, "dealer@example.com"), (2, "farmer@example.com"), (3, "buyer@example.com")]:
+        db.add(User(id=user_id, email=email, hashed_password="x", full_name=email.split("@")[0]))
+    db.commit()
+    return db
+
+
+def send(db, service, sender_id, recipient_id, content):
+    return service.create_message(db, MessageCreate(recipient_id=recipient_id, content=content), sender_id=sender_id)
+
+
+def test_summaries_track_last_message_and_unread(session):
+    service = MessageService()
+    send(session, service, 2, 1, "Is the 8R still available?")
+    send(session, service, 1, 2, "Yes it is")
+    send(session, service, 2, 1, "Can I see it Friday?")
+    send(session, service, 3, 1, "Price for the baler?")
+
+    inbox = service.get_conversations_for_user(session, user_id=1)
+    assert [c.other_user.id for c in inbox] == [3, 2]
+    assert inbox[1].last_message_content == "Can I see it Friday?"
+    assert [c.unread_count for c in inbox] == [1, 2]
+
+    farmer_inbox = service.get_conversations_for_user(session, user_id=2)
+    assert [(c.other_user.id, c.unread_count) for c in farmer_inbox] == [(1, 1)]
+
+
+def test_mark_as_read_updates_summary(session):
+    service = MessageService()
+    message = send(session, service, 2, 1, "Hello")
+    send(session, service, 2, 1, "Anyone there?")
+
+    assert service.mark_messages_as_read(session, message.conversation_id, recipient_id=1) == 2
+    assert service.get_conversations_for_user(session, user_id=1)[0].unread_count == 0
+
+    send(session, service, 2, 1, "Following up")
+    assert service.get_conversations_for_user(session, user_id=1)[0].unread_count == 1
+    assert session.query(ConversationSummary).count() == 2
+
+
+def test_inbox_is_a_single_query(session, memory_engine):
+    service = MessageService()
+    for sender_id in (2, 3):
+        for i in range(3):
+            send(session, service, sender_id, 1, f"message {i}")
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(memory_engine, "before_cursor_execute", listener)
+    try:
+        inbox = service.get_conversations_for_user(session, user_id=1)
+    finally:
+        event.remove(memory_engine, "before_cursor_execute", listener)
+
+    assert [c.unread_count for c in inbox] == [3, 3]
+    assert len(statements) == 1
@@ -0,0 +1,111 @@
+import math
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.core import geo_area
+from app.core.geo_area import area_hectares, polygon_areas_m2
+from app.models.user import User
+from app.schemas.field import FieldCreate, FieldUpdate
+from app.services.field_service import FieldService
+
+# Surface area of the WGS84 ellipsoid, m^2
+WGS84_SURFACE_M2 = 510_065_621_724_089
+
+
+def box(west, south, east, north):
+    return {"type": "Polygon", "coordinates": [[[west, south], [east, south], [east, north], [west, north], [west, south]]]}
+
+
+@pytest.fixture
+def session(memory_session):
+    db = memory_session
+    db.add(User(id=1, email="farmer@example.com", hashed_password="x"))
+    db.commit()
+    return db
+
+
+def test_octant_is_an_eighth_of_the_ellipsoid():
+    area = polygon_areas_m2([box(0, 0, 90, 90)])[0]
+    assert area == pytest.approx(WGS84_SURFACE_M2 / 8, rel=1e-9)
+
+
+def test_area_shrinks_with_latitude():
+    # One arc-minute squares: same size in degrees, not on the ground
+    equator, iowa = polygon_areas_m2([box(0, 0, 1 / 60, 1 / 60), box(-93.5, 42, -93.5 + 1 / 60, 42 + 1 / 60)])
+    assert equator == pytest.approx(3_419_000, rel=1e-3)
+    assert iowa / equator == pytest.approx(math.cos(math.radians(42 + 1 / 120)), rel=1e-2)
+
+
+def test_holes_multipolygons_and_winding():
+    outer = box(10, 50, 10.01, 50.01)["coordinates"][0]
+    hole = box(10.002, 50.002, 10.004, 50.004)["coordinates"][0]
+    with_hole = {"type": "Polygon", "coordinates": [outer, hole]}
+    clockwise = {"type": "Polygon", "coordinates": [outer[::-1]]}
+    multi = {"type": "MultiPolygon", "coordinates": [[outer], [box(11, 50, 11.01, 50.01)["coordinates"][0]]]}
+    full, hole_area, holed, cw, both = polygon_areas_m2(
+        [box(10, 50, 10.01, 50.01), {"type": "Polygon", "coordinates": [hole]}, with_hole, clockwise, multi]
+    )
+    assert holed == pytest.approx(full - hole_area)
+    assert cw == pytest.approx(full)
+    assert both == pytest.approx(2 * full, rel=1e-6)
+
+
+def test_antimeridian_crossing():
+    crossing = area_hectares(box(179.995, -17, -179.995, -16.99))
+    normal = area_hectares(box(179.985, -17, 179.995, -16.99))
+    assert crossing == pytest.approx(normal, rel=1e-9)
+
+
+def test_invalid_geometries_are_nan():
+    areas = polygon_areas_m2([
+        None,
+        {"type": "Point", "coordinates": [0, 0]},
+        {"type": "Polygon", "coordinates": []},
+        {"type": "Polygon", "coordinates": [[[0, 0], [1, 1], [0, 0]]]},
+        {"type": "Polygon", "coordinates": [[[0, 0], [1, "x"], [1, 1], [0, 0]]]},
+        box(0, 0, 1, 1),
+    ])
+    assert np.isnan(areas[:5]).all()
+    assert not np.isnan(areas[5])
+    assert area_hectares({"type": "LineString", "coordinates": [[0, 0], [1, 1]]}) is None
+
+
+def test_field_service_populates_area(session):
+    service = FieldService()
+    field = service.create_field(
+        session, FieldCreate(name="North", coordinates=box(-93.5, 42, -93.49, 42.01), area_hectares=1.0), owner_id=1
+    )
+    expected = area_hectares(box(-93.5, 42, -93.49, 42.01))
+    assert field.area_hectares == pytest.approx(expected)
+    assert 90 < field.area_hectares < 95
+
+    field = service.update_field(session, field, FieldUpdate(coordinates=box(-93.5, 42, -93.48, 42.01)))
+    assert field.area_hectares == pytest.approx(2 * expected, rel=1e-3)
+
+    # Unmeasurable geometry keeps the hand-entered value
+    field = service.create_field(
+        session, FieldCreate(name="South", coordinates={"type": "Point", "coordinates": [0, 0]}, area_hectares=12.5), owner_id=1
+    )
+    assert field.area_hectares == 12.5
+
+    # An unmeasurable new boundary drops the area measured from the old one, unless one comes with it
+    point = {"type": "Point", "coordinates": [-93.5, 42]}
+    field = service.update_field(session, service.create_field(
+        session, FieldCreate(name="East", coordinates=box(-93.5, 42, -93.49, 42.01)), owner_id=1
+    ), FieldUpdate(coordinates=point))
+    assert field.area_hectares is None and field.min_lon is None
+    field = service.update_field(session, field, FieldUpdate(coordinates=point, area_hectares=3.5))
+    assert field.area_hectares == 3.5
+    field = service.update_field(session, field, FieldUpdate(crop_info="Corn"))
+    assert field.area_hectares == 3.5
+
+
+def test_yield_calculator_copy_matches():
+    # The standalone yield calculator ships its own copy of the engine
+    repo_root = Path(geo_area.__file__).resolve().parents[3]
+    vendored = repo_root / "FARMPOWER" / "backend" / "geo_area.py"
+    if not vendored.exists():
+        pytest.skip("yield calculator service not checked out")
+    assert vendored.read_text() == Path(geo_area.__file__).read_text()
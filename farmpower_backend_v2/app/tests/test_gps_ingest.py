@@ -0,0 +1,91 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.gps_ingest import LocationCoalescer, fix_time_utc
+from app.schemas.gps import LocationUpdate
+
+T0 = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def make_coalescer(**kwargs):
+    frames = []
+
+    async def emit(room, frame):
+        frames.append((room, frame))
+
+    return LocationCoalescer(emit, **kwargs), frames
+
+
+def point(device_id, lat, seconds=0):
+    return device_id, {"device_id": device_id, "latitude": lat, "longitude": -93.0}, T0 + timedelta(seconds=seconds)
+
+
+def submit(coalescer, room, field_id, device_id, data, fix_time):
+    coalescer.submit(room, field_id, device_id, data, fix_time)
+
+
+def test_latest_point_per_device_in_one_frame_per_room():
+    async def scenario():
+        coalescer, frames = make_coalescer(flush_interval_ms=10_000)
+        for i in range(10):
+            submit(coalescer, "field_1", 1, *point("tractor-a", 41.0 + i, seconds=i))
+        submit(coalescer, "field_1", 1, *point("tractor-b", 42.0))
+        submit(coalescer, "field_2", 2, *point("tractor-c", 43.0))
+        await coalescer.aclose()
+        return coalescer, frames
+
+    coalescer, frames = asyncio.run(scenario())
+    assert len(frames) == 2
+    frame = dict(frames)["field_1"]
+    assert frame["field_id"] == 1
+    assert {p["device_id"]: p["latitude"] for p in frame["points"]} == {"tractor-a": 50.0, "tractor-b": 42.0}
+    assert coalescer.stats["coalesced"] == 9
+
+
+def test_out_of_order_points_dropped():
+    async def scenario():
+        coalescer, frames = make_coalescer(flush_interval_ms=10_000)
+        submit(coalescer, "field_1", 1, *point("tractor-a", 41.5, seconds=5))
+        submit(coalescer, "field_1", 1, *point("tractor-a", 41.0, seconds=1))
+        await coalescer.aclose()
+        return coalescer, frames
+
+    coalescer, frames = asyncio.run(scenario())
+    assert [p["latitude"] for p in frames[0][1]["points"]] == [41.5]
+    assert coalescer.stats["dropped_stale"] == 1
+
+
+def test_room_buffer_is_bounded():
+    async def scenario():
+        coalescer, frames = make_coalescer(flush_interval_ms=10_000, max_devices_per_room=3)
+        for i in range(5):
+            submit(coalescer, "field_1", 1, *point(f"tractor-{i}", 41.0, seconds=i))
+        await coalescer.aclose()
+        return coalescer, frames
+
+    coalescer, frames = asyncio.run(scenario())
+    assert [p["device_id"] for p in frames[0][1]["points"]] == ["tractor-2", "tractor-3", "tractor-4"]
+    assert coalescer.stats["dropped_overflow"] == 2
+
+
+def test_flush_loop_sends_periodically():
+    async def scenario():
+        coalescer, frames = make_coalescer(flush_interval_ms=10)
+        submit(coalescer, "field_1", 1, *point("tractor-a", 41.0))
+        await asyncio.sleep(0.05)
+        sent_before_close = len(frames)
+        await coalescer.aclose()
+        return sent_before_close
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_location_update_validation():
+    update = LocationUpdate.model_validate({"field_id": 3, "latitude": 41.9, "longitude": -93.1, "timestamp": 1717243200})
+    assert fix_time_utc(update.timestamp) == datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+    for bad in [{"latitude": 91}, {"longitude": -181}, {"latitude": float("nan")}, {"field_id": None}]:
+        with pytest.raises(ValidationError):
+            LocationUpdate.model_validate({"field_id": 3, "latitude": 41.9, "longitude": -93.1, **bad})
@@ -0,0 +1,49 @@
+import asyncio
+import importlib
+import inspect
+
+from fastapi.dependencies.models import Dependant
+from fastapi.routing import APIRoute
+
+from app.api.api import api_router
+from app.core import db as core_db
+from app import database
+
+# The routers main.py mounts
+ROUTER_MODULES = [
+    "users", "tractors", "fields", "crops", "services", "parts", "notifications",
+    "messages", "admin", "crop_calculator", "auth_json", "marketplace",
+]
+
+SYNC_SESSION_PROVIDERS = {core_db.get_db, database.get_db}
+
+# Async because they await the upload; their DB calls go through run_in_threadpool
+OFFLOADED_ASYNC_ENDPOINTS = {"upload_tractor_image_to_s3", "upload_part_image"}
+
+
+def all_routes():
+    routers = [api_router] + [importlib.import_module(f"app.routers.{name}").router for name in ROUTER_MODULES]
+    return [route for router in routers for route in router.routes if isinstance(route, APIRoute)]
+
+
+def blocking_async_calls(dependant: Dependant, name: str):
+    # Coroutine functions that take a sync Session would run its queries on the event loop
+    takes_session = any(sub.call in SYNC_SESSION_PROVIDERS for sub in dependant.dependencies)
+    if takes_session and asyncio.iscoroutinefunction(dependant.call) and name not in OFFLOADED_ASYNC_ENDPOINTS:
+        yield name
+    for sub in dependant.dependencies:
+        yield from blocking_async_calls(sub, getattr(sub.call, "__name__", repr(sub.call)))
+
+
+def test_no_async_handler_uses_a_sync_session():
+    offenders = {
+        f"{route.path}: {name}"
+        for route in all_routes()
+        for name in blocking_async_calls(route.dependant, route.endpoint.__name__)
+    }
+    assert not offenders, "async def with a sync DB session blocks the event loop; use def:\n" + "\n".join(sorted(offenders))
+
+
+def test_offloaded_endpoints_still_exist():
+    names = {route.endpoint.__name__ for route in all_routes() if inspect.iscoroutinefunction(route.endpoint)}
+    assert OFFLOADED_ASYNC_ENDPOINTS <= names
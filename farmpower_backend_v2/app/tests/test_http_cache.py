@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.http_cache import etag_matches, make_etag
+from app.models.part import Part
+from app.models.resource_version import ResourceVersion
+from app.models.tractor import Tractor
+from app.models.user import User
+from app.schemas.part import PartUpdate
+from app.schemas.tractor import TractorUpdate
+from app.schemas.user import UserUpdate
+from app.services import admin_service, part_service, tractor_service, user_service
+
+
+@pytest.fixture
+def session(memory_session):
+    session = memory_session
+    session.add(User(id=1, email="dealer@example.com", hashed_password="x", full_name="Dealer"))
+    listed = datetime(2026, 5, 1)
+    for i in range(3):
+        session.add(Tractor(
+            name=f"Tractor {i}", brand="Deere", model="8R", year=2020, price=100.0 + i, location="Iowa",
+            owner_id=1, created_at=listed + timedelta(days=i)
+        ))
+        session.add(Part(
+            name=f"Filter {i}", category="Filters", condition="New", price=10.0 + i, quantity=2, location="Iowa",
+            seller_id=1, created_at=listed + timedelta(days=i)
+        ))
+    session.commit()
+    return session
+
+
+@pytest.fixture
+def client(session, memory_client):
+    return memory_client
+
+
+def revalidate(client, path, etag, **params):
+    return client.get(path, params=params, headers={"If-None-Match": etag})
+
+
+@pytest.mark.parametrize("path", ["/marketplace/tractors", "/tractors/", "/parts/", "/marketplace/featured"])
+def test_unchanged_listing_is_not_modified(client, query_budget, path):
+    response = client.get(path)
+    assert response.status_code == 200 and response.json()
+    etag = response.headers["ETag"]
+    assert etag.startswith('"') # Strong
+
+    # Answered from the version counters alone: no listing query, no body
+    with query_budget(1):
+        cached = revalidate(client, path, etag)
+    assert cached.status_code == 304 and cached.content == b""
+    assert cached.headers["ETag"] == etag
+    assert cached.headers["Cache-Control"] == response.headers["Cache-Control"]
+    assert revalidate(client, path, f"W/{etag}").status_code == 304
+
+
+def test_cache_control_per_route(client):
+    assert client.get("/marketplace/tractors").headers["Cache-Control"] == "public, no-cache"
+    assert client.get("/marketplace/featured").headers["Cache-Control"] == "public, max-age=60, must-revalidate"
+
+
+def test_writes_change_listing_etags(client, session):
+    etag = client.get("/marketplace/tractors").headers["ETag"]
+    tractor = tractor_service.get_tractor_by_id(session, 1)
+    tractor_service.update_tractor(session, tractor, TractorUpdate(price=90.0))
+    response = revalidate(client, "/marketplace/tractors", etag)
+    assert response.status_code == 200 and response.headers["ETag"] != etag
+
+    # Tractors embed their owner, so user writes count too
+    etag = response.headers["ETag"]
+    user_service.update_user(session, session.get(User, 1), UserUpdate(full_name="Dealer Ltd"))
+    response = revalidate(client, "/marketplace/tractors", etag)
+    assert response.status_code == 200 and response.json()[0]["owner"]["full_name"] == "Dealer Ltd"
+
+    # Part writes don't touch tractor listings
+    etag = response.headers["ETag"]
+    part_service.update_part(session, part_service.get_part_by_id(session, 1), PartUpdate(price=11.0))
+    assert revalidate(client, "/marketplace/tractors", etag).status_code == 304
+
+
+def test_every_embedded_owner_change_changes_listing_etags(client, session):
+    # Owners are embedded with their whole UserSchema, account status included
+    etag = client.get("/marketplace/tractors").headers["ETag"]
+    admin_service.ban_user(session, 1)
+    response = revalidate(client, "/marketplace/tractors", etag)
+    assert response.status_code == 200 and response.headers["ETag"] != etag
+    assert response.json()[0]["owner"]["is_banned"] is True
+
+    for write in (
+        lambda: admin_service.unban_user(session, 1),
+        lambda: user_service.set_otp_for_user(session, session.get(User, 1)),
+        lambda: user_service.update_user(session, session.get(User, 1), UserUpdate(is_verified=True)),
+    ):
+        etag = client.get("/marketplace/tractors").headers["ETag"]
+        write()
+        assert revalidate(client, "/marketplace/tractors", etag).status_code == 200
+
+
+def test_version_rows_exist_from_table_creation(session):
+    # Writes then only UPDATE them: no insert for concurrent first writes to race on
+    def versions():
+        return {row.resource: row.version for row in session.query(ResourceVersion)}
+
+    assert versions() == {"tractors": 0, "parts": 0, "users": 0}
+    part_service.update_part(session, part_service.get_part_by_id(session, 1), PartUpdate(price=11.0))
+    assert versions() == {"tractors": 0, "parts": 1, "users": 0}
+
+
+def test_query_string_is_part_of_the_etag(client):
+    full = client.get("/marketplace/tractors").headers["ETag"]
+    cards = client.get("/marketplace/tractors", params={"fields": "card"}).headers["ETag"]
+    page = client.get("/marketplace/tractors", params={"limit": 1}).headers["ETag"]
+    assert len({full, cards, page}) == 3
+    assert revalidate(client, "/marketplace/tractors", full, fields="card").status_code == 200
+
+
+def test_detail_etag_follows_the_row(client, session):
+    response = client.get("/parts/2")
+    etag = response.headers["ETag"]
+    assert revalidate(client, "/parts/2", etag).status_code == 304
+
+    # Another part changing doesn't matter; this one changing does
+    part_service.update_part(session, part_service.get_part_by_id(session, 1), PartUpdate(price=11.0))
+    assert revalidate(client, "/parts/2", etag).status_code == 304
+    part_service.update_part(session, part_service.get_part_by_id(session, 2), PartUpdate(price=12.5))
+    response = revalidate(client, "/parts/2", etag)
+    assert response.status_code == 200 and response.json()["price"] == 12.5
+
+    assert client.get("/parts/99").status_code == 404
+    tractor_etag = client.get("/marketplace/tractors/1").headers["ETag"]
+    assert revalidate(client, "/marketplace/tractors/1", tractor_etag).status_code == 304
+
+
+def test_etag_matching():
+    etag = make_etag("tractors", 3)
+    assert etag_matches(etag, etag) and etag_matches(f'"other", W/{etag}', etag) and etag_matches("*", etag)
+    assert not etag_matches(None, etag) and not etag_matches('"other"', etag)
@@ -0,0 +1,63 @@
+import json
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import logging as app_logging
+from app.core.config import settings
+
+
+@pytest.fixture
+def json_log(tmp_path):
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    app_logging.setup_logging("test", log_dir=tmp_path)
+
+    def read():
+        app_logging.shutdown_logging() # Flushes the writer thread
+        with open(tmp_path / "test_json.log") as f:
+            return [json.loads(line) for line in f]
+    yield read
+    app_logging.shutdown_logging()
+    root.handlers, root.level = handlers, level
+
+
+def test_request_id_reaches_sync_handlers(json_log):
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        logging.getLogger("test").info("handled on the threadpool")
+        return {}
+
+    app.middleware("http")(app_logging.performance_middleware)
+    response = TestClient(app).get("/ping", headers={"X-Request-ID": "req-123"})
+    assert response.headers["X-Request-ID"] == "req-123"
+
+    records = {record["message"]: record for record in json_log()}
+    assert records["handled on the threadpool"]["request_id"] == "req-123"
+    completed = records["Request completed"]
+    assert completed["request_id"] == "req-123" and completed["status_code"] == 200 and completed["path"] == "/ping"
+
+
+def test_exceptions_and_args_survive_the_queue(json_log):
+    values = ["before"]
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.getLogger("test").exception("failed with %s", values)
+    values[0] = "after" # Mutated before the writer thread formats the record
+    (record,) = [r for r in json_log() if r["message"].startswith("failed")]
+    assert record["message"] == "failed with ['before']"
+    assert "ValueError: boom" in record["exception"]
+
+
+def test_success_sampling(monkeypatch):
+    monkeypatch.setattr(settings, "LOG_SUCCESS_SAMPLE_RATE", 0.0)
+    assert not app_logging.should_log_request(200, 0.01)
+    assert app_logging.should_log_request(500, 0.01)
+    assert app_logging.should_log_request(200, settings.LOG_SLOW_REQUEST_S)
+    monkeypatch.setattr(settings, "LOG_SUCCESS_SAMPLE_RATE", 1.0)
+    assert app_logging.should_log_request(200, 0.01)
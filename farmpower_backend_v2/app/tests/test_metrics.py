@@ -0,0 +1,59 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.metrics import MetricsMiddleware, MetricsRegistry, TimedQueuePool, pool_families
+
+
+def scrape(registry):
+    samples = {}
+    for line in registry.render().splitlines():
+        if not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_requests_are_grouped_by_route_template():
+    registry = MetricsRegistry()
+    app = FastAPI()
+
+    @app.get("/tractors/{tractor_id}")
+    def read_tractor(tractor_id: int):
+        return {"id": tractor_id}
+
+    app.add_middleware(MetricsMiddleware, registry=registry)
+    client = TestClient(app)
+    for path in ("/tractors/1", "/tractors/2", "/tractors/x", "/nope/3"):
+        client.get(path)
+
+    samples = scrape(registry)
+    ok = 'method="GET",route="/tractors/{tractor_id}",status="200"'
+    assert samples[f"http_request_duration_seconds_count{{{ok}}}"] == 2
+    assert samples[f'http_request_duration_seconds_bucket{{{ok},le="+Inf"}}'] == 2
+    assert samples['http_request_duration_seconds_count{method="GET",route="/tractors/{tractor_id}",status="422"}'] == 1
+    assert samples['http_request_duration_seconds_count{method="GET",route="unmatched",status="404"}'] == 1
+    assert samples["http_requests_in_flight"] == 0
+
+
+def test_pool_gauges_and_checkout_wait():
+    engine = create_engine("sqlite://", poolclass=TimedQueuePool, pool_size=2)
+    registry = MetricsRegistry()
+    registry.register_collector(lambda: pool_families({"primary": engine.pool}))
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        samples = scrape(registry)
+        assert samples['db_pool_checked_out{engine="primary"}'] == 1
+        assert samples['db_pool_size{engine="primary"}'] == 2
+    assert scrape(registry)['db_pool_checkout_wait_seconds_count{engine="primary"}'] == 1
+    engine.dispose()
+
+
+def test_cache_hit_ratio():
+    registry = MetricsRegistry()
+    registry.register_cache("user_identity", lambda: (3, 1))
+    registry.register_cache("unused", lambda: (0, 0))
+    samples = scrape(registry)
+    assert samples['cache_hit_ratio{cache="user_identity"}'] == 0.75
+    assert samples['cache_misses_total{cache="user_identity"}'] == 1
+    assert 'cache_hit_ratio{cache="unused"}' not in samples
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor, paginate
+from app.models.field import Field
+from app.models.tractor import Tractor
+from app.models.user import User
+from app.crud.equipment import EQUIPMENT_SORT_KEY
+from app.services.field_service import FIELD_SORT_KEY, LAND_USAGE_PLAN_SORT_KEY
+from app.services.message_service import MESSAGE_SORT_KEY
+from app.services.notification_service import NOTIFICATION_SORT_KEY
+from app.services.part_service import PART_SORT_KEY
+from app.services.service_booking_service import BOOKING_SORT_KEY
+from app.services.tractor_service import TRACTOR_SORT_KEY, TractorService
+
+
+@pytest.fixture
+def session(memory_session):
+    db = memory_session
+    db.add(User(id=1, email="dealer@example.com", hashed_password="x"))
+    db.commit()
+    return db
+
+
+def add_tractors(db, count):
+    # Pairs share a timestamp so the id tie-breaker is exercised
+    base = datetime(2025, 1, 1)
+    for i in range(count):
+        db.add(Tractor(name=f"Tractor {i}", brand="Kubota", model="M7", year=2020, price=1000.0 + i,
+                       location="Iowa", owner_id=1, created_at=base + timedelta(hours=i // 2)))
+    db.commit()
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 3, 4, 5, 6, 7)
+    cursor = encode_cursor(TRACTOR_SORT_KEY, [created_at, 42])
+    assert decode_cursor(TRACTOR_SORT_KEY, cursor) == [created_at, 42]
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", encode_cursor(FIELD_SORT_KEY, ["North", 1])])
+def test_invalid_cursor_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(TRACTOR_SORT_KEY, cursor)
+
+
+def test_keyset_pages_cover_every_row_once(session):
+    add_tractors(session, 7)
+    service = TractorService()
+
+    seen, cursor = [], None
+    while True:
+        page = service.get_tractors(session, limit=3, cursor=cursor)
+        seen.extend(t.id for t in page)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    expected = [t.id for t in session.query(Tractor).order_by(Tractor.created_at.desc(), Tractor.id.desc())]
+    assert seen == expected
+
+
+def test_offset_paging_still_supported(session):
+    add_tractors(session, 5)
+    service = TractorService()
+
+    first = service.get_tractors(session, limit=2)
+    second = service.get_tractors(session, skip=2, limit=2)
+    by_cursor = service.get_tractors(session, limit=2, cursor=first.next_cursor)
+    assert [t.id for t in second] == [t.id for t in by_cursor]
+    assert second.next_cursor == by_cursor.next_cursor
+
+
+def test_ascending_sort_key_with_filters(session):
+    for name in ["Creek", "Alder", "Birch", "Alder"]:
+        session.add(Field(name=name, owner_id=1, coordinates=[[0, 0], [0, 1], [1, 1]]))
+    session.commit()
+
+    query = session.query(Field).filter(Field.owner_id == 1)
+    first = paginate(query, FIELD_SORT_KEY, limit=2)
+    rest = paginate(query, FIELD_SORT_KEY, limit=2, cursor=first.next_cursor)
+    assert [f.name for f in first] + [f.name for f in rest] == ["Alder", "Alder", "Birch", "Creek"]
+    assert rest.next_cursor is None
+
+
+@pytest.mark.parametrize("sort_key", [
+    TRACTOR_SORT_KEY, PART_SORT_KEY, MESSAGE_SORT_KEY, NOTIFICATION_SORT_KEY, BOOKING_SORT_KEY,
+    FIELD_SORT_KEY, LAND_USAGE_PLAN_SORT_KEY, EQUIPMENT_SORT_KEY,
+])
+def test_sort_key_columns_are_not_null(sort_key):
+    # A NULL never satisfies the cursor's < / > comparison, so such rows would vanish from cursor pages
+    assert [column.key for column, _ in sort_key if column.expression.nullable] == []
@@ -0,0 +1,49 @@
+import json
+import threading
+import time
+
+import pytest
+
+from app.core.hashing import HashingPoolSaturated, PasswordHashingPool, hashing_pool_saturated_handler
+from app.core.security import get_otp_hash, get_password_hash, pwd_context, verify_otp, verify_password
+
+
+def test_saturated_pool_rejects_immediately():
+    pool = PasswordHashingPool(workers=1, max_queue=1)
+    release = threading.Event()
+    callers = [threading.Thread(target=pool.run, args=(release.wait,)) for _ in range(2)]
+    for caller in callers:
+        caller.start()
+    while pool._slots._value: # Both slots taken: one running, one queued
+        time.sleep(0.001)
+
+    started = time.perf_counter()
+    with pytest.raises(HashingPoolSaturated):
+        pool.run(len, "x")
+    assert time.perf_counter() - started < 0.1
+    assert pool.rejected == 1
+
+    release.set()
+    for caller in callers:
+        caller.join()
+    assert pool.run(len, "x") == 1 # Slots are freed as work finishes
+    pool.shutdown()
+
+
+def test_saturation_is_a_503():
+    response = hashing_pool_saturated_handler(None, HashingPoolSaturated())
+    assert response.status_code == 503 and response.headers["Retry-After"] == "1"
+    assert json.loads(response.body)["detail"]
+
+
+def test_passwords_still_round_trip():
+    hashed = get_password_hash("hunter22")
+    assert verify_password("hunter22", hashed) and not verify_password("hunter23", hashed)
+
+
+def test_otps_use_a_keyed_hmac():
+    hashed = get_otp_hash("123456")
+    assert hashed.startswith("hmac-sha256$") and hashed != get_otp_hash("123456") # Salted
+    assert verify_otp("123456", hashed) and not verify_otp("123457", hashed)
+    # OTPs hashed with bcrypt before the switch still verify
+    assert verify_otp("654321", pwd_context.hash("654321"))
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.dependencies import get_current_active_user
+from app.models.field import Field
+from app.models.part import Part
+from app.models.tractor import Tractor
+from app.models.user import User
+from main import app
+
+SQUARE = {"type": "Polygon", "coordinates": [[[0, 0], [0.01, 0], [0.01, 0.01], [0, 0.01], [0, 0]]]}
+
+
+@pytest.fixture
+def client(memory_session, memory_client):
+    session = memory_session
+    user = User(id=1, email="dealer@example.com", hashed_password="x", full_name="Dealer")
+    session.add(user)
+    listed = datetime(2026, 5, 1)
+    for i in range(3):
+        images = [f"https://cdn.example.com/{i}/front.jpg", f"https://cdn.example.com/{i}/side.jpg"]
+        session.add(Tractor(
+            name=f"Tractor {i}", brand="Deere", model="8R", year=2020, price=100.0 + i, location="Iowa",
+            description="long text " * 200, image_urls=images, owner_id=1, created_at=listed + timedelta(days=i)
+        ))
+        session.add(Part(
+            name=f"Filter {i}", category="Filters", condition="New", price=10.0 + i, quantity=2,
+            description="long text " * 200, image_urls=images, seller_id=1, created_at=listed + timedelta(days=i)
+        ))
+        session.add(Field(name=f"Field {i}", coordinates=SQUARE, area_hectares=1.2, owner_id=1))
+    session.commit()
+
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    return memory_client
+
+
+def test_card_view_loads_only_card_columns(client, query_budget):
+    with query_budget(2) as stats: # The ETag's resource versions, then the page
+        response = client.get("/marketplace/tractors", params={"fields": "card", "limit": 2})
+    assert response.status_code == 200
+    cards = response.json()
+    assert [card["name"] for card in cards] == ["Tractor 2", "Tractor 1"]
+    assert cards[0]["thumbnail_url"] == "https://cdn.example.com/2/front.jpg"
+    assert "description" not in cards[0] and "owner" not in cards[0]
+    assert "description" not in stats.statements[-1] and "users" not in stats.statements[-1]
+
+    # Paging cursors still work from the slim rows
+    cursor = response.headers["X-Next-Cursor"]
+    rest = client.get("/marketplace/tractors", params={"fields": "card", "limit": 2, "cursor": cursor}).json()
+    assert [card["name"] for card in rest] == ["Tractor 0"]
+
+
+def test_explicit_fields(client, query_budget):
+    with query_budget(2) as stats:
+        response = client.get("/parts/", params={"fields": "id,price", "limit": 1})
+    assert response.json() == [{"id": 3, "price": 12.0}]
+    assert "image_urls" not in stats.statements[-1]
+
+    fields = client.get("/fields/", params={"fields": "card"}).json()
+    assert fields[0] == {
+        "id": 1, "name": "Field 0", "area_hectares": 1.2, "crop_info": None, "soil_type": None,
+        "updated_at": fields[0]["updated_at"],
+    }
+
+
+@pytest.mark.parametrize("fields", ["owner", "id,bogus", ","])
+def test_unknown_fields_are_rejected(client, fields):
+    response = client.get("/marketplace/tractors", params={"fields": fields})
+    assert response.status_code == 400 and "Choose from" in response.json()["detail"]
+
+
+def test_full_listing_is_unchanged(client):
+    tractors = client.get("/marketplace/tractors").json()
+    assert tractors[0]["owner"]["id"] == 1 and len(tractors[0]["image_urls"]) == 2
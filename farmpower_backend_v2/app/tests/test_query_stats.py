@@ -0,0 +1,113 @@
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.dependencies import get_current_active_user
+from app.core.metrics import MetricsRegistry
+from app.core.query_stats import QueryBudgetExceeded, QueryMetrics, QueryStatsMiddleware, install_query_stats
+from app.models.crop import Crop
+from app.models.field import Field
+from app.models.land_usage_plan import LandUsagePlan
+from app.models.service_booking import ServiceBooking
+from app.models.tractor import Tractor
+from app.models.user import User, UserRole
+from app.schemas.message import MessageCreate
+from app.services.message_service import MessageService
+from main import app as main_app
+
+# Statements each endpoint may run for the seeded data; a lazy load per row breaks these
+ENDPOINT_BUDGETS = {
+    "/messages/conversations/": 1,
+    "/messages/conversation/1-2": 1,
+    "/fields/": 2, # The page with owners, then every field's land usage plans
+    "/tractors/": 2, # The ETag's resource versions, then the page with owners
+    "/service-bookings/": 1,
+    "/crops/": 1,
+}
+
+
+@pytest.fixture
+def engine(memory_engine):
+    install_query_stats()
+    return memory_engine
+
+
+def test_requests_report_their_statements(engine, query_budget):
+    query_metrics = QueryMetrics()
+    registry = MetricsRegistry()
+    registry.register_collector(query_metrics.collect)
+    app = FastAPI()
+
+    @app.get("/users/{n}")
+    def read_users(n: int):
+        with engine.connect() as conn:
+            for _ in range(n):
+                conn.execute(text("SELECT count(*) FROM users"))
+        return {}
+
+    app.add_middleware(QueryStatsMiddleware, query_metrics=query_metrics, repeat_threshold=3)
+    client = TestClient(app)
+
+    with query_budget(3) as stats:
+        response = client.get("/users/2")
+    assert response.headers["X-DB-Query-Count"] == "2" and stats.count == 2
+    assert float(response.headers["X-DB-Query-Time"]) >= 0
+
+    with pytest.raises(QueryBudgetExceeded, match="4 queries, budget 3"):
+        with query_budget(3):
+            client.get("/users/4")
+
+    rendered = registry.render()
+    assert 'db_queries_per_request_count{method="GET",route="/users/{n}"} 2' in rendered
+    assert 'db_repeated_query_requests_total{method="GET",route="/users/{n}"} 1' in rendered
+
+
+@pytest.fixture
+def seeded(engine, memory_session):
+    """User 1 (an admin, so /service-bookings/ lists everyone's) and rows related to users 2-4."""
+    session = memory_session
+    for user_id, email in [(1, "dealer@example.com"), (2, "farmer@example.com"), (3, "buyer@example.com"), (4, "mechanic@example.com")]:
+        role = UserRole.ADMIN if user_id == 1 else UserRole.FARMER
+        session.add(User(id=user_id, email=email, hashed_password="x", full_name=email.split("@")[0], role=role))
+    square = {"type": "Polygon", "coordinates": [[[0, 0], [0.01, 0], [0.01, 0.01], [0, 0.01], [0, 0]]]}
+    for i in range(3):
+        field = Field(name=f"Field {i}", coordinates=square, owner_id=1)
+        field.land_usage_plans = [LandUsagePlan(plan_name=f"Plan {i}.{n}") for n in range(2)]
+        session.add(field)
+        session.add(Crop(
+            name=f"Crop {i}", user_id=1, field=field, seed_cost_per_hectare=1, fertilizer_cost_per_hectare=1,
+            expected_yield_per_hectare=1, market_price_per_unit=1
+        ))
+        for owner_id in (2, 3):
+            tractor = Tractor(name=f"Tractor {i}", brand="Deere", model="8R", year=2020, price=1, location="Iowa", owner_id=owner_id)
+            session.add(tractor)
+            session.add(ServiceBooking(
+                user_id=owner_id, tractor=tractor, service_provider_id=4,
+                service_type="Oil change", scheduled_date=datetime(2026, 5, 1 + i)
+            ))
+    session.commit()
+
+    service = MessageService()
+    for sender_id in (2, 3):
+        for i in range(3):
+            service.create_message(session, MessageCreate(recipient_id=1, content=f"message {i}"), sender_id=sender_id)
+            service.create_message(session, MessageCreate(recipient_id=sender_id, content=f"reply {i}"), sender_id=1)
+    session.expunge_all() # Nothing related is already in the identity map
+    return session
+
+
+@pytest.fixture
+def client(seeded, memory_client):
+    current_user = seeded.get(User, 1)
+    main_app.dependency_overrides[get_current_active_user] = lambda: current_user
+    return memory_client
+
+
+@pytest.mark.parametrize("path", ENDPOINT_BUDGETS)
+def test_endpoint_query_budgets(client, query_budget, path):
+    with query_budget(ENDPOINT_BUDGETS[path]):
+        response = client.get(path)
+    assert response.status_code == 200 and response.json()
@@ -0,0 +1,200 @@
+import asyncio
+import hashlib
+import socketserver
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.security import create_access_token
+from middleware.rate_limit import (
+    TOKEN_BUCKET_LUA, MemoryBackend, RateLimitMiddleware, RateLimitRule, RedisBackend,
+    TokenBucketLimiter, client_identity, route_key,
+)
+
+
+class LocalRedis(socketserver.ThreadingTCPServer):
+    """
+    Stand-in for a Redis server speaking RESP: enough for redis-py to connect and
+    run the token bucket script, which is executed by a Python port of the Lua.
+    """
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), LocalRedisHandler)
+        self.hashes = {}
+        self.scripts = {}
+        self.lock = threading.Lock()
+        self.url = f"redis://127.0.0.1:{self.server_address[1]}/0"
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def token_bucket(self, key, capacity, refill_per_ms, now):
+        with self.lock: # Scripts run atomically on a real server too
+            bucket = self.hashes.get(key, {})
+            tokens = float(bucket.get("t", capacity))
+            updated_at = float(bucket.get("ts", now))
+            tokens = min(capacity, tokens + max(0, now - updated_at) * refill_per_ms)
+            allowed = 0
+            if tokens >= 1:
+                tokens -= 1
+                allowed = 1
+            self.hashes[key] = {"t": tokens, "ts": now}
+            return [allowed, repr(tokens).encode()]
+
+
+class LocalRedisHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = [self._read_bulk() for _ in range(int(line[1:]))]
+            self.wfile.write(self._reply(command))
+
+    def _read_bulk(self):
+        length = int(self.rfile.readline()[1:])
+        return self.rfile.read(length + 2)[:-2]
+
+    def _reply(self, command):
+        name = command[0].upper()
+        if name == b"PING":
+            return b"+PONG\r\n"
+        if name in (b"SELECT", b"CLIENT"): # Connection setup
+            return b"+OK\r\n"
+        if name == b"SCRIPT" and command[1].upper() == b"LOAD":
+            sha = hashlib.sha1(command[2]).hexdigest()
+            self.server.scripts[sha] = command[2]
+            return f"${len(sha)}\r\n{sha}\r\n".encode()
+        if name == b"EVALSHA":
+            script = self.server.scripts.get(command[1].decode())
+            if script is None:
+                return b"-NOSCRIPT No matching script\r\n"
+            assert script.decode() == TOKEN_BUCKET_LUA
+            key, capacity, refill_per_ms, now = command[3], int(command[4]), float(command[5]), int(command[6])
+            allowed, tokens = self.server.token_bucket(key, capacity, refill_per_ms, now)
+            return f"*2\r\n:{allowed}\r\n${len(tokens)}\r\n".encode() + tokens + b"\r\n"
+        return b"-ERR unknown command\r\n"
+
+
+@pytest.fixture
+def local_redis():
+    server = LocalRedis()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def take_all(backend, times, rule=RateLimitRule("/", "3/second")):
+    limiter = TokenBucketLimiter(backend, [rule])
+
+    async def run():
+        results = []
+        for _ in range(times):
+            results.append(await limiter.hit(rule, "ip:1.2.3.4"))
+        return results
+    return asyncio.run(run())
+
+
+def test_memory_bucket_refills():
+    backend = MemoryBackend()
+    now = 1000.0
+    results = [asyncio.run(backend.take("k", 3, 1.0, now)) for _ in range(4)]
+    assert [allowed for allowed, _ in results] == [True, True, True, False]
+    assert asyncio.run(backend.take("k", 3, 1.0, now + 1.0))[0] # One token back after a second
+    assert not asyncio.run(backend.take("k", 3, 1.0, now + 1.0))[0]
+
+
+def test_shared_store_limits_across_workers(local_redis):
+    async def run():
+        workers = [RedisBackend(local_redis.url), RedisBackend(local_redis.url)]
+        now = time.time()
+        results = [await workers[i % 2].take("k", 4, 1.0, now) for i in range(6)]
+        for worker in workers:
+            await worker.aclose()
+        return results
+
+    results = asyncio.run(run())
+    assert [allowed for allowed, _ in results] == [True] * 4 + [False] * 2
+
+
+def test_store_outage_fails_open():
+    backend = RedisBackend("redis://127.0.0.1:1/0")
+    assert take_all(backend, 5) == [(True, 0.0)] * 5
+
+
+def make_client(rules):
+    app = FastAPI()
+
+    @app.get("/api/items")
+    def items():
+        return []
+
+    @app.get("/api/items/{item_id}")
+    def item(item_id: int):
+        return {}
+
+    @app.get("/api/orders")
+    def orders():
+        return []
+
+    @app.post("/users/login/token")
+    def login():
+        return {}
+
+    app.mount("/socket.io", FastAPI())
+
+    app.add_middleware(RateLimitMiddleware, limiter=TokenBucketLimiter(MemoryBackend(), rules))
+    return TestClient(app)
+
+
+def test_per_route_and_per_user_limits():
+    client = make_client([RateLimitRule("/users/login", "2/minute", ("POST",)), RateLimitRule("/", "3/minute")])
+    assert [client.post("/users/login/token").status_code for _ in range(3)] == [200, 200, 429]
+    # A separate bucket per route: listing still has its own allowance
+    assert [client.get("/api/items").status_code for _ in range(4)] == [200, 200, 200, 429]
+
+    response = client.get("/api/items")
+    assert response.status_code == 429 and 1 <= int(response.headers["Retry-After"]) <= 20
+
+    # ... and per user: an authenticated caller on the same address has a fresh bucket
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'farmer@example.com'})}"}
+    assert client.get("/api/items", headers=headers).status_code == 200
+
+
+def test_buckets_are_per_route_template():
+    client = make_client([RateLimitRule("/api", "2/minute")])
+    # Different ids are the same route, so they share one bucket...
+    assert [client.get(f"/api/items/{i}").status_code for i in range(3)] == [200, 200, 429]
+    # ... while other routes under the same rule prefix have their own
+    assert [client.get(path).status_code for path in ("/api/items", "/api/orders")] == [200, 200]
+
+
+def test_route_key_collapses_ids():
+    assert route_key("GET", "/tractors/42") == route_key("GET", "/tractors/7") == "GET /tractors/{id}"
+    assert route_key("GET", "/files/0b6e2f8e-5a9b-4c1d-9f3e-2a7d6c8b1e40/meta") == "GET /files/{id}/meta"
+    assert route_key("GET", "/tractors/") != route_key("POST", "/tractors/")
+    assert route_key("GET", "/api/v2/items") == "GET /api/v2/items"
+
+
+def test_socket_io_and_static_mounts_are_exempt():
+    client = make_client([RateLimitRule("/", "1/minute")])
+    assert [client.get("/socket.io/").status_code for _ in range(3)] == [404] * 3
+    assert [client.get("/assets/app.js").status_code for _ in range(3)] == [404] * 3
+    assert [client.get("/api/orders").status_code for _ in range(2)] == [200, 429]
+
+
+def test_check_overhead_is_small():
+    limiter = TokenBucketLimiter(MemoryBackend(), [RateLimitRule("/", "1000000/second")])
+    scope = {"type": "http", "method": "GET", "path": "/api/items", "headers": [], "client": ("10.0.0.1", 5000)}
+
+    async def run(n):
+        started = time.perf_counter()
+        for _ in range(n):
+            rule = limiter.rule_for(scope["method"], scope["path"])
+            await limiter.hit(rule, client_identity(scope))
+        return (time.perf_counter() - started) / n
+
+    assert asyncio.run(run(5000)) < 0.0002
@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db_routing import ReplicaSet, RoutingSession
+from app.models.tractor import Tractor
+from app.models.user import User
+from app.schemas.tractor import TractorCreate
+from app.services.tractor_service import TractorService
+
+
+def make_database(memory_engines, *tractor_names):
+    engine = memory_engines()
+    with sessionmaker(bind=engine)() as db:
+        db.add(User(id=1, email="dealer@example.com", hashed_password="x"))
+        db.add_all(
+            Tractor(name=name, brand="Kubota", model="M7", year=2020, price=1000.0, location="Iowa", owner_id=1)
+            for name in tractor_names
+        )
+        db.commit()
+    return engine
+
+
+class FixedLagReplicaSet(ReplicaSet):
+    def __init__(self, engines, lag):
+        super().__init__(engines, max_lag_s=5, check_interval_s=3600)
+        self.lag = lag
+
+    def replica_lag(self, engine):
+        return self.lag
+
+
+@pytest.fixture
+def primary(memory_engines):
+    # Each database holds a differently named tractor, so results show where a read went
+    return make_database(memory_engines, "On primary")
+
+
+@pytest.fixture
+def replica(memory_engines):
+    return make_database(memory_engines, "On replica")
+
+
+def names(tractors):
+    return [t.name for t in tractors]
+
+
+def test_listing_reads_go_to_replica_until_the_session_writes(primary, replica):
+    service = TractorService()
+    replicas = ReplicaSet([replica], max_lag_s=5, check_interval_s=3600)
+    replicas.refresh()
+    with sessionmaker(class_=RoutingSession, bind=primary, replicas=replicas)() as db:
+        assert names(service.get_tractors(db)) == ["On replica"]
+        assert names(service.get_tractors(db=db, limit=10)) == ["On replica"]
+        assert service.get_tractor_by_id(db, 1).name == "On primary" # Not marked @replica_read
+
+        created = service.create_tractor(db, TractorCreate(
+            name="New", brand="Deere", model="5E", year=2024, price=2000.0, location="Iowa"
+        ), owner_id=1)
+        assert created.id in {t.id for t in service.get_tractors(db)} # Reads its own write
+        assert "On replica" not in names(service.get_tractors(db))
+
+    with sessionmaker(class_=RoutingSession, bind=primary, replicas=replicas)() as db:
+        assert names(service.get_tractors(db)) == ["On replica"]
+
+
+@pytest.mark.parametrize("replicas", [
+    lambda replica: FixedLagReplicaSet([replica], lag=60), # Too far behind
+    lambda replica: FixedLagReplicaSet([replica], lag=None), # Unreachable
+    lambda replica: ReplicaSet(
+        [create_engine("sqlite:////nonexistent/dir/replica.db")], max_lag_s=5, check_interval_s=3600
+    ),
+])
+def test_falls_back_to_primary(primary, replica, replicas):
+    replicas = replicas(replica)
+    replicas.refresh()
+    with sessionmaker(class_=RoutingSession, bind=primary, replicas=replicas)() as db:
+        assert names(TractorService().get_tractors(db)) == ["On primary"]
+
+
+def test_replicas_take_turns(replica, memory_engines):
+    second = make_database(memory_engines, "On second replica")
+    replicas = ReplicaSet([replica, second], max_lag_s=5, check_interval_s=3600)
+    replicas.refresh()
+    assert [replicas.choose() for _ in range(4)] == [replica, second, replica, second]
+
+
+def test_reads_use_primary_until_the_first_probe_finishes(replica):
+    # The lag probe runs in the background; requests never wait for it
+    probing, release = threading.Event(), threading.Event()
+
+    class SlowReplicaSet(ReplicaSet):
+        def replica_lag(self, engine):
+            probing.set()
+            release.wait(5)
+            return 0.0
+
+    replicas = SlowReplicaSet([replica], max_lag_s=5, check_interval_s=3600)
+    assert replicas.choose() is None
+    assert probing.wait(5)
+    assert replicas.choose() is None # Still probing: no second probe, no waiting
+
+    release.set()
+    for _ in range(50):
+        if replicas.choose() is not None:
+            break
+        time.sleep(0.1)
+    assert replicas.choose() is replica
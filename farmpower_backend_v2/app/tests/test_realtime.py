@@ -0,0 +1,143 @@
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core import socket_manager
+from app.core.realtime import realtime
+from app.models.field import Field
+from app.models.notification import Notification
+from app.models.user import User, UserRole
+from app.schemas.message import MessageCreate
+from app.schemas.notification import NotificationCreateInternal
+from app.services.message_service import MessageService
+from app.services.notification_service import NotificationService
+
+
+@pytest.fixture
+def session(memory_session):
+    db = memory_session
+    db.add_all([
+        User(id=1, email="dealer@example.com", hashed_password="x"),
+        User(id=2, email="farmer@example.com", hashed_password="x"),
+    ])
+    db.commit()
+    return db
+
+
+@pytest.fixture
+def emitted(monkeypatch):
+    """Run an event loop in a background thread, as uvicorn does, and record emits."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    events = []
+    received = threading.Event()
+
+    async def fake_emit(event_name, data, room=None, **kwargs):
+        events.append((room, event_name, data))
+        received.set()
+
+    monkeypatch.setattr(socket_manager.sio, "emit", fake_emit)
+    realtime.bind_event_loop(loop)
+
+    def wait(count):
+        for _ in range(50):
+            if len(events) >= count:
+                break
+            received.wait(0.1)
+            received.clear()
+        return events
+
+    yield wait
+    realtime.bind_event_loop(None)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_notification_pushed_after_commit(session, emitted):
+    notification = NotificationService().create_notification(
+        session, NotificationCreateInternal(user_id=2, title="Booking confirmed", message="See you Monday")
+    )
+    [(room, event_name, data)] = emitted(1)
+    assert (room, event_name) == ("user_2", "new_notification")
+    assert data["id"] == notification.id and data["title"] == "Booking confirmed"
+
+
+def test_message_pushed_to_both_participants(session, emitted):
+    MessageService().create_message(session, MessageCreate(recipient_id=2, content="Still for sale?"), sender_id=1)
+    events = emitted(3)
+    message_rooms = sorted(room for room, event_name, _ in events if event_name == "new_message")
+    assert message_rooms == ["user_1", "user_2"]
+    assert ("user_2", "new_notification") in [(room, event_name) for room, event_name, _ in events]
+
+
+def test_rolled_back_writes_are_not_pushed(session, emitted):
+    session.add(Notification(user_id=2, title="Draft", message="Never sent"))
+    session.flush()
+    realtime.emit_to_user_after_commit(session, 2, "new_notification", {"id": 1})
+    session.rollback()
+    session.commit()
+    assert emitted(1) == []
+
+
+def test_socket_token_extraction():
+    assert socket_manager._extract_token({}, {"token": "abc"}) == "abc"
+    assert socket_manager._extract_token({"HTTP_AUTHORIZATION": "Bearer xyz"}, None) == "xyz"
+    assert socket_manager._extract_token({"QUERY_STRING": "EIO=4&token=qs"}, None) == "qs"
+    assert socket_manager._extract_token({}, None) is None
+
+
+@pytest.fixture
+def field_socket(session, monkeypatch):
+    """Socket handlers against `session`'s database, recording what they emit, join and write."""
+    session.add_all([
+        User(id=3, email="admin@example.com", hashed_password="x", role=UserRole.ADMIN),
+        Field(id=7, name="North", coordinates={"type": "Polygon", "coordinates": []}, owner_id=1),
+    ])
+    session.commit()
+    monkeypatch.setattr(socket_manager, "SessionLocal", sessionmaker(bind=session.get_bind()))
+    sessions, calls = {}, []
+
+    async def get_session(sid):
+        return sessions[sid]
+
+    async def save_session(sid, data):
+        sessions[sid] = data
+
+    async def record(name, *args, **kwargs):
+        calls.append((name, args[:2]))
+
+    monkeypatch.setattr(socket_manager.sio, "get_session", get_session)
+    monkeypatch.setattr(socket_manager.sio, "save_session", save_session)
+    monkeypatch.setattr(socket_manager.sio, "emit", lambda *a, **k: record("emit", *a))
+    monkeypatch.setattr(socket_manager.sio, "enter_room", lambda *a, **k: record("enter_room", *a))
+    monkeypatch.setattr(socket_manager.track_store, "append", lambda *a: calls.append(("append", a[:2])))
+    monkeypatch.setattr(socket_manager.location_coalescer, "submit", lambda *a: calls.append(("submit", a[:2])))
+
+    def run(handler, user_id, data):
+        sid = f"sid-{user_id}"
+        sessions.setdefault(sid, {"user_id": user_id})
+        calls.clear()
+        asyncio.run(handler(sid, data))
+        return [name if name != "emit" else args[0] for name, args in calls]
+
+    return run
+
+
+def test_only_owner_or_admin_may_follow_a_field(field_socket):
+    join = socket_manager.handle_join_field_room
+    assert field_socket(join, 2, {"field_id": 7}) == ["room_join_error"]
+    assert field_socket(join, 1, {"field_id": "7"}) == ["enter_room", "room_joined_ack"]
+    assert field_socket(join, 3, {"field_id": 7}) == ["enter_room", "room_joined_ack"]
+    assert field_socket(join, 1, {"field_id": 99}) == ["room_join_error"]
+
+
+def test_only_owner_or_admin_may_update_a_field(field_socket):
+    update = socket_manager.handle_update_location
+    fix = {"field_id": 7, "latitude": 41.6, "longitude": -93.6}
+    assert field_socket(update, 2, fix) == ["location_update_error"]
+    assert field_socket(update, 1, fix) == ["append", "submit"]
+    assert field_socket(update, 1, fix) == ["append", "submit"] # Granted fields are remembered per connection
@@ -0,0 +1,92 @@
+from datetime import datetime
+from typing import List
+
+import orjson
+import pytest
+from pydantic import TypeAdapter
+
+from app.core.pagination import Page
+from app.core.responses import encoder_for, list_response
+from app.models.field import Field
+from app.models.land_usage_plan import LandUsagePlan
+from app.models.part import Part
+from app.models.tractor import Tractor
+from app.models.user import User, UserRole
+from app.schemas.field import FieldSchema
+from app.schemas.part import PartCardSchema, PartSchema
+from app.schemas.tractor import TractorCardSchema, TractorSchema
+from app.schemas.user import UserSchema
+
+LISTED = datetime(2026, 5, 1, 8, 30, 15, 250000)
+
+
+def owner() -> User:
+    return User(
+        id=7, email="dealer@example.com", full_name="Dealer", role=UserRole.DEALER,
+        is_active=True, is_banned=False, is_verified=True, created_at=LISTED, updated_at=LISTED
+    )
+
+
+def tractors() -> List[Tractor]:
+    return [
+        Tractor(
+            id=i, name=f"Tractor {i}", brand="Deere", model="8R", year=2020, price=99.5 + i, location="Iowa",
+            description=None if i else "Ünïcode \"quoted\" text", horsepower=None, condition="Used",
+            image_urls=[f"https://cdn.example.com/{i}.jpg"] if i else [],
+            owner_id=7, owner=owner(), created_at=LISTED, updated_at=LISTED,
+        )
+        for i in range(3)
+    ]
+
+
+def parts() -> List[Part]:
+    return [
+        Part(
+            id=i, name=f"Filter {i}", category="Filters", condition="New", price=10.0, quantity=2, location="Iowa",
+            description="text", image_urls=["https://cdn.example.com/a.jpg", "https://cdn.example.com/b.jpg"],
+            seller_id=7, created_at=LISTED, updated_at=LISTED,
+        )
+        for i in range(2)
+    ]
+
+
+def fields() -> List[Field]:
+    square = {"type": "Polygon", "coordinates": [[[0, 0], [0.01, 0], [0.01, 0.01], [0, 0]]]}
+    plan = LandUsagePlan(
+        id=3, field_id=1, plan_name="Spring wheat", plan_details={"crop": "Wheat", "rows": [1, 2]},
+        start_date=LISTED, end_date=None, created_at=LISTED, updated_at=None,
+    )
+    return [Field(
+        id=1, name="North", coordinates=square, area_hectares=1.2, crop_info=None, soil_type="Loam",
+        owner_id=7, owner=owner(), land_usage_plans=[plan], created_at=LISTED, updated_at=LISTED,
+    )]
+
+
+@pytest.mark.parametrize("schema, rows", [
+    (TractorSchema, tractors),
+    (PartSchema, parts),
+    (FieldSchema, fields),
+    (TractorCardSchema, tractors), # Validator: encoded through Pydantic
+    (PartCardSchema, parts),
+])
+def test_encoder_matches_response_model(schema, rows):
+    items = rows()
+    adapter = TypeAdapter(List[schema])
+    expected = adapter.dump_python(adapter.validate_python(items, from_attributes=True), mode="json")
+    assert orjson.loads(encoder_for(schema).dumps(items)) == expected
+
+
+def test_encoder_is_compiled_once_per_schema():
+    encoder = encoder_for(TractorSchema)
+    assert encoder_for(TractorSchema) is encoder
+    assert not encoder.needs_validation and encoder_for(TractorCardSchema).needs_validation
+    # Nested schemas get their own (shared) encoders
+    assert [nested for key, _, nested, _ in encoder.fields if key == "owner"] == [encoder_for(UserSchema)]
+
+
+def test_list_response_sets_cursor_only_for_paged_listings():
+    page = Page(tractors(), next_cursor="abc")
+    response = list_response(page, TractorSchema)
+    assert response.media_type == "application/json"
+    assert response.headers["X-Next-Cursor"] == "abc"
+    assert "X-Next-Cursor" not in list_response(page, TractorSchema, paged=False).headers
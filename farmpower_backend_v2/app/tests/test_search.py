@@ -0,0 +1,119 @@
+import pytest
+
+from app.core.search import InvertedIndex, tokenize, trigram_similarity
+from app.models.user import User
+from app.schemas.tractor import TractorCreate, TractorUpdate
+from app.services.tractor_service import TractorService, TRACTOR_SEARCH_FIELDS
+
+
+@pytest.fixture
+def session(memory_session):
+    db = memory_session
+    db.add(User(id=1, email="dealer@example.com", hashed_password="x"))
+    db.commit()
+    return db
+
+
+def make_tractor(**overrides):
+    data = {
+        "name": "John Deere 8R 410",
+        "brand": "John Deere",
+        "model": "8R 410",
+        "year": 2023,
+        "price": 350000.0,
+        "location": "Iowa, USA",
+        "description": "High-performance 4WD tractor",
+    }
+    data.update(overrides)
+    return TractorCreate(**data)
+
+
+def test_tokenize():
+    assert tokenize("John Deere 8R-410, Iowa") == ["john", "deere", "8r", "410", "iowa"]
+    assert tokenize(None) == []
+
+
+def test_trigram_similarity():
+    assert trigram_similarity("deere", "deere") == 1.0
+    assert trigram_similarity("kubota", "deere") < 0.1
+
+
+def test_index_ranks_weighted_fields_first():
+    index = InvertedIndex(TRACTOR_SEARCH_FIELDS)
+    index.add(1, {"name": "Mahindra 575", "description": "Ideal for small kubota owners"})
+    index.add(2, {"name": "Kubota M7", "brand": "Kubota"})
+    assert [doc_id for doc_id, _ in index.search("kubota")] == [2, 1]
+
+
+def test_index_requires_every_token():
+    index = InvertedIndex(TRACTOR_SEARCH_FIELDS)
+    index.add(1, {"name": "John Deere 5055E", "location": "Punjab"})
+    index.add(2, {"name": "John Deere 8R", "location": "Iowa"})
+    assert [doc_id for doc_id, _ in index.search("deere iowa")] == [2]
+
+
+def test_index_prefix_and_fuzzy_matches():
+    index = InvertedIndex(TRACTOR_SEARCH_FIELDS)
+    index.add(1, {"name": "Massey Ferguson 241"})
+    assert index.search("mass")  # prefix, as typed in a search box
+    assert index.search("fergusen")  # typo
+    assert not index.search("zetor")
+
+
+def test_index_remove_and_reindex():
+    index = InvertedIndex(TRACTOR_SEARCH_FIELDS)
+    index.add(1, {"name": "Case IH Steiger"})
+    index.add(1, {"name": "Case IH Magnum"})
+    assert not index.search("steiger")
+    assert index.search("magnum")
+    index.remove(1)
+    assert len(index) == 0
+    assert not index.search("magnum")
+
+
+def test_search_tractors_sqlite_fallback(session):
+    service = TractorService()
+    deere = service.create_tractor(session, make_tractor(), owner_id=1)
+    case = service.create_tractor(
+        session,
+        make_tractor(name="Case IH Steiger 620", brand="Case IH", model="Steiger 620",
+                     location="Illinois, USA", price=425000.0, description="Articulated tractor"),
+        owner_id=1,
+    )
+
+    assert {t.id for t in service.search_tractors(session, "tractor")} == {deere.id, case.id}
+    assert [t.id for t in service.search_tractors(session, "steiger")] == [case.id]
+    assert [t.id for t in service.search_tractors(session, "tractor", max_price=400000.0)] == [deere.id]
+    assert len(service.search_tractors(session, "tractor", skip=1, limit=1)) == 1
+
+    # Writes through the service keep the index current
+    service.update_tractor(session, deere, TractorUpdate(name="John Deere 9RX"))
+    assert [t.id for t in service.search_tractors(session, "9rx")] == [deere.id]
+    service.delete_tractor(session, case.id)
+    assert service.search_tractors(session, "steiger") == []
+
+
+def test_search_index_picks_up_external_writes(session):
+    service = TractorService()
+    service.create_tractor(session, make_tractor(), owner_id=1)
+    assert service.search_tractors(session, "kubota") == []
+
+    # Written by another worker, i.e. not through this service instance
+    TractorService().create_tractor(
+        session, make_tractor(name="Kubota M7", brand="Kubota", model="M7"), owner_id=1
+    )
+    assert [t.name for t in service.search_tractors(session, "kubota")] == ["Kubota M7"]
+
+
+def test_local_write_after_an_external_one_keeps_both(session):
+    service = TractorService()
+    service.create_tractor(session, make_tractor(), owner_id=1)
+    assert service.search_tractors(session, "kubota") == []
+
+    # Another worker writes, then this one does before its next search: the index
+    # was already behind, so the local write must not mark it current
+    TractorService().create_tractor(
+        session, make_tractor(name="Kubota M7", brand="Kubota", model="M7"), owner_id=1
+    )
+    service.create_tractor(session, make_tractor(name="Kubota L2501", brand="Kubota", model="L2501"), owner_id=1)
+    assert {t.name for t in service.search_tractors(session, "kubota")} == {"Kubota M7", "Kubota L2501"}
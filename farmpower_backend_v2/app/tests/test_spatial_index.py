@@ -0,0 +1,96 @@
+import sys
+
+import numpy as np
+import pytest
+
+from app.core.spatial_index import STRTree, geometry_bounds, geometry_intersects_bbox, parse_bbox, point_in_geometry
+from app.models.user import User
+from app.schemas.field import FieldCreate, FieldUpdate
+from app.services.field_index import FieldIndex
+from app.services.field_service import FieldService
+
+SQUARE_WITH_HOLE = {"type": "Polygon", "coordinates": [
+    [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]],
+    [[4, 4], [6, 4], [6, 6], [4, 6], [4, 4]],
+]}
+TRIANGLE = {"type": "Polygon", "coordinates": [[[0, 0], [10, 0], [0, 10], [0, 0]]]}
+
+
+def box(west, south, east, north):
+    return {"type": "Polygon", "coordinates": [[[west, south], [east, south], [east, north], [west, north], [west, south]]]}
+
+
+@pytest.fixture
+def session(memory_session):
+    db = memory_session
+    db.add_all([
+        User(id=1, email="farmer@example.com", hashed_password="x"),
+        User(id=2, email="neighbour@example.com", hashed_password="x"),
+    ])
+    db.commit()
+    return db
+
+
+@pytest.fixture
+def service(monkeypatch):
+    # A fresh index per test instead of the process-wide one
+    monkeypatch.setattr(sys.modules["app.services.field_service"], "field_index", FieldIndex(max_age_s=3600))
+    return FieldService()
+
+
+@pytest.mark.parametrize("count", [0, 1, 16, 17, 5000])
+def test_tree_matches_brute_force(count):
+    rng = np.random.default_rng(count)
+    lon, lat = rng.uniform(-100, -80, count), rng.uniform(30, 50, count)
+    size = rng.uniform(0.001, 0.5, count)
+    boxes = np.column_stack([lon, lat, lon + size, lat + size])
+    tree = STRTree(boxes)
+    for query in [(-90, 40, -89, 41), (-100, 30, -80, 50), (0, 0, 1, 1), (-95.5, 35.5, -95.5, 35.5)]:
+        expected = np.nonzero(
+            (boxes[:, 0] <= query[2]) & (boxes[:, 2] >= query[0]) & (boxes[:, 1] <= query[3]) & (boxes[:, 3] >= query[1])
+        )[0]
+        assert np.array_equal(np.sort(tree.query(query)), expected)
+
+
+def test_exact_predicates():
+    assert geometry_bounds(SQUARE_WITH_HOLE) == (0, 0, 10, 10)
+    assert geometry_bounds({"type": "Point", "coordinates": [0, 0]}) is None
+
+    assert point_in_geometry(SQUARE_WITH_HOLE, 1, 1)
+    assert not point_in_geometry(SQUARE_WITH_HOLE, 5, 5)  # In the hole
+    assert not point_in_geometry(TRIANGLE, 8, 8)  # In the bbox only
+
+    assert geometry_intersects_bbox(SQUARE_WITH_HOLE, (1, 1, 2, 2))  # Box inside the polygon
+    assert geometry_intersects_bbox(SQUARE_WITH_HOLE, (-5, -5, 20, 20))  # Polygon inside the box
+    assert geometry_intersects_bbox(SQUARE_WITH_HOLE, (5, 5, 7, 5.5))  # Crosses the hole's edge
+    assert not geometry_intersects_bbox(SQUARE_WITH_HOLE, (4.5, 4.5, 5.5, 5.5))
+    assert not geometry_intersects_bbox(TRIANGLE, (6, 6, 9, 9))
+
+
+def test_parse_bbox():
+    assert parse_bbox("-93.7,41.9,-93.4,42.1") == [(-93.7, 41.9, -93.4, 42.1)]
+    assert parse_bbox("170,-20,-170,-10") == [(170, -20, 180, -10), (-180, -20, -170, -10)]
+    for bad in ["1,2,3", "a,b,c,d", "0,50,1,40", "0,0,200,1", "nan,0,1,1"]:
+        with pytest.raises(ValueError):
+            parse_bbox(bad)
+
+
+def test_search_and_locate(session, service):
+    north = service.create_field(session, FieldCreate(name="North", coordinates=box(-93.5, 42.0, -93.4, 42.1)), owner_id=1)
+    service.create_field(session, FieldCreate(name="Corner", coordinates=TRIANGLE), owner_id=1)
+    service.create_field(session, FieldCreate(name="Pin", coordinates={"type": "Point", "coordinates": [-93.45, 42.05]}), owner_id=1)
+    service.create_field(session, FieldCreate(name="Neighbour", coordinates=box(-93.5, 42.0, -93.4, 42.1)), owner_id=2)
+
+    assert (north.min_lon, north.min_lat, north.max_lon, north.max_lat) == (-93.5, 42.0, -93.4, 42.1)
+    assert [f.name for f in service.locate_fields(session, -93.45, 42.05, owner_id=1)] == ["North"]
+    assert [f.name for f in service.locate_fields(session, -93.45, 42.05, owner_id=2)] == ["Neighbour"]
+    assert service.locate_fields(session, 8, 8, owner_id=1) == []
+    assert [f.name for f in service.search_fields_in_bbox(session, parse_bbox("-100,0,10,50"), owner_id=1)] == ["Corner", "North"]
+    assert [f.name for f in service.search_fields_in_bbox(session, parse_bbox("-100,0,10,50"), owner_id=1, limit=1)] == ["Corner"]
+
+    # Writes invalidate the index
+    service.update_field(session, north, FieldUpdate(coordinates=box(10, 50, 10.1, 50.1)))
+    assert service.locate_fields(session, -93.45, 42.05, owner_id=1) == []
+    assert [f.name for f in service.locate_fields(session, 10.05, 50.05, owner_id=1)] == ["North"]
+    service.delete_field(session, north.id)
+    assert service.locate_fields(session, 10.05, 50.05, owner_id=1) == []
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwk, jwt
+
+from utils.supabase_jwt import InvalidTokenError, SupabaseTokenVerifier
+
+ISSUER = "https://project.supabase.co/auth/v1"
+
+
+class LocalJWKSServer:
+    """Stand-in for a Supabase project's /.well-known/jwks.json endpoint."""
+
+    def __init__(self):
+        self.keys = {}
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                body = json.dumps({"keys": [public for _, public in server.keys.values()]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}/auth/v1/.well-known/jwks.json"
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def rotate(self, kid):
+        private = ec.generate_private_key(ec.SECP256R1()).private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        )
+        public = jwk.construct(private, "ES256").public_key().to_dict()
+        self.keys[kid] = (private, {**public, "kid": kid, "alg": "ES256", "use": "sig"})
+
+    def sign(self, kid, **claims):
+        claims = {"sub": "user-1", "email": "farmer@example.com", "role": "authenticated",
+                  "aud": "authenticated", "iss": ISSUER, "exp": int(time.time()) + 3600, **claims}
+        return jwt.encode(claims, self.keys[kid][0], algorithm="ES256", headers={"kid": kid})
+
+    def close(self):
+        self._httpd.shutdown()
+
+
+@pytest.fixture
+def jwks_server():
+    server = LocalJWKSServer()
+    server.rotate("key-1")
+    yield server
+    server.close()
+
+
+def remote_calls():
+    calls = []
+
+    def remote_verify(token):
+        calls.append(token)
+        return {"id": "user-1", "email": "farmer@example.com"}
+    return calls, remote_verify
+
+
+def verify_all(verifier, *tokens):
+    async def run():
+        try:
+            return [await verifier.verify(token) for token in tokens]
+        finally:
+            await verifier.aclose()
+    return asyncio.run(run())
+
+
+def test_verifies_locally_and_caches(jwks_server):
+    calls, remote_verify = remote_calls()
+    verifier = SupabaseTokenVerifier(jwks_server.url, issuer=ISSUER, remote_verify=remote_verify)
+    token = jwks_server.sign("key-1")
+    first, second = verify_all(verifier, token, token)
+    assert first == second and first["id"] == "user-1" and first["email"] == "farmer@example.com"
+    assert calls == [] and jwks_server.requests == 1
+    assert verifier.stats()["local_verifications"] == 1 and verifier.stats()["cache_hits"] == 1
+
+
+def test_rejects_expired_forged_and_foreign_tokens(jwks_server):
+    verifier = SupabaseTokenVerifier(jwks_server.url, issuer=ISSUER)
+    bad = [
+        jwks_server.sign("key-1", exp=int(time.time()) - 10),
+        jwks_server.sign("key-1", aud="anon-elsewhere"),
+        jwks_server.sign("key-1", iss="https://other.supabase.co/auth/v1"),
+        jwks_server.sign("key-1")[:-4] + "AAAA",
+        "not-a-jwt",
+    ]
+    for token in bad:
+        with pytest.raises(InvalidTokenError):
+            verify_all(verifier, token)
+
+
+def test_key_rotation_refetches_the_jwks(jwks_server):
+    verifier = SupabaseTokenVerifier(jwks_server.url, issuer=ISSUER, min_refetch_interval_s=0)
+    verify_all(verifier, jwks_server.sign("key-1"))
+    jwks_server.rotate("key-2")
+    assert verify_all(verifier, jwks_server.sign("key-2"))[0]["id"] == "user-1"
+    assert jwks_server.requests == 2
+
+
+def test_shared_secret_and_remote_fallback(jwks_server):
+    calls, remote_verify = remote_calls()
+    verifier = SupabaseTokenVerifier(jwks_server.url, jwt_secret="s3cret", remote_verify=remote_verify)
+    claims = {"sub": "user-2", "aud": "authenticated", "exp": int(time.time()) + 60}
+    assert verify_all(verifier, jwt.encode(claims, "s3cret", algorithm="HS256"))[0]["id"] == "user-2"
+    assert calls == []
+
+    verifier.jwt_secret = None # Legacy project without the secret configured: ask Supabase once
+    token = jwt.encode(claims, "other", algorithm="HS256")
+    verify_all(verifier, token, token)
+    assert calls == [token]
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.track_store import TrackStore, decode_track, encode_track, to_epoch_ms
+from app.models.field import Field
+from app.models.gps_track import GpsTrackSegment
+from app.models.user import User
+from app.services.track_service import TrackService
+
+T0 = datetime(2025, 6, 1, 12, 0)
+
+
+@pytest.fixture
+def session(memory_session):
+    db = memory_session
+    db.add(User(id=1, email="farmer@example.com", hashed_password="x"))
+    db.add(Field(id=1, name="North", owner_id=1, coordinates={"type": "Polygon", "coordinates": []}))
+    db.commit()
+    return db
+
+
+def drive(store, device_id, count, field_id=1, start=T0, hz=1):
+    # A tractor moving north-east in ~1 m steps
+    for i in range(count):
+        store.append(field_id, device_id, start + timedelta(seconds=i / hz), 41.9 + i * 1e-5, -93.1 + i * 1e-5)
+
+
+def test_codec_round_trip_and_compression():
+    times = [1717243200000 + i * 1000 for i in range(1000)]
+    lats = [419000000 + i * 90 for i in range(1000)]
+    lons = [-931000000 - i * 120 for i in range(1000)]
+    data = encode_track(times, lats, lons)
+    assert [list(column) for column in decode_track(data)] == [times, lats, lons]
+    assert len(data) < 1000 * 3  # Under 3 bytes per point vs 24 raw
+
+
+def test_store_seals_full_segments_and_rejects_late_fixes():
+    saved = []
+    store = TrackStore(saved.extend, segment_max_points=100)
+    drive(store, "tractor-a", 250)
+    assert not store.append(1, "tractor-a", T0, 41.9, -93.1)
+    assert store.flush() == 3
+    assert [s.point_count for s in saved] == [100, 100, 50]
+    assert saved[0].start_time == T0 and saved[0].end_time == T0 + timedelta(seconds=99)
+
+
+def test_failed_save_is_retried():
+    attempts = []
+
+    def flaky_save(segments):
+        attempts.append(len(segments))
+        if len(attempts) == 1:
+            raise ConnectionError("database unavailable")
+
+    store = TrackStore(flaky_save)
+    drive(store, "tractor-a", 10)
+    assert store.flush() == 0
+    assert store.flush() == 1
+    assert attempts == [1, 1]
+
+
+def test_replay_window_downsampled_and_merged_with_pending(session):
+    service = TrackService()
+    store = TrackStore(lambda segments: service.save_segments(session, segments), segment_max_points=500)
+    drive(store, "tractor-a", 3600)  # One hour at 1 Hz
+    drive(store, "tractor-b", 600)
+    drive(store, "tractor-c", 10, field_id=999)  # Unknown field: discarded on save
+    store.flush()
+    assert session.query(GpsTrackSegment).count() == 10  # 8 + 2 segments of up to 500 points
+    drive(store, "tractor-b", 60, start=T0 + timedelta(minutes=10))  # Not flushed yet
+
+    start, end = T0 + timedelta(minutes=5), T0 + timedelta(minutes=15)
+    pending = store.pending_points(1, to_epoch_ms(start), to_epoch_ms(end))
+    points = list(service.iter_track_points(session, 1, start, end, max_points=60, pending=pending))
+
+    per_device = {}
+    for point in points:
+        assert start <= point.timestamp <= end
+        per_device.setdefault(point.device_id, []).append(point)
+    assert set(per_device) == {"tractor-a", "tractor-b"}
+    assert len(per_device["tractor-a"]) == 61  # One per 10 s bucket, both ends inclusive
+    assert per_device["tractor-b"][-1].timestamp == T0 + timedelta(minutes=10, seconds=50)
+
+    only_a = list(service.iter_track_points(session, 1, start, end, device_id="tractor-a", max_points=60))
+    assert {p.device_id for p in only_a} == {"tractor-a"}
+    assert only_a[0].latitude == pytest.approx(41.9 + 300 * 1e-5)
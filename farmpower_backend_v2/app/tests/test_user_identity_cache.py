@@ -0,0 +1,107 @@
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.core.dependencies import get_current_user
+from app.core.security import create_access_token
+from app.models.user import User
+from app.schemas.user import UserUpdate
+from app.services.admin_service import AdminService
+from app.services.user_identity_cache import UserIdentityCache
+from app.services.user_service import UserService
+
+
+@pytest.fixture
+def make_session(memory_engine, memory_sessions):
+    factory = memory_sessions
+    with factory() as db:
+        db.add_all([
+            User(id=1, email="farmer@example.com", hashed_password="x", full_name="Farmer"),
+            User(id=2, email="dealer@example.com", hashed_password="x"),
+        ])
+        db.commit()
+    queries = []
+    event.listen(memory_engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    factory.queries = queries
+    return factory
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    # A fresh cache per test instead of the process-wide one
+    cache = UserIdentityCache(max_entries=100, ttl_s=60)
+    for module in ("app.core.dependencies", "app.services.user_service", "app.services.admin_service"):
+        monkeypatch.setattr(sys.modules[module], "user_identity_cache", cache)
+    return cache
+
+
+def authenticate(make_session, email):
+    with make_session() as db:
+        user = get_current_user(token=create_access_token({"sub": email}), db=db)
+        assert user in db
+        return user.id, user.full_name, user.is_banned
+
+
+def test_repeat_requests_skip_the_user_query(make_session, cache):
+    assert authenticate(make_session, "farmer@example.com") == (1, "Farmer", False)
+    make_session.queries.clear()
+    assert authenticate(make_session, "farmer@example.com") == (1, "Farmer", False)
+    assert make_session.queries == []
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_writes_invalidate(make_session, cache):
+    authenticate(make_session, "farmer@example.com")
+    with make_session() as db:
+        AdminService().ban_user(db, 1)
+    assert authenticate(make_session, "farmer@example.com")[2] is True
+
+    with make_session() as db:
+        UserService().update_user(db, db.get(User, 1), UserUpdate(full_name="Renamed"))
+    assert authenticate(make_session, "farmer@example.com")[1] == "Renamed"
+
+    with make_session() as db:
+        UserService().delete_user(db, 1)
+    with pytest.raises(Exception) as exc_info:
+        authenticate(make_session, "farmer@example.com")
+    assert exc_info.value.status_code == 401
+
+
+def test_expired_otp_cleanup_invalidates(make_session, cache):
+    with make_session() as db:
+        db.get(User, 1).otp_secret = "hashed"
+        db.commit()
+    with make_session() as db:
+        assert get_current_user(token=create_access_token({"sub": "farmer@example.com"}), db=db).otp_secret == "hashed"
+
+    with make_session() as db:
+        user = db.get(User, 1)
+        user.otp_expiry = datetime.now(timezone.utc) - timedelta(minutes=1)
+        assert UserService().verify_user_otp(db, user, "123456") is False
+    with make_session() as db:
+        assert get_current_user(token=create_access_token({"sub": "farmer@example.com"}), db=db).otp_secret is None
+
+
+def test_row_loaded_before_an_invalidation_is_not_cached(make_session, cache):
+    with make_session() as db:
+        generation = cache.generation
+        user = db.get(User, 1)
+        cache.invalidate_user(db, 1) # A concurrent ban landing mid-request
+        cache.put(user.email, user, generation)
+    make_session.queries.clear()
+    authenticate(make_session, "farmer@example.com")
+    assert make_session.queries # Loaded again
+
+
+def test_lru_and_ttl(make_session, cache):
+    cache.max_entries = 1
+    authenticate(make_session, "farmer@example.com")
+    authenticate(make_session, "dealer@example.com")
+    assert cache.stats()["entries"] == 1 and cache.stats()["evictions"] == 1
+
+    cache.ttl = 0
+    make_session.queries.clear()
+    authenticate(make_session, "dealer@example.com")
+    assert make_session.queries
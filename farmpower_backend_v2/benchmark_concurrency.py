@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark: throughput of a route as the number of in-flight requests grows.
+
+With sync DB access in `def` handlers, each request waits for the database on a
+threadpool worker while the event loop keeps accepting others, so throughput should
+grow with concurrency until the threadpool or DB pool is exhausted. An `async def`
+handler making the same sync calls holds the event loop for every round-trip and
+stays flat at the single-request rate.
+
+Self-contained (default): the real /fields router on a temporary SQLite database,
+with every query delayed by --db-latency-ms to stand in for network round-trips.
+The same handler is also mounted as `async def` for comparison.
+
+    python benchmark_concurrency.py
+    python benchmark_concurrency.py --concurrency 1,8,32 --requests 400 --db-latency-ms 5
+
+Against a running server:
+
+    python benchmark_concurrency.py --url http://localhost:8000/fields/ --token <JWT>
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+async def measure(client: httpx.AsyncClient, url: str, concurrency: int, total: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.get(url)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+def build_self_contained_app(db_latency_s: float, field_count: int):
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import Session, sessionmaker
+
+    from app.core.db import Base, get_db
+    from app.core.dependencies import get_current_active_user
+    from app.models.field import Field
+    from app.models.user import User
+    from app.routers import fields as field_router
+    from app.schemas.field import FieldSchema
+    from app.services import field_service
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False}, pool_size=64)
+    Base.metadata.create_all(bind=engine)
+    BenchSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with BenchSession() as db:
+        user = User(id=1, email="bench@example.com", hashed_password="x", is_active=True)
+        db.add(user)
+        db.add_all(
+            Field(name=f"Field {i:05d}", owner_id=1, coordinates={"type": "Polygon", "coordinates": []})
+            for i in range(field_count)
+        )
+        db.commit()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def simulate_round_trip(*args):
+        time.sleep(db_latency_s)
+
+    def bench_db():
+        db = BenchSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def bench_user(db: Session = Depends(bench_db)):
+        return db.get(User, 1)
+
+    app = FastAPI()
+    app.include_router(field_router.router)
+
+    @app.get("/blocking/fields/", response_model=List[FieldSchema])
+    async def list_fields_on_event_loop(db: Session = Depends(bench_db), current_user=Depends(bench_user)):
+        # The pre-change execution model: sync session calls inside async def
+        return list(field_service.get_fields_by_owner(db=db, owner_id=current_user.id, limit=10))
+
+    app.dependency_overrides[get_db] = bench_db
+    app.dependency_overrides[get_current_active_user] = bench_user
+    return app
+
+
+def print_table(title: str, rows: List[Dict[str, float]]) -> None:
+    print(title)
+    print(f"  {'in-flight':>9} {'req/s':>9} {'p50':>9} {'p95':>9} {'errors':>7}")
+    for row in rows:
+        print(
+            f"  {row['concurrency']:>9} {row['rps']:>9.1f} {row['p50_ms']:>6.1f} ms {row['p95_ms']:>6.1f} ms {row['errors']:>7}"
+        )
+
+
+async def run(args) -> None:
+    levels = [int(level) for level in args.concurrency.split(",")]
+    if args.url:
+        headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+        async with httpx.AsyncClient(headers=headers, timeout=60, limits=httpx.Limits(max_connections=max(levels))) as client:
+            rows = [await measure(client, args.url, level, args.requests) for level in levels]
+        print_table(args.url, rows)
+        return
+
+    os.environ.setdefault("TESTING", "True") # App modules' own engine on SQLite; the benchmark uses its own
+    import anyio.to_thread
+    from app.core.config import settings
+
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    app = build_self_contained_app(args.db_latency_ms / 1000, field_count=200)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        for title, path in [("def handler (threadpool)", "/fields/"), ("async def handler (event loop)", "/blocking/fields/")]:
+            rows = [await measure(client, path, level, args.requests) for level in levels]
+            print_table(f"{title}, {args.db_latency_ms} ms per query:", rows)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Benchmark this URL on a running server instead of the in-process app")
+    parser.add_argument("--token", help="Bearer token for --url")
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32", help="Comma-separated in-flight request counts")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per concurrency level")
+    parser.add_argument("--db-latency-ms", type=float, default=2.0, help="Simulated time per query (self-contained mode)")
+    asyncio.run(run(parser.parse_args(argv)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+JSON encoding benchmark: time to turn a page of ORM rows into response bytes.
+
+Compares, on realistic tractor (owner embedded) and part pages:
+
+- jsonable_encoder + json.dumps: returning plain data without a response model
+- validate + dump + json.dumps: FastAPI's response_model path up to 0.1xx (the
+  pinned 0.109), ending in JSONResponse
+- validate + dump + orjson: the same with ORJSONResponse as the response class
+- validate + dump_json: newer FastAPI's response_model path, Pydantic writing bytes
+- RowEncoder + orjson: app.core.responses.list_response, no re-validation
+
+Pure CPU, no database: the rows are built in memory, as a query would return them.
+
+    python benchmark_json_encoding.py
+    python benchmark_json_encoding.py --rows 50 --repeat 200
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def build_rows(count: int):
+    from app.models.part import Part
+    from app.models.tractor import Tractor
+    from app.models.user import User, UserRole
+
+    listed = datetime(2026, 5, 1, 8, 30)
+    sellers = [
+        User(id=i, email=f"seller{i}@example.com", full_name=f"Seller {i}", role=UserRole.DEALER,
+             is_active=True, is_banned=False, is_verified=True, created_at=listed, updated_at=listed)
+        for i in range(1, 21)
+    ]
+    images = lambda kind, i: [f"https://cdn.example.com/{kind}/{i}/{n}.jpg" for n in range(5)]
+    tractors = [
+        Tractor(
+            id=i, name=f"John Deere 8R {i}", brand="John Deere", model="8R 410", year=2020 + i % 5,
+            price=250000.0 + i, location="Iowa, USA", horsepower=410, condition="Used",
+            description="Well maintained, full service history, new tyres. " * 10, image_urls=images("tractors", i),
+            owner_id=sellers[i % 20].id, owner=sellers[i % 20],
+            created_at=listed + timedelta(minutes=i), updated_at=listed + timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+    parts = [
+        Part(
+            id=i, name=f"Hydraulic filter {i}", category="Filters", brand="Fleetguard", part_number=f"HF{i:05d}",
+            price=45.5 + i, location="Iowa, USA", condition="New", quantity=3,
+            description="OEM replacement hydraulic filter. " * 10, image_urls=images("parts", i),
+            seller_id=sellers[i % 20].id, created_at=listed + timedelta(minutes=i), updated_at=listed + timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+    return tractors, parts
+
+
+def encoders(schema):
+    from typing import List as ListOf
+
+    import orjson
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+
+    from app.core.responses import ORJSON_OPTIONS, encoder_for
+
+    adapter = TypeAdapter(ListOf[schema])
+    validate = lambda rows: adapter.validate_python(rows, from_attributes=True)
+    dump = lambda rows: adapter.dump_python(validate(rows), mode="json")
+    # JSONResponse.render's arguments
+    json_dumps = lambda content: json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+    return [
+        ("jsonable_encoder + json.dumps", lambda rows: json_dumps(jsonable_encoder(validate(rows)))),
+        ("validate + dump + json.dumps", lambda rows: json_dumps(dump(rows))),
+        ("validate + dump + orjson", lambda rows: orjson.dumps(dump(rows), option=ORJSON_OPTIONS)),
+        ("validate + dump_json", lambda rows: adapter.dump_json(validate(rows))),
+        ("RowEncoder + orjson", encoder_for(schema).dumps),
+    ]
+
+
+def measure(encode: Callable, rows, repeat: int) -> float:
+    encode(rows) # Warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        encode(rows)
+    return (time.perf_counter() - started) / repeat
+
+
+def run(args) -> None:
+    os.environ.setdefault("TESTING", "True")
+    from app.schemas.part import PartSchema
+    from app.schemas.tractor import TractorSchema
+
+    tractors, parts = build_rows(args.rows)
+    for title, schema, rows in [("tractors (owner embedded)", TractorSchema, tractors), ("parts", PartSchema, parts)]:
+        print(f"{args.rows} {title}, mean of {args.repeat}:")
+        baseline = None
+        for label, encode in encoders(schema):
+            seconds = measure(encode, rows, args.repeat)
+            baseline = baseline or seconds
+            print(f"  {label:<30} {seconds * 1000:>7.2f} ms  {baseline / seconds:>5.1f}x")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200, help="Rows per page")
+    parser.add_argument("--repeat", type=int, default=50, help="Encodings per path")
+    run(parser.parse_args(argv))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Logging benchmark: time each request spends logging on the event loop thread.
+
+performance_middleware logs one "Request completed" line per request. Before,
+the root logger wrote it synchronously to the console, a rotating file and a
+rotating JSON file. Now setup_logging only queues the record and a background
+thread writes it. This times that log call, as the middleware makes it, under
+each configuration while the writer thread runs alongside.
+
+Writes go to a temporary directory and /dev/null, which never block; each
+handler write is delayed by --io-latency-us to stand in for a busy disk or a
+container log pipe applying backpressure.
+
+    python benchmark_logging.py
+    python benchmark_logging.py --requests 20000 --sample-rate 0.1 --io-latency-us 0
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def slow_handlers(build_handlers, io_latency_s: float):
+    def build(*args, **kwargs):
+        handlers = build_handlers(*args, **kwargs)
+        for handler in handlers:
+            def emit(record, write=handler.emit):
+                time.sleep(io_latency_s)
+                write(record)
+            handler.emit = emit
+        return handlers
+    return build
+
+
+def configure(mode: str, log_dir: Path) -> None:
+    from app.core import logging as app_logging
+
+    app_logging.shutdown_logging()
+    root = logging.getLogger()
+    root.handlers = []
+    root.setLevel(logging.INFO)
+    if mode == "synchronous":
+        # The previous setup: every handler attached to the root logger
+        for handler in app_logging.build_handlers("bench", log_dir):
+            root.addHandler(handler)
+    elif mode == "queued":
+        app_logging.setup_logging("bench", log_dir=log_dir)
+
+
+def log_requests(total: int) -> float:
+    """Mean seconds per request spent in performance_middleware's log call."""
+    from app.core.logging import should_log_request
+
+    started = time.perf_counter()
+    for i in range(total):
+        if should_log_request(200, 0.002):
+            logging.info(
+                "Request completed",
+                extra={"request_id": f"{i:032x}", "method": "GET", "path": "/tractors/", "duration_ms": 2.0, "status_code": 200},
+            )
+    return (time.perf_counter() - started) / total
+
+
+def run(args) -> None:
+    os.environ.setdefault("TESTING", "True")
+    from app.core import logging as app_logging
+    from app.core.config import settings
+
+    if args.io_latency_us > 0:
+        app_logging.build_handlers = slow_handlers(app_logging.build_handlers, args.io_latency_us / 1e6)
+    settings.LOG_QUEUE_SIZE = max(settings.LOG_QUEUE_SIZE, args.requests) # Measure queueing, not dropping
+    log_dir = Path(tempfile.mkdtemp())
+    console, sys.stdout = sys.stdout, open(os.devnull, "w") # The console handler writes here
+
+    results = {}
+    try:
+        for label, mode, sample_rate in [
+            ("synchronous handlers (before)", "synchronous", 1.0),
+            ("queue + writer thread (after)", "queued", 1.0),
+            (f"queue, {args.sample_rate:.0%} of successes", "queued", args.sample_rate),
+        ]:
+            settings.LOG_SUCCESS_SAMPLE_RATE = sample_rate
+            configure(mode, log_dir)
+            results[label] = log_requests(args.requests)
+    finally:
+        configure("off", log_dir)
+        sys.stdout.close()
+        sys.stdout = console
+
+    print(f"{args.requests} requests, {args.io_latency_us:g} us per log write; logging time per request on the event loop:")
+    for label, seconds in results.items():
+        print(f"  {label:<34} {seconds * 1e6:>8.1f} us")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="Requests (log calls) per configuration")
+    parser.add_argument("--sample-rate", type=float, default=0.1, help="LOG_SUCCESS_SAMPLE_RATE for the sampled run")
+    parser.add_argument("--io-latency-us", type=float, default=100, help="Simulated time per handler write")
+    run(parser.parse_args(argv))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Login benchmark: logins per second per core, and what happens past saturation.
+
+Each login spends ~250ms of CPU in bcrypt. Hashing runs on a bounded pool
+(PASSWORD_HASH_WORKERS, one per core by default) with PASSWORD_HASH_MAX_QUEUE
+waiting slots; once both are full further logins get an immediate 503 instead
+of queueing, so throughput should plateau at about `cores / bcrypt time` with
+p95 latency bounded by the queue, and the excess shows up as 503s.
+
+Self-contained (default): the real /users/login/token route on a temporary
+SQLite database. Also reports OTP hash + verify throughput (HMAC, not bcrypt).
+
+    python benchmark_login.py
+    python benchmark_login.py --concurrency 1,4,16,64 --requests 200
+
+Against a running server (the account must exist and be verified):
+
+    python benchmark_login.py --url http://localhost:8000/users/login/token --email a@b.c --password secret
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "correct horse battery staple"
+
+
+async def measure(client: httpx.AsyncClient, url: str, form: Dict[str, str], concurrency: int, total: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    rejected = errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal rejected, errors
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.post(url, data=form)
+            if response.status_code == 503:
+                rejected += 1
+            elif response.status_code >= 400:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "logins_per_s": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000 if latencies else 0.0,
+        "rejected": rejected,
+        "errors": errors,
+    }
+
+
+def build_self_contained_app():
+    from fastapi import FastAPI
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.db import Base, get_db
+    from app.core.hashing import HashingPoolSaturated, hashing_pool_saturated_handler
+    from app.core.security import get_password_hash
+    from app.models.user import User
+    from app.routers import users as user_router
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False}, pool_size=64)
+    Base.metadata.create_all(bind=engine)
+    BenchSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with BenchSession() as db:
+        db.add(User(email=BENCH_EMAIL, hashed_password=get_password_hash(BENCH_PASSWORD), is_active=True, is_verified=True))
+        db.commit()
+
+    def bench_db():
+        db = BenchSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(user_router.router)
+    app.add_exception_handler(HashingPoolSaturated, hashing_pool_saturated_handler)
+    app.dependency_overrides[get_db] = bench_db
+    return app
+
+
+def otp_throughput(rounds: int = 20000) -> float:
+    from app.core.security import get_otp_hash, verify_otp
+
+    started = time.perf_counter()
+    for i in range(rounds):
+        assert verify_otp("123456", get_otp_hash("123456"))
+    return rounds / (time.perf_counter() - started)
+
+
+def print_table(title: str, rows: List[Dict[str, float]], cores: int) -> None:
+    print(title)
+    print(f"  {'in-flight':>9} {'logins/s':>9} {'per core':>9} {'p50':>9} {'p95':>9} {'503s':>6} {'errors':>7}")
+    for row in rows:
+        print(
+            f"  {row['concurrency']:>9} {row['logins_per_s']:>9.1f} {row['logins_per_s'] / cores:>9.1f} "
+            f"{row['p50_ms']:>6.0f} ms {row['p95_ms']:>6.0f} ms {row['rejected']:>6} {row['errors']:>7}"
+        )
+
+
+async def run(args) -> None:
+    levels = [int(level) for level in args.concurrency.split(",")]
+    cores = os.cpu_count() or 1
+    if args.url:
+        form = {"username": args.email, "password": args.password}
+        async with httpx.AsyncClient(timeout=60, limits=httpx.Limits(max_connections=max(levels))) as client:
+            rows = [await measure(client, args.url, form, level, args.requests) for level in levels]
+        print_table(args.url, rows, cores)
+        return
+
+    os.environ.setdefault("TESTING", "True") # App modules' own engine on SQLite; the benchmark uses its own
+    import anyio.to_thread
+    from app.core.config import settings
+    from app.core.hashing import password_hashing_pool
+
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    app = build_self_contained_app()
+    form = {"username": BENCH_EMAIL, "password": BENCH_PASSWORD}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        rows = [await measure(client, "/users/login/token", form, level, args.requests) for level in levels]
+    print_table(
+        f"POST /users/login/token, {cores} cores, {password_hashing_pool.workers} hash workers, "
+        f"{password_hashing_pool.max_queue} queued:",
+        rows, cores,
+    )
+    print(f"OTP hash + verify: {otp_throughput():,.0f}/s on one core")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Benchmark this login URL on a running server instead of the in-process app")
+    parser.add_argument("--email", help="Account for --url")
+    parser.add_argument("--password", help="Password for --url")
+    parser.add_argument("--concurrency", default="1,2,4,16,64", help="Comma-separated in-flight login counts")
+    parser.add_argument("--requests", type=int, default=64, help="Logins per concurrency level")
+    asyncio.run(run(parser.parse_args(argv)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
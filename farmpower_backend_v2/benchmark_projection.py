@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Sparse fieldset benchmark: time and response size of a listing page, full vs `fields=`.
+
+The full /marketplace/tractors page loads whole rows plus owners and serializes
+every TractorSchema field, including the description and image list. With
+`fields=card` or `fields=id,name,price` only the needed columns are selected,
+hydrated and encoded.
+
+Self-contained (default): the real marketplace router on a temporary SQLite
+database with --tractors listings, each with a ~2 KB description and 5 images.
+
+    python benchmark_projection.py
+    python benchmark_projection.py --tractors 2000 --limit 200 --requests 100
+
+Against a running server:
+
+    python benchmark_projection.py --url http://localhost:8000/marketplace/tractors
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+VARIANTS = [("full rows", None), ("fields=card", "card"), ("fields=id,name,price", "id,name,price")]
+
+
+def build_self_contained_app(tractor_count: int):
+    from fastapi import FastAPI
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app import database
+    from app.core.db import Base
+    from app.models.tractor import Tractor
+    from app.models.user import User
+    from app.routers import marketplace
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    BenchSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with BenchSession() as db:
+        db.add_all(User(id=i, email=f"seller{i}@example.com", hashed_password="x") for i in range(1, 51))
+        db.add_all(
+            Tractor(
+                name=f"Tractor {i}", brand="John Deere", model="8R 410", year=2020, price=250000 + i,
+                location="Iowa, USA", horsepower=410, condition="Used",
+                description="Well maintained, full service history, new tyres. " * 40,
+                image_urls=[f"https://cdn.example.com/tractors/{i}/{n}.jpg" for n in range(5)],
+                owner_id=1 + i % 50,
+            )
+            for i in range(tractor_count)
+        )
+        db.commit()
+
+    def bench_db():
+        db = BenchSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(marketplace.router)
+    app.dependency_overrides[database.get_db] = bench_db
+    return app
+
+
+async def measure(client: httpx.AsyncClient, url: str, params: dict, total: int):
+    await client.get(url, params=params) # Warm up
+    started = time.perf_counter()
+    for _ in range(total):
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+    return (time.perf_counter() - started) / total, len(response.content)
+
+
+async def run(args) -> None:
+    if args.url:
+        client = httpx.AsyncClient(timeout=60)
+        url = args.url
+    else:
+        os.environ.setdefault("TESTING", "True")
+        app = build_self_contained_app(args.tractors)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+        url = "/marketplace/tractors"
+
+    async with client:
+        print(f"{url}, {args.limit} rows per page, {args.requests} requests each:")
+        for label, fields in VARIANTS:
+            params = {"limit": args.limit, **({"fields": fields} if fields else {})}
+            seconds, size = await measure(client, url, params, args.requests)
+            print(f"  {label:<22} {seconds * 1000:>8.2f} ms/page {size / 1024:>9.1f} KiB")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Benchmark this listing URL on a running server instead of the in-process app")
+    parser.add_argument("--tractors", type=int, default=1000, help="Listings to seed (self-contained mode)")
+    parser.add_argument("--limit", type=int, default=100, help="Rows per page")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per variant")
+    asyncio.run(run(parser.parse_args(argv)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 import logging
@@ -8,19 +9,32 @@ from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse, FileResponse, HTMLResponse
+from fastapi.responses import JSONResponse, FileResponse, HTMLResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
 from starlette.middleware.base import BaseHTTPMiddleware
 from dotenv import load_dotenv
+import anyio.to_thread
 
 # Add the current directory to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Import custom modules after modifying sys.path
-from middleware.rate_limit import rate_limit_middleware
+from middleware.rate_limit import limiter, rate_limit_middleware
 from app.core.logging import setup_logging, performance_middleware
+from app.core.metrics import MetricsMiddleware, metrics
 from app.api.api import api_router
 from app.core.config import settings
+from app.core.db import dispose_async_engine
+from app.core.http_cache import ETAG_HEADER
+from app.core.hashing import HashingPoolSaturated, hashing_pool_saturated_handler, password_hashing_pool
+from app.core.pagination import InvalidCursorError, invalid_cursor_handler, NEXT_CURSOR_HEADER
+from app.core.responses import ORJSONResponse
+from app.core.query_stats import QueryStatsMiddleware, query_metrics, QUERY_COUNT_HEADER, QUERY_TIME_HEADER
+from app.core.readiness import db_readiness
+from app.core.realtime import realtime
+from app.core.socket_manager import socket_app, location_coalescer
+from app.services.track_service import track_store
+from app.services.user_identity_cache import user_identity_cache
 
 # Initialize logging
 logger = setup_logging(app_name="FarmPower", log_level=logging.INFO)
@@ -58,34 +72,10 @@ except ImportError:
 except Exception as e:
     logger.warning(f"⚠️ Startup check failed: {e}, continuing...")
 
-# Import database and models using absolute imports
-try:
-    from app.core.db import Base, engine, SessionLocal
-    # Import all models to ensure they are registered with Base
-    from app import models
-    
-    # Test database connection
-    try:
-        db = SessionLocal()
-        db.execute("SELECT 1")
-        db.close()
-        logger.info("✅ Database connection test successful")
-    except Exception as e:
-        logger.error(f"❌ Database connection test failed: {str(e)}")
-        # Don't exit here, let the application start so we can see other errors
-        
-except ImportError as e:
-    logger.error(f"❌ Failed to import database modules: {str(e)}")
-    raise
-
-# Ensure the database tables are created
-try:
-    logger.info("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    logger.info("✅ Database tables created/verified")
-except Exception as e:
-    logger.error(f"❌ Failed to create database tables: {str(e)}")
-    # Don't raise here, let the application start
+# Register all models with Base. No database I/O happens at import: engines are
+# created on first use, connectivity is checked in the background (see /health) and
+# the schema is created by the separate migration step (migrate.py).
+from app import models
 
 # Import all routers using absolute imports
 try:
@@ -105,14 +95,6 @@ except ImportError as e:
     logger.error(f"❌ Failed to import routers: {str(e)}")
     raise
 
-# Create database tables (if they don't exist yet)
-# This is useful for development. For production, use migrations (e.g., Alembic).
-try:
-    Base.metadata.create_all(bind=engine, checkfirst=True) # Ensures all imported models' tables are created
-except Exception as e:
-    logger.error(f"❌ Failed to create database tables: {str(e)}")
-    # Don't raise here, let the application start
-
 # Security middleware for adding security headers
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
@@ -131,7 +113,9 @@ app = FastAPI(
     description="FarmPower Backend API",
     version="1.0.0",
     docs_url="/docs" if os.getenv('ENVIRONMENT') != 'production' else None,
-    redoc_url="/redoc" if os.getenv('ENVIRONMENT') != 'production' else None
+    redoc_url="/redoc" if os.getenv('ENVIRONMENT') != 'production' else None,
+    # Encode responses with orjson; hot list endpoints go further with app.core.responses.list_response
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -143,41 +127,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add rate limiting middleware
-app.middleware("http")(rate_limit_middleware)
-
-# Add performance monitoring middleware
-app.middleware("http")(performance_middleware)
-
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+# Malformed or stale pagination cursors are client errors
+app.add_exception_handler(InvalidCursorError, invalid_cursor_handler)
+
+# A full password hashing pool sheds logins with a 503 instead of queueing them
+app.add_exception_handler(HashingPoolSaturated, hashing_pool_saturated_handler)
+
 # Health check endpoint
 @app.get("/health", response_model=Dict[str, Any])
-async def health_check() -> Dict[str, Any]:
-    """Health check endpoint for monitoring and container orchestration."""
+async def health_check() -> JSONResponse:
+    """
+    Health check endpoint for monitoring and container orchestration.
+    503 until the database has been reached, and while it is unreachable.
+    """
+    readiness = db_readiness.status()
     health_status = {
-        "status": "healthy",
+        "status": "healthy" if readiness["ready"] else "starting" if readiness["checked_at"] is None else "degraded",
         "environment": ENVIRONMENT,
         "host": HOST,
         "port": PORT,
         "debug": ENVIRONMENT == "development",
-        "database": "unknown"
+        "database": readiness["database"],
+        "database_checked_at": readiness["checked_at"]
     }
-    
-    # Test database connection
-    try:
-        from sqlalchemy import text
-        db = SessionLocal()
-        db.execute(text("SELECT 1"))
-        db.commit()
-        db.close()
-        health_status["database"] = "connected"
-    except Exception as e:
-        health_status["database"] = f"error: {str(e)}"
-        health_status["status"] = "degraded"
-    
-    return health_status
+    return JSONResponse(health_status, status_code=200 if readiness["ready"] else 503)
+
+# Prometheus scrape target (monitoring/prometheus/prometheus.yml, job "fastapi")
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics() -> PlainTextResponse:
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 # Get the absolute path to the 'FARMPOWER' directory
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -213,7 +194,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
     allow_headers=["*"],
-    expose_headers=["Content-Length", "X-Request-ID"],
+    expose_headers=["Content-Length", "X-Request-ID", ETAG_HEADER, NEXT_CURSOR_HEADER, QUERY_COUNT_HEADER, QUERY_TIME_HEADER],
     max_age=600  # 10 minutes
 )
 
@@ -224,6 +205,17 @@ if os.getenv('ENVIRONMENT') == 'production':
 # Add rate limiting middleware
 app = rate_limit_middleware(app)
 
+# Count the SQL statements each request runs (headers, /metrics, N+1 warnings)
+app.add_middleware(
+    QueryStatsMiddleware,
+    query_metrics=query_metrics,
+    headers=settings.DB_QUERY_STATS_HEADERS,
+    repeat_threshold=settings.DB_REPEATED_QUERY_THRESHOLD
+)
+
+# Outermost, so /metrics latencies include every other middleware (and 429s)
+app.add_middleware(MetricsMiddleware, registry=metrics)
+
 # Mount static files (e.g., CSS, JS, images) from the 'assets' directory
 assets_dir = os.path.join(farmpower_dir, 'assets')
 if os.path.exists(assets_dir):
@@ -246,6 +238,53 @@ app.include_router(crop_calculator_router.router, prefix="/api/crop-profit", tag
 app.include_router(auth_json_router.router)
 app.include_router(marketplace.router)
 
+# Socket.IO: authenticated clients join their user_{id} room for message/notification pushes
+app.mount("/socket.io", socket_app)
+
+@app.on_event("startup")
+async def configure_threadpool():
+    # Sync route handlers and dependencies (DB access) run here; see THREADPOOL_SIZE
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+
+@app.on_event("startup")
+async def start_database_readiness_checks():
+    # In the background, so the port is bound without waiting for the database
+    db_readiness.start()
+
+@app.on_event("startup")
+async def listen_for_user_invalidations():
+    # Lets get_current_user's identity cache hear bans and edits made by other workers
+    user_identity_cache.start_listener()
+
+@app.on_event("startup")
+async def bind_realtime_event_loop():
+    # Sync services queue emits from threadpool workers; they are sent on this loop
+    realtime.bind_event_loop(asyncio.get_running_loop())
+
+@app.on_event("shutdown")
+async def flush_pending_locations():
+    # Send buffered broadcasts and save buffered track points before exit
+    await location_coalescer.aclose()
+    await track_store.aclose()
+
+@app.on_event("shutdown")
+async def stop_database_readiness_checks():
+    await db_readiness.stop()
+    user_identity_cache.stop_listener()
+
+@app.on_event("shutdown")
+async def close_async_db_pool():
+    # No-op unless a route has used get_async_db
+    await dispose_async_engine()
+
+@app.on_event("shutdown")
+async def stop_password_hashing_pool():
+    password_hashing_pool.shutdown()
+
+@app.on_event("shutdown")
+async def close_rate_limit_store():
+    await limiter.aclose()
+
 # Serve index.html for the root path
 @app.get("/", response_class=HTMLResponse)
 async def read_root():
@@ -1,53 +1,252 @@
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.middleware import SlowAPIMiddleware
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from fastapi import Request, Response
-from fastapi.responses import JSONResponse
+"""
+Token-bucket rate limiting for every worker of the app.
+
+Each request is charged one token from a bucket keyed by the route it addresses
+(method and path with id segments collapsed, so /tractors/1 and /tractors/2
+share one) and the caller: the authenticated user when the request carries a
+valid access token, otherwise the client address. The first matching rule sets
+the limit. Buckets live either in process memory (one worker, development) or in
+a shared Redis-protocol store, so limits hold across every gunicorn/uvicorn
+worker and host. With Redis each check is one atomic
+EVALSHA round-trip; if the store is unreachable requests are let through.
+
+Set RATE_LIMIT_STORAGE_URL=redis://host:6379/0 to share limits between workers.
+"""
+import logging
+import math
 import os
-from typing import Optional, Callable
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
 
 # Rate limit configuration
 RATE_LIMIT_DEFAULT = "100/minute"  # Default rate limit
 RATE_LIMIT_AUTH = "5/minute"       # Stricter limit for auth endpoints
+RATE_LIMIT_LOGIN = "20/minute"     # Password logins (each one costs a bcrypt verify)
 RATE_LIMIT_API = "1000/hour"       # Higher limit for API endpoints
 
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
 def get_rate_limit() -> str:
     """Get rate limit from environment variable or return default."""
     return os.getenv("RATE_LIMIT", RATE_LIMIT_DEFAULT)
 
-def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> Response:
-    """Custom handler for rate limit exceeded."""
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """`limit` requests per period (e.g. "20/minute") for paths under `prefix`."""
+    prefix: str
+    limit: str
+    methods: Optional[Tuple[str, ...]] = None # None for every method
+
+    @property
+    def capacity(self) -> int:
+        return int(self.limit.split("/")[0])
+
+    @property
+    def refill_per_s(self) -> float:
+        count, period = self.limit.split("/")
+        return int(count) / PERIODS[period.strip().rstrip("s")]
+
+    def matches(self, method: str, path: str) -> bool:
+        return path.startswith(self.prefix) and (self.methods is None or method in self.methods)
+
+
+def default_rules() -> List[RateLimitRule]:
+    # First match wins, so specific routes go before the prefixes containing them
+    return [
+        RateLimitRule("/api/users/login", RATE_LIMIT_LOGIN, ("POST",)),
+        RateLimitRule("/users/login", RATE_LIMIT_LOGIN, ("POST",)),
+        RateLimitRule("/auth", RATE_LIMIT_AUTH),
+        RateLimitRule("/api", RATE_LIMIT_API),
+        RateLimitRule("/", get_rate_limit()),
+    ]
+
+
+class MemoryBackend:
+    """Buckets in this process only; each worker enforces its own limits."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: Dict[str, Tuple[float, float]] = {} # key -> (tokens, updated_at)
+
+    async def take(self, key: str, capacity: int, refill_per_s: float, now: float) -> Tuple[bool, float]:
+        # No await between read and write, so this is atomic on the event loop
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + max(0.0, now - updated_at) * refill_per_s)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._evict(now)
+        return allowed, tokens
+
+    def _evict(self, now: float) -> None:
+        # Least recently used first: mostly idle callers whose buckets have refilled anyway
+        for key, _ in sorted(self._buckets.items(), key=lambda item: item[1][1])[: self.max_keys // 10]:
+            del self._buckets[key]
+
+
+# Refill and take in one atomic step on the server. Times are milliseconds; the
+# bucket expires once it would be full again, so idle callers cost no memory.
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local refill_per_ms = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * refill_per_ms)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 't', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / refill_per_ms) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBackend:
+    """Buckets in a Redis-protocol store shared by every worker."""
+
+    def __init__(self, url: str, key_prefix: str = "ratelimit:"):
+        import redis.asyncio as redis
+
+        self.key_prefix = key_prefix
+        # RESP2: spoken by every Redis-protocol store, not only servers with HELLO 3
+        self._client = redis.from_url(url, protocol=2, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._script = self._client.register_script(TOKEN_BUCKET_LUA)
+
+    async def take(self, key: str, capacity: int, refill_per_s: float, now: float) -> Tuple[bool, float]:
+        allowed, tokens = await self._script(
+            keys=[self.key_prefix + key], args=[capacity, refill_per_s / 1000, int(now * 1000)]
+        )
+        return bool(int(allowed)), float(tokens)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class TokenBucketLimiter:
+    def __init__(self, backend, rules: Sequence[RateLimitRule]):
+        self.backend = backend
+        self.rules = list(rules)
+        self.enabled = True
+        self._last_backend_error = 0.0
+
+    def rule_for(self, method: str, path: str) -> Optional[RateLimitRule]:
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return rule
+        return None
+
+    async def hit(self, rule: RateLimitRule, identity: str, route: Optional[str] = None) -> Tuple[bool, float]:
+        """
+        Charge one request to `identity`'s bucket for `route` (see `route_key`), or
+        for the whole rule if None; returns (allowed, seconds until the next token if not).
+        """
+        try:
+            allowed, tokens = await self.backend.take(
+                f"{route or rule.prefix}:{identity}", rule.capacity, rule.refill_per_s, time.time()
+            )
+        except Exception as e:
+            # Fail open: an outage of the limit store must not take the API down with it
+            if time.monotonic() - self._last_backend_error > 60:
+                logger.warning(f"Rate limit store unavailable, not limiting: {e}")
+                self._last_backend_error = time.monotonic()
+            return True, 0.0
+        return allowed, 0.0 if allowed else (1 - tokens) / rule.refill_per_s
+
+    async def aclose(self) -> None:
+        if hasattr(self.backend, "aclose"):
+            await self.backend.aclose()
+
+
+# Numeric and UUID path segments: resource ids, which shouldn't each get their own bucket
+_ID_SEGMENT = re.compile(r"/(?:\d+|[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12})(?=/|$)")
+
+
+def route_key(method: str, path: str) -> str:
+    """The route a request addresses, e.g. "GET /tractors/{id}" for GET /tractors/42."""
+    return f"{method} {_ID_SEGMENT.sub('/{id}', path)}"
+
+
+def client_identity(scope: Scope) -> str:
+    """The authenticated user for a valid access token, else the client address."""
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization" and value[:7].lower() == b"bearer ":
+            from app.core.security import decode_access_token
+
+            payload = decode_access_token(value[7:].decode("latin-1"))
+            if payload and payload.get("sub"):
+                return f"user:{payload['sub']}"
+            break
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+def too_many_requests(retry_after: float) -> JSONResponse:
+    seconds = max(1, math.ceil(retry_after))
     return JSONResponse(
         status_code=429,
         content={
             "error": "Rate limit exceeded",
-            "detail": f"Too many requests. Please try again in {exc.retry_after} seconds.",
-            "retry_after": exc.retry_after
-        }
+            "detail": f"Too many requests. Please try again in {seconds} seconds.",
+            "retry_after": seconds
+        },
+        headers={"Retry-After": str(seconds)},
     )
 
-def get_rate_limit_key(request: Request) -> str:
-    """Get rate limit key based on request path."""
-    path = request.url.path
-    
-    # Different rate limits for different endpoints
-    if path.startswith("/auth"):
-        return RATE_LIMIT_AUTH
-    elif path.startswith("/api"):
-        return RATE_LIMIT_API
-    return get_rate_limit()
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware overhead) applying `limiter`."""
+
+    EXEMPT_PATHS = ("/health", "/metrics")
+    # Socket.IO polling and static files: many requests per page, none of them API work
+    EXEMPT_MOUNTS = ("/socket.io", "/assets")
+
+    def __init__(self, app: ASGIApp, limiter: TokenBucketLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    def is_exempt(self, path: str) -> bool:
+        return path in self.EXEMPT_PATHS or any(
+            path == mount or path.startswith(mount + "/") for mount in self.EXEMPT_MOUNTS
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.limiter.enabled or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        rule = None if self.is_exempt(path) else self.limiter.rule_for(scope["method"], path)
+        if rule is not None:
+            allowed, retry_after = await self.limiter.hit(rule, client_identity(scope), route_key(scope["method"], path))
+            if not allowed:
+                await too_many_requests(retry_after)(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+def create_limiter() -> TokenBucketLimiter:
+    storage_url = os.getenv("RATE_LIMIT_STORAGE_URL", "")
+    backend = RedisBackend(storage_url) if storage_url.startswith(("redis://", "rediss://", "unix://")) else MemoryBackend()
+    return TokenBucketLimiter(backend, default_rules())
+
+# Initialize rate limiter
+limiter = create_limiter()
 
 def rate_limit_middleware(app):
-    """Rate limiting middleware factory."""
-    
-    # Add rate limit exceeded handler
+    """Install the rate limiter on `app` (applies to every route)."""
     app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
-    
-    # Use official SlowAPIMiddleware which handles request internally
-    app.add_middleware(SlowAPIMiddleware)
-    return app
\ No newline at end of file
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+    return app
@@ -1,19 +1,36 @@
 """
 Supabase authentication middleware for FastAPI.
 This middleware validates JWT tokens from the Authorization header.
+
+Tokens are verified locally against the project's JWKS or JWT secret (see
+utils.supabase_jwt); Supabase itself is only asked about tokens that can't be.
 """
 from fastapi import Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional, Dict, Any
 import logging
-from utils.supabase_client import get_supabase
+from app.core.metrics import metrics
+from utils.supabase_jwt import InvalidTokenError, SupabaseTokenVerifier, create_verifier_from_env
 
 logger = logging.getLogger(__name__)
 
+_verifier: Optional[SupabaseTokenVerifier] = None
+
+
+def get_token_verifier() -> SupabaseTokenVerifier:
+    """The process-wide verifier, so the JWKS and token caches are shared."""
+    global _verifier
+    if _verifier is None:
+        _verifier = create_verifier_from_env()
+        metrics.register_cache(
+            "supabase_tokens",
+            lambda: (_verifier.cache_hits, _verifier.local_verifications + _verifier.remote_verifications)
+        )
+    return _verifier
+
 class SupabaseJWTBearer(HTTPBearer):
     def __init__(self, auto_error: bool = True):
         super().__init__(auto_error=auto_error)
-        self.supabase = get_supabase()
 
     async def __call__(self, request: Request) -> Optional[Dict[str, Any]]:
         credentials: HTTPAuthorizationCredentials = await super().__call__(request)
@@ -30,14 +47,13 @@ class SupabaseJWTBearer(HTTPBearer):
             )
             
         try:
-            # Verify the JWT token with Supabase
-            user = self.supabase.auth.get_user(credentials.credentials)
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Invalid token or expired token."
-                )
-            return user.user.model_dump()
+            return await get_token_verifier().verify(credentials.credentials)
+        except InvalidTokenError as e:
+            logger.info(f"Rejected token: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Invalid token or expired token."
+            )
         except Exception as e:
             logger.error(f"Error verifying token: {str(e)}")
             raise HTTPException(
@@ -45,7 +61,7 @@ class SupabaseJWTBearer(HTTPBearer):
                 detail="Could not validate credentials"
             )
 
-def get_current_user(request: Request) -> Dict[str, Any]:
+async def get_current_user(request: Request) -> Dict[str, Any]:
     """
     Dependency to get the current user from the request.
     Use this in your route handlers to require authentication.
@@ -60,15 +76,14 @@ def get_current_user(request: Request) -> Dict[str, Any]:
     
     token = auth_header.split(" ")[1]
     try:
-        supabase = get_supabase()
-        user = supabase.auth.get_user(token)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        return user.user.model_dump()
+        return await get_token_verifier().verify(token)
+    except InvalidTokenError as e:
+        logger.info(f"Rejected token: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     except Exception as e:
         logger.error(f"Error getting current user: {str(e)}")
         raise HTTPException(
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Create any missing database tables. Run once per deploy, before the server starts:
+
+    python migrate.py && gunicorn ... main:app
+
+The app itself no longer touches the schema at startup, so each worker binds its
+port without waiting for the database. This script waits for the database
+(retrying with backoff) and exits non-zero if it stays unreachable.
+"""
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import database, models  # Registers every model with its Base
+from app.core.db import Base, check_database_connection, create_db_engine
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    engine = create_db_engine()
+    try:
+        check_database_connection(engine)
+    except Exception as e:
+        logger.error(f"❌ Database unreachable, schema not created: {e}")
+        return 1
+    for metadata in (Base.metadata, database.Base.metadata):
+        metadata.create_all(bind=engine, checkfirst=True)
+    logger.info("✅ Database tables created/verified")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+Local verification of Supabase access tokens.
+
+Supabase signs access tokens either with the project's JWT secret (HS256) or
+with asymmetric keys published at `<project>/auth/v1/.well-known/jwks.json`.
+Both can be checked here without calling Supabase: the JWKS is fetched once,
+refreshed in the background, and re-fetched early when a token names an
+unknown key id (key rotation). Verified claims are cached per token for a short
+time, so a client's repeated requests cost a dictionary lookup.
+
+Callers get the same user dict as `supabase.auth.get_user(token).user.model_dump()`
+for the fields a token carries (id, email, phone, role, metadata).
+
+`supabase.auth.get_user` is only used when a token can't be checked locally
+(no secret configured and no published key matches it).
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import anyio.to_thread
+import httpx
+from jose import jwt
+from jose.exceptions import JOSEError
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = {"RS256", "ES256"}
+
+
+class InvalidTokenError(Exception):
+    """Raised when a token is malformed, expired or not signed by the project."""
+
+
+def claims_to_user(claims: Dict[str, Any]) -> Dict[str, Any]:
+    """The user fields Supabase puts in an access token, shaped like its User model."""
+    return {
+        "id": claims.get("sub"),
+        "aud": claims.get("aud"),
+        "role": claims.get("role"),
+        "email": claims.get("email"),
+        "phone": claims.get("phone"),
+        "app_metadata": claims.get("app_metadata") or {},
+        "user_metadata": claims.get("user_metadata") or {},
+        "is_anonymous": claims.get("is_anonymous", False),
+    }
+
+
+class SupabaseTokenVerifier:
+    def __init__(
+        self,
+        jwks_url: Optional[str],
+        jwt_secret: Optional[str] = None,
+        issuer: Optional[str] = None,
+        audience: str = "authenticated",
+        jwks_refresh_s: float = 600,
+        min_refetch_interval_s: float = 30,
+        token_cache_ttl_s: float = 60,
+        token_cache_size: int = 10000,
+        remote_verify: Optional[Callable[[str], Dict[str, Any]]] = None,
+    ):
+        self.jwks_url = jwks_url
+        self.jwt_secret = jwt_secret
+        self.issuer = issuer
+        self.audience = audience
+        self.jwks_refresh = jwks_refresh_s
+        self.min_refetch_interval = min_refetch_interval_s # Bounds refetches caused by unknown key ids
+        self.token_cache_ttl = token_cache_ttl_s
+        self.token_cache_size = token_cache_size
+        self.remote_verify = remote_verify # Blocking fallback, e.g. supabase.auth.get_user
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at: Optional[float] = None
+        self._fetch_lock: Optional[asyncio.Lock] = None
+        self._refresh_task: Optional["asyncio.Task[None]"] = None
+        self._tokens: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._tokens_lock = threading.Lock()
+        self.cache_hits = self.local_verifications = self.remote_verifications = self.jwks_fetches = 0
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """The token's user if it is valid; raises InvalidTokenError otherwise."""
+        cache_key = hashlib.sha256(token.encode()).hexdigest()
+        user = self._cached(cache_key)
+        if user is not None:
+            self.cache_hits += 1
+            return user
+
+        self._ensure_refreshing()
+        try:
+            header = jwt.get_unverified_header(token)
+        except JOSEError as e:
+            raise InvalidTokenError(f"Malformed token: {e}") from e
+        key, algorithm = await self._key_for(header)
+        if key is not None:
+            claims = self._decode(token, key, algorithm)
+            user = claims_to_user(claims)
+            self.local_verifications += 1
+        elif self.remote_verify is not None:
+            user = await self._verify_remotely(token)
+            claims = jwt.get_unverified_claims(token) # Supabase vouched for it; only exp is needed
+        else:
+            raise InvalidTokenError("Token signed with an unknown key")
+        self._remember(cache_key, user, claims.get("exp"))
+        return user
+
+    async def refresh_keys(self) -> None:
+        """Fetch the JWKS now; keeps the previous keys if the fetch fails."""
+        if not self.jwks_url:
+            return
+        if self._fetch_lock is None:
+            self._fetch_lock = asyncio.Lock()
+        async with self._fetch_lock:
+            try:
+                async with httpx.AsyncClient(timeout=10) as client:
+                    response = await client.get(self.jwks_url)
+                    response.raise_for_status()
+                keys = {key["kid"]: key for key in response.json().get("keys", []) if "kid" in key}
+            except (httpx.HTTPError, ValueError, KeyError, AttributeError) as e:
+                logger.warning(f"Could not fetch Supabase JWKS from {self.jwks_url}: {e}")
+                return
+            finally:
+                self._fetched_at = time.monotonic()
+                self.jwks_fetches += 1
+            self._keys = keys
+
+    async def aclose(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "token_cache_entries": len(self._tokens),
+            "cache_hits": self.cache_hits,
+            "local_verifications": self.local_verifications,
+            "remote_verifications": self.remote_verifications,
+            "jwks_fetches": self.jwks_fetches,
+        }
+
+    async def _key_for(self, header: Dict[str, Any]) -> Tuple[Optional[Any], Optional[str]]:
+        algorithm = header.get("alg")
+        if algorithm == "HS256":
+            return (self.jwt_secret or None), algorithm
+        if algorithm not in ASYMMETRIC_ALGORITHMS or not self.jwks_url:
+            return None, None
+        kid = header.get("kid")
+        if self._fetched_at is None or (
+            kid not in self._keys and time.monotonic() - self._fetched_at >= self.min_refetch_interval
+        ):
+            await self.refresh_keys() # First use, or the project rotated to a key we haven't seen
+        key = self._keys.get(kid)
+        if key is None:
+            return None, None
+        return key, key.get("alg", algorithm)
+
+    def _decode(self, token: str, key: Any, algorithm: str) -> Dict[str, Any]:
+        try:
+            return jwt.decode(
+                token, key, algorithms=[algorithm], audience=self.audience, issuer=self.issuer,
+                options={"verify_aud": bool(self.audience), "verify_iss": bool(self.issuer)}
+            )
+        except JOSEError as e:
+            raise InvalidTokenError(str(e)) from e
+
+    async def _verify_remotely(self, token: str) -> Dict[str, Any]:
+        try:
+            user = await anyio.to_thread.run_sync(self.remote_verify, token)
+        except Exception as e:
+            raise InvalidTokenError(f"Supabase rejected the token: {e}") from e
+        self.remote_verifications += 1
+        return user
+
+    def _ensure_refreshing(self) -> None:
+        if self._refresh_task is None and self.jwks_url:
+            self._refresh_task = asyncio.get_running_loop().create_task(self._refresh_periodically())
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.jwks_refresh)
+            await self.refresh_keys()
+
+    def _cached(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        with self._tokens_lock:
+            entry = self._tokens.get(cache_key)
+            if entry is None:
+                return None
+            if time.time() >= entry[0]:
+                del self._tokens[cache_key]
+                return None
+            self._tokens.move_to_end(cache_key)
+            return entry[1]
+
+    def _remember(self, cache_key: str, user: Dict[str, Any], exp: Optional[float]) -> None:
+        expires_at = time.time() + self.token_cache_ttl
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp) # Never outlive the token itself
+        with self._tokens_lock:
+            self._tokens[cache_key] = (expires_at, user)
+            self._tokens.move_to_end(cache_key)
+            while len(self._tokens) > self.token_cache_size:
+                self._tokens.popitem(last=False)
+
+
+def _supabase_get_user(token: str) -> Dict[str, Any]:
+    from utils.supabase_client import get_supabase
+
+    response = get_supabase().auth.get_user(token)
+    if not response or not response.user:
+        raise InvalidTokenError("Invalid token or expired token.")
+    return response.user.model_dump()
+
+
+def create_verifier_from_env() -> SupabaseTokenVerifier:
+    """
+    Build a verifier from the environment. SUPABASE_JWT_SECRET enables HS256
+    tokens; the JWKS URL defaults to the project's well-known endpoint.
+    """
+    supabase_url = (os.getenv("NEXT_PUBLIC_SUPABASE_URL") or os.getenv("SUPABASE_URL") or "").rstrip("/")
+    return SupabaseTokenVerifier(
+        jwks_url=os.getenv("SUPABASE_JWKS_URL") or (f"{supabase_url}/auth/v1/.well-known/jwks.json" if supabase_url else None),
+        jwt_secret=os.getenv("SUPABASE_JWT_SECRET"),
+        issuer=f"{supabase_url}/auth/v1" if supabase_url else None,
+        jwks_refresh_s=float(os.getenv("SUPABASE_JWKS_REFRESH_S", "600")),
+        token_cache_ttl_s=float(os.getenv("SUPABASE_TOKEN_CACHE_TTL_S", "60")),
+        remote_verify=_supabase_get_user,
+    )